@@ -0,0 +1,1031 @@
+# src/benchmark.py
+# Micro benchmarks for the hot paths of the game.
+# Run from the repository root (assets are loaded from relative paths):
+#     python src/benchmark.py               -> runs every benchmark
+#     python src/benchmark.py generation    -> runs only the selected ones
+import os
+import sys
+import random
+import tempfile
+import numpy as np
+from time import perf_counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import commons
+from database.world_generator import WorldGenerator
+from database.world_elements.chunk import Chunk
+from database.world_loader import WorldLoader
+from database.world_elements.block_metadata_loader import BLOCK_METADATA
+from database.world_elements.static_elements_manager import S_ELEMENT_METADATA_LOADER
+from database.world_elements.item_metadata import ITEM_METADATA
+from images.image_loader import IMAGE_LOADER
+
+
+def _timed(func, repeat: int) -> float:
+    """Runs `func` `repeat` times and returns the mean time in milliseconds."""
+    start = perf_counter()
+    for _ in range(repeat):
+        func()
+    return (perf_counter() - start) * 1000 / repeat
+
+
+def bench_generation():
+    """Vectorized chunk generation against the reference loop, plus the bit-exact check."""
+    BLOCK_METADATA.init()
+    S_ELEMENT_METADATA_LOADER.init()
+
+    generator = WorldGenerator(4)
+    positions = [(x, y) for x in range(-3, 4) for y in range(-4, 5)]
+
+    mismatches = generator.compare_with_reference(range(8), positions)
+    print(f"  bit-exact check: {len(mismatches)} mismatches over {8 * len(positions)} chunks")
+    for mismatch in mismatches[:10]:
+        print(f"    seed={mismatch[0]} chunk=({mismatch[1]}, {mismatch[2]}) grid={mismatch[3]}")
+
+    vectorized = _timed(lambda: [generator.generate_chunk(Chunk(*p)) for p in positions], 3) / len(positions)
+    reference = _timed(lambda: [generator._generate_chunk_reference(Chunk(*p)) for p in positions], 3) / len(positions)
+    print(f"  vectorized: {vectorized:.2f} ms/chunk")
+    print(f"  reference : {reference:.2f} ms/chunk")
+
+
+def bench_chunk_blobs():
+    """Compressed chunk blobs against the Blocks rows, saving and loading a 500-chunk world."""
+    BLOCK_METADATA.init()
+
+    generator = WorldGenerator(4)
+    positions = [(x, y) for x in range(-12, 13) for y in range(-10, 10)]
+    grids = {p: generator.generate_chunk_arrays(*p) for p in positions}
+    size = commons.CHUNK_SIZE
+
+    with tempfile.TemporaryDirectory() as directory:
+        rows_loader = WorldLoader(os.path.join(directory, "rows.db"))
+        blobs_loader = WorldLoader(os.path.join(directory, "blobs.db"))
+        rows_world = rows_loader.create_world("bench", 4)
+        blobs_world = blobs_loader.create_world("bench", 4)
+
+        rows = [{'x': cx * size + col, 'y': cy * size + row, 'type': int(blocks[layer, row, col]), 'layer': layer}
+                for (cx, cy), (blocks, _, _, _) in grids.items()
+                for layer in range(blocks.shape[0]) for row in range(size) for col in range(size)]
+
+        start = perf_counter()
+        rows_loader.save_blocks(rows_world, rows)
+        rows_save = perf_counter() - start
+
+        start = perf_counter()
+        blobs_loader.save_chunk_blobs(blobs_world, {p: (blocks, edges) for p, (blocks, _, edges, _) in grids.items()})
+        blobs_save = perf_counter() - start
+
+        def load_rows():
+            for cx, cy in positions:
+                chunk = Chunk(cx, cy)
+                for x, y, layer, block in rows_loader.load_blocks(rows_world, cx * size, (cx + 1) * size - 1, cy * size, (cy + 1) * size - 1):
+                    chunk.add_block(block, x % size, y % size, layer)
+
+        def load_blobs():
+            for cx, cy in positions:
+                chunk = Chunk(cx, cy)
+                blocks, edges = blobs_loader.load_chunk_blob(blobs_world, cx, cy)
+                chunk.set_blocks(blocks)
+                chunk._set_edges(edges)
+
+        rows_load = _timed(load_rows, 1)
+        blobs_load = _timed(load_blobs, 3)
+        bulk_load = _timed(lambda: blobs_loader.load_chunk_blobs(blobs_world), 3)
+
+        # Closing checkpoints the write-ahead log into the database file
+        rows_loader.close()
+        blobs_loader.close()
+        rows_size = os.path.getsize(rows_loader.db_name) / 1024
+        blobs_size = os.path.getsize(blobs_loader.db_name) / 1024
+
+    print(f"  {len(positions)} chunks")
+    print(f"  rows : save {rows_save * 1000:.0f} ms, load {rows_load:.0f} ms, {rows_size:.0f} KiB")
+    print(f"  blobs: save {blobs_save * 1000:.0f} ms, load {blobs_load:.0f} ms (bulk {bulk_load:.0f} ms), {blobs_size:.0f} KiB")
+
+
+def bench_connection():
+    """Per-chunk queries of 500 chunks on the pooled connection, batched or not, against reconnecting per call."""
+    positions = [(x, y) for x in range(-12, 13) for y in range(-10, 10)]
+    size = commons.CHUNK_SIZE
+    pixels = commons.CHUNK_SIZE_PIXELS
+
+    with tempfile.TemporaryDirectory() as directory:
+        loader = WorldLoader(os.path.join(directory, "connection.db"))
+        world_id = loader.create_world("bench", 4)
+
+        def load_chunks(reconnect):
+            for cx, cy in positions:
+                if reconnect:
+                    loader.close()
+                loader.load_blocks(world_id, cx * size, (cx + 1) * size - 1, cy * size, (cy + 1) * size - 1)
+                loader.load_static_objects(world_id, cx * pixels, (cx + 1) * pixels - 1, cy * pixels, (cy + 1) * pixels - 1)
+
+        def load_chunks_batched():
+            with loader.transaction():
+                load_chunks(False)
+
+        reconnecting = _timed(lambda: load_chunks(True), 3)
+        pooled = _timed(lambda: load_chunks(False), 3)
+        batched = _timed(load_chunks_batched, 3)
+        loader.close()
+
+    print(f"  {len(positions)} chunks, 2 queries each")
+    print(f"  reconnecting: {reconnecting:.1f} ms")
+    print(f"  pooled      : {pooled:.1f} ms")
+    print(f"  batched     : {batched:.1f} ms")
+
+
+def bench_chunk_memory():
+    """Bytes held by the grids of a generated 20x20 chunk region, int64 layout against the compact one."""
+    BLOCK_METADATA.init()
+    S_ELEMENT_METADATA_LOADER.init()
+
+    generator = WorldGenerator(4)
+    chunks = {}
+    for x in range(-10, 10):
+        for y in range(-8, 12):
+            chunk = Chunk(x, y)
+            generator.generate_chunk(chunk)
+            chunk.update_edges(left=chunks.get((x - 1, y)), top=chunks.get((x, y - 1)))
+            chunks[(x, y)] = chunk
+
+    # Layout before: int64 blocks and edges, bool collision
+    before = sum(c.blocks_grid.size * 8 + c.collidable_grid.size + c.edges_matrix.size * 8 for c in chunks.values())
+    after = sum(c.storage_bytes() for c in chunks.values())
+    uniform = sum(not c.blocks_grid.flags.writeable for c in chunks.values())
+
+    print(f"  {len(chunks)} chunks, {uniform} uniform")
+    print(f"  int64 layout : {before / len(chunks):.0f} bytes/chunk")
+    print(f"  compact      : {after / len(chunks):.0f} bytes/chunk")
+
+
+def bench_rasterizer():
+    """Full chunk redraw with the tile atlas against the blit per cell loop, plus a pixel-exact check."""
+    import pygame
+    pygame.display.set_mode((commons.WIDTH, commons.HEIGHT))
+    BLOCK_METADATA.init()
+    S_ELEMENT_METADATA_LOADER.init()
+    IMAGE_LOADER.init()
+    from rendering.render_manager import RenderManager
+    from rendering.chunk_rasterizer import CHUNK_RASTERIZER
+
+    render_manager = RenderManager((0, 0))
+    generator = WorldGenerator(4)
+    chunks = {}
+    for x in range(-2, 2):
+        for y in range(-1, 3):
+            chunk = Chunk(x, y)
+            generator.generate_chunk(chunk)
+            chunk.update_edges(left=chunks.get((x - 1, y)), top=chunks.get((x, y - 1)))
+            chunks[(x, y)] = chunk
+
+    # A transparent front block over a back block, to cover every case of the back layer
+    wood = int(BLOCK_METADATA.get_id_by_name("WOOD"))
+    chunks[(0, 1)].add_block(wood, 5, 5, 0)
+
+    reference_surface = render_manager.create_surface()
+    atlas_surface = render_manager.create_surface()
+    mismatches = 0
+    for chunk in chunks.values():
+        render_manager._render_chunk_reference(reference_surface, chunk)
+        CHUNK_RASTERIZER.rasterize(atlas_surface, chunk)
+        mismatches += not np.array_equal(pygame.surfarray.array3d(reference_surface), pygame.surfarray.array3d(atlas_surface))
+    print(f"  pixel-exact check: {mismatches} mismatching chunks over {len(chunks)}")
+
+    reference = _timed(lambda: [render_manager._render_chunk_reference(reference_surface, c) for c in chunks.values()], 3) / len(chunks)
+    atlas = _timed(lambda: [CHUNK_RASTERIZER.rasterize(atlas_surface, c) for c in chunks.values()], 3) / len(chunks)
+    line = _timed(lambda: [CHUNK_RASTERIZER.rasterize(atlas_surface, c, rows=slice(7, 8)) for c in chunks.values()], 3) / len(chunks)
+    print(f"  atlas    : {atlas:.2f} ms/chunk ({line:.3f} ms/line)")
+    print(f"  reference: {reference:.2f} ms/chunk")
+
+
+class _GeneratedChunks:
+    """Stand-in for World.load_chunk over chunks generated up front, so the rendering benchmarks need no database."""
+
+    def __init__(self, generator: WorldGenerator):
+        self.generator = generator
+        self.chunks = {}
+
+    def load_chunk(self, chunk_x, chunk_y, wait=True):
+        key = (int(chunk_x), int(chunk_y))
+        if key not in self.chunks:
+            chunk = Chunk(*key)
+            self.generator.generate_chunk(chunk)
+            chunk.update_edges(**{side: self.chunks.get(k) for side, k in (('left', (key[0] - 1, key[1])), ('top', (key[0], key[1] - 1)),
+                                                                          ('right', (key[0] + 1, key[1])), ('bottom', (key[0], key[1] + 1)))})
+            chunk.completed_created = True
+            self.chunks[key] = chunk
+        return self.chunks[key]
+
+
+def bench_surface_cache():
+    """Walking back and forth across a chunk border, with the chunk surface cache against a cache without budget."""
+    import pygame
+    screen = pygame.display.set_mode((commons.WIDTH, commons.HEIGHT))
+    BLOCK_METADATA.init()
+    S_ELEMENT_METADATA_LOADER.init()
+    IMAGE_LOADER.init()
+    from rendering.render_manager import RenderManager
+
+    crossings = 40
+    pixels = commons.CHUNK_SIZE_PIXELS
+    world = _GeneratedChunks(WorldGenerator(4))
+
+    for label, max_bytes in (("cached", commons.CHUNK_SURFACE_CACHE_BYTES), ("no budget", 0)):
+        render_manager = RenderManager((0, 0))
+        render_manager.chunk_surfaces.max_bytes = max_bytes
+        # Centered on chunk (0, 1), stepping over the border with chunk (1, 1)
+        positions = [(pixels - commons.WIDTH / 2 + (24 if i % 2 else -24), 1.5 * pixels - commons.HEIGHT / 2) for i in range(crossings)]
+
+        def walk():
+            for position in positions:
+                render_manager.current_position = position
+                render_manager.update_chunks(world)
+                render_manager.render_chunks(screen)
+
+        elapsed = _timed(walk, 1)
+        stats = render_manager.chunk_surfaces.stats()
+        print(f"  {label:9}: {elapsed / crossings:.2f} ms/crossing, {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['entries']} surfaces ({stats['bytes'] / 2 ** 20:.0f} MiB)")
+
+
+def bench_window():
+    """Chunk window updates: chunks loaded per move for steps and teleports, and frame rendering cost per zoom level."""
+    import pygame
+    screen = pygame.display.set_mode((commons.WIDTH, commons.HEIGHT))
+    BLOCK_METADATA.init()
+    S_ELEMENT_METADATA_LOADER.init()
+    IMAGE_LOADER.init()
+    from rendering.render_manager import RenderManager
+
+    pixels = commons.CHUNK_SIZE_PIXELS
+    world = _GeneratedChunks(WorldGenerator(4))
+    loads = []
+    load_chunk = world.load_chunk
+    world.load_chunk = lambda *args, **kwargs: loads.append(args) or load_chunk(*args, **kwargs)
+
+    render_manager = RenderManager((0, 0))
+    render_manager.update_chunks(world)
+
+    for label, step in (("step", (pixels, 0)), ("diagonal", (pixels, pixels)), ("teleport", (40 * pixels, 7 * pixels))):
+        moves = 10
+        loads.clear()
+        for _ in range(moves):
+            x, y = render_manager.current_position
+            render_manager.current_position = (x + step[0], y + step[1])
+            render_manager.update_chunks(world)
+        print(f"  {label:8}: {len(loads) / moves:.0f} chunks loaded/move (window {render_manager.window_size[0]}x{render_manager.window_size[1]})")
+
+    for zoom in commons.ZOOM_LEVELS:
+        render_manager.set_zoom(zoom, world)
+        render_manager.render_chunks(screen)  # Draws the chunk surfaces once
+        frame = _timed(lambda: render_manager.render_chunks(screen), 20)
+        columns, rows = render_manager.window_size
+        print(f"  zoom {zoom:4}: window {columns}x{rows}, {frame:.2f} ms/frame")
+
+
+def bench_dirty_rects():
+    """Presented pixel fraction and present time of the dirty rects mode, camera still or scrolling, against full frames."""
+    import pygame
+    screen = pygame.display.set_mode((commons.WIDTH, commons.HEIGHT))
+    BLOCK_METADATA.init()
+    S_ELEMENT_METADATA_LOADER.init()
+    ITEM_METADATA.init()
+    IMAGE_LOADER.init()
+    from rendering.render_manager import RenderManager
+    from physics.player import Player
+    from physics.item import Item
+
+    world = _GeneratedChunks(WorldGenerator(4))
+    frames = 60
+
+    for label, scrolling in (("still", False), ("scrolling", True)):
+        for enabled in (True, False):
+            render_manager = RenderManager((0, 0))
+            render_manager.dirty_regions.enabled = enabled
+            player = Player(position=pygame.Vector2(commons.WIDTH / 2, commons.HEIGHT / 2))
+            items = [Item("1", (200 + 60 * i, 300), pygame.Vector2(0, 0)) for i in range(12)]
+            fractions = []
+
+            def frame(index):
+                if scrolling:
+                    render_manager.update_position((index * 4, 0))
+                for item in items:
+                    item.rect.y = 300 + index % 20  # Items bouncing in place
+                render_manager.update_chunks(world)
+                render_manager.render_all(screen, [player] + items, player)
+                render_manager.present()
+                fractions.append(render_manager.dirty_regions.presented_fraction)
+
+            frame(0)
+            start = perf_counter()
+            for index in range(1, frames):
+                frame(index)
+            elapsed = (perf_counter() - start) * 1000 / (frames - 1)
+
+            mode = "dirty rects" if enabled else "full frames"
+            print(f"  {label:9} {mode}: {sum(fractions[1:]) / (frames - 1):6.1%} of the pixels presented, {elapsed:.2f} ms/frame")
+
+
+def bench_static_elements():
+    """Drawing a forest: per-element lookups and blits of every tree of the window, against the culled render lists and one blits call."""
+    import pygame
+    screen = pygame.display.set_mode((commons.WIDTH, commons.HEIGHT))
+    BLOCK_METADATA.init()
+    S_ELEMENT_METADATA_LOADER.init()
+    IMAGE_LOADER.init()
+    from rendering.render_manager import RenderManager
+
+    generator = WorldGenerator(4)
+    world = _GeneratedChunks(generator)
+    render_manager = RenderManager((0, 0))
+    render_manager.update_chunks(world)
+
+    trees = 100
+    for chunk in render_manager.window_chunks():
+        chunk.world_elements = [generator.gen_obj("Large Tree", random.randrange(commons.CHUNK_SIZE), random.randrange(commons.CHUNK_SIZE), int(chunk.pos.x), int(chunk.pos.y))
+                                for _ in range(trees)]
+    render_manager._update_static_elements()
+
+    def reference():
+        for element in render_manager.current_static_elements:
+            image_name = S_ELEMENT_METADATA_LOADER.get_property_by_id(element.id, 'image_name')
+            image = IMAGE_LOADER.get_image(image_name)
+            offset = IMAGE_LOADER.get_image_atribute(image_name, 'offset')
+            screen.blit(image, render_manager.world_to_screen(pygame.Vector2(element.rect.topleft) + offset))
+
+    render_lists = render_manager.static_render_lists
+
+    def batched():
+        screen.blits(render_lists.batch(render_manager.window_chunks(), render_manager.current_position, render_manager.view_size, render_manager.zoom), doreturn=False)
+
+    batched()  # Builds the render lists
+    total = len(render_manager.current_static_elements)
+    print(f"  reference   : {_timed(reference, 20):.2f} ms/frame ({total} trees blitted)")
+    print(f"  render lists: {_timed(batched, 20):.2f} ms/frame ({render_lists.drawn} drawn, {render_lists.culled} culled)")
+
+
+def bench_hud():
+    """Drawing the inventory and life bar: composed every frame with new text images, against the cached HUD surface."""
+    import pygame
+    screen = pygame.display.set_mode((commons.WIDTH, commons.HEIGHT))
+    BLOCK_METADATA.init()
+    S_ELEMENT_METADATA_LOADER.init()
+    ITEM_METADATA.init()
+    IMAGE_LOADER.init()
+    from rendering.render_manager import RenderManager
+    from physics.player import Player
+
+    pygame.font.init()
+    render_manager = RenderManager((0, 0))
+    player = Player(position=pygame.Vector2(commons.WIDTH / 2, commons.HEIGHT / 2))
+    for slot in range(player.inventory.max_slots):
+        player.inventory.set_slot(slot, "1", slot + 1)
+
+    def reference():
+        inventory = player.inventory
+        inv_image = IMAGE_LOADER.get_image("INVENTORY")
+        inv_rect = pygame.Rect((0, 0), inv_image.get_size())
+        inv_rect.center = commons.INVENTORY_POS()
+        screen.blit(inv_image, inv_rect)
+        for slot, element in enumerate(inventory.items):
+            if element:
+                num_im = pygame.font.Font(None, 20).render(str(element['quantity']), True, (0, 0, 0), (255, 255, 255))
+                pos = pygame.Vector2(inv_rect.topleft) + (RenderManager.INVENTORY_SLOTS_X[slot], RenderManager.INVENTORY_SLOTS_Y)
+                screen.blit(IMAGE_LOADER.get_image(ITEM_METADATA.get_property_by_id(element['item'], 'image_name')), pos)
+                screen.blit(num_im, pos - pygame.Vector2(0, 5))
+        life_im = IMAGE_LOADER.get_image("FULL_LIFE")
+        life_rect = pygame.Rect((0, 0), life_im.get_size())
+        life_rect.w *= player.life / commons.PLAYER_LIFE
+        screen.blit(IMAGE_LOADER.get_image("EMPTY_LIFE"), inv_rect.topright + pygame.Vector2(20, 0))
+        screen.blit(life_im.subsurface(life_rect), inv_rect.topright + pygame.Vector2(20, 0))
+
+    def changing():
+        player.inventory.scroll(1)
+        render_manager.render_inventory(screen, player.inventory, player)
+
+    print(f"  reference      : {_timed(reference, 200):.3f} ms/frame")
+    print(f"  cached         : {_timed(lambda: render_manager.render_inventory(screen, player.inventory, player), 200):.3f} ms/frame")
+    print(f"  changed (slot) : {_timed(changing, 200):.3f} ms/frame")
+
+
+def bench_rotation():
+    """Updating 500 arrows in flight: a transform.rotate per arrow and frame, against the quantized rotation cache."""
+    import pygame
+    pygame.display.set_mode((commons.WIDTH, commons.HEIGHT))
+    IMAGE_LOADER.init()
+    from physics.bullet import Arrow
+
+    arrows = [Arrow(pygame.Vector2(10 * i, 0), pygame.Vector2.from_polar((600, random.uniform(-180, 180)))) for i in range(500)]
+
+    def turn():
+        for arrow in arrows:
+            arrow.velocity.rotate_ip(3)  # Arrows keep changing direction while falling
+
+    def reference():
+        turn()
+        for arrow in arrows:
+            image = pygame.transform.rotate(arrow.animation.get_current_surface(), arrow.velocity.angle_to(pygame.Vector2(1, 0)))
+            arrow.rect = image.get_rect(center=arrow.rect.center)
+
+    def cached():
+        turn()
+        for arrow in arrows:
+            arrow.update(1 / 60)
+
+    print(f"  transform.rotate: {_timed(reference, 20):.2f} ms/frame")
+    print(f"  rotation cache  : {_timed(cached, 20):.2f} ms/frame ({len(IMAGE_LOADER.rotated_images)} rotations cached)")
+
+
+def bench_tint():
+    """Background layers over two minutes of day/night cycle: a full repaint every 0.5 s, against the tint ramps."""
+    import pygame
+    screen = pygame.display.set_mode((commons.WIDTH, commons.HEIGHT))
+    IMAGE_LOADER.init()
+    from rendering.background import BackLayer
+    from rendering.color_filter import ColorFilter
+
+    def run(draw):
+        color_filter = ColorFilter(commons.DAY_DURATION)
+        layers = [BackLayer("SKY", 0.04), BackLayer("MOUNTAIN", 0.09, -0.1)]
+        times = []
+        for frame in range(60 * 120):
+            color = color_filter.get_color(1 / 60)
+            start = perf_counter()
+            for layer in layers:
+                layer.update(frame, 1 / 60)
+                draw(layer, screen, color_filter, color)
+            times.append((perf_counter() - start) * 1000)
+        times = np.array(times[1:])  # The first frame tints the starting step of both layers
+        return f"{times.mean():.2f} ms/frame, p99 {np.percentile(times, 99):.2f} ms, max {times.max():.2f} ms"
+
+    def repaint_every_half_second(layer, screen, color_filter, color):
+        if layer.elapsed_time >= 0.5 or layer.tinted_key is None:
+            layer.tinted_image = layer.image.copy()
+            layer.tinted_image.fill(color, special_flags=pygame.BLEND_MULT)
+            layer.tinted_key, layer.elapsed_time = color, 0
+        pos_x = layer.pos_x % commons.WIDTH
+        screen.blit(layer.tinted_image, (pos_x - layer.width, 0))
+        screen.blit(layer.tinted_image, (pos_x, 0))
+
+    print(f"  reference : {run(repaint_every_half_second)}")
+    print(f"  tint ramps: {run(lambda layer, screen, color_filter, color: layer.draw(screen, color_filter))}")
+
+
+def _collision_blocks_around(world, position, dimensions):
+    """
+    Get all collidable blocks in a rectangular area around a specific position.
+    The collision query of World before the collision regions, kept as the reference of `bench_collision`.
+
+    :param position: A tuple (x, y) representing the central position in world coordinates.
+    :param dimensions: A tuple (width, height) specifying the rectangular area's size in world coordinates.
+    :return: A list of Rect objects representing the collidable blocks.
+    """
+    from math import ceil
+    from pygame import Rect
+
+    # Extract coordinates
+    x, y = position
+
+    # Determine the chunk and block indices for the starting position
+    chunk_x, block_x_offset = divmod(x, commons.CHUNK_SIZE_PIXELS)
+    block_x = block_x_offset // commons.BLOCK_SIZE
+    if x < 0 and not chunk_x:
+        chunk_x -= 1
+
+    chunk_y, block_y_offset = divmod(y, commons.CHUNK_SIZE_PIXELS)
+    block_y = block_y_offset // commons.BLOCK_SIZE
+    if y < 0 and not chunk_y:
+        chunk_y -= 1
+
+    # Initialize the list to store collidable blocks
+    collidable_blocks = []
+    edge_blocks = []
+
+    # Calculate the number of blocks in each direction based on dimensions
+    rows_range = max(ceil(dimensions[1] / commons.BLOCK_SIZE), 1)  # Vertical range
+    cols_range = max(ceil(dimensions[0] / commons.BLOCK_SIZE), 1)  # Horizontal range
+
+    # Iterate through the potential grid area
+    for row_offset in range(-rows_range, rows_range+1):
+        for col_offset in range(-cols_range, cols_range+1):
+            # Calculate the relative coordinates of the block
+            local_col = block_x + col_offset
+            local_row = block_y + row_offset
+
+            # Adjust chunk coordinates and block indices for wrapping
+            current_chunk_x = chunk_x
+            current_chunk_y = chunk_y
+
+            # Handle column wrapping
+            if local_col < 0:
+                current_chunk_x -= 1
+                local_col %= commons.CHUNK_SIZE
+            elif local_col >= commons.CHUNK_SIZE:
+                current_chunk_x += 1
+                local_col %= commons.CHUNK_SIZE
+
+            # Handle row wrapping
+            if local_row < 0:
+                current_chunk_y -= 1
+                local_row %= commons.CHUNK_SIZE
+            elif local_row >= commons.CHUNK_SIZE:
+                current_chunk_y += 1
+                local_row %= commons.CHUNK_SIZE
+
+            # Get the chunk at the current position
+            chunk_key = (current_chunk_x, current_chunk_y)
+            chunk = world.all_chunks.get(chunk_key, None)
+
+            if chunk is None:
+                continue# If the chunk isn't loaded, raise an error
+                raise RuntimeError("Attempting to get collision blocks from non-generated chunks")
+
+            # Check if the block at the local position is collidable
+            if chunk.collidable_grid[local_row, local_col]:
+                # Calculate the world coordinates for the block
+                block_world_x = current_chunk_x * commons.CHUNK_SIZE_PIXELS + local_col * commons.BLOCK_SIZE
+                block_world_y = current_chunk_y * commons.CHUNK_SIZE_PIXELS + local_row * commons.BLOCK_SIZE
+
+                # Append the block as a Rect object
+                collidable_blocks.append((chunk.edges_matrix[0, local_row, local_col], Rect(block_world_x, block_world_y, commons.BLOCK_SIZE, commons.BLOCK_SIZE)))
+
+    return collidable_blocks
+
+
+def _move_reference(element, colliding_rects, delta_time: float):
+    """
+    Move the element first in the x direction, check for collisions, 
+    then move in the y direction and check for collisions.
+    CollidableMovingElement.move before the collision regions, against a list of (edge, Rect) tiles,
+    kept as the reference of `bench_collision`.
+
+    :param colliding_rects: A list of rectangles to check for collisions.
+    :param delta_time: The time delta for movement calculations.
+    """
+
+    tallest_down = None
+    last_velocity = element.velocity.x
+
+    def get_tallest_down_collision(rect):
+        nonlocal tallest_down
+        if tallest_down is None  or rect.top < tallest_down:
+            tallest_down = rect.top
+
+
+    def handle_horizontal_collisions():
+        nonlocal collided
+
+        for edge, rect in _colliding_rects:
+            if element.rect.colliderect(rect):
+                if edge not in (0b0011, 0b1001):
+                    if element.velocity.x > 0:  # Moving right
+                        element.rect.right = rect.left
+                        element.collided_right()
+                    elif element.velocity.x < 0:  # Moving left
+                        element.rect.left = rect.right
+                        element.collided_left()
+                    collided = True
+                    get_tallest_down_collision(rect)
+
+            if one_above.colliderect(rect):
+                nonlocal one_above_collided, one_above_y_collision
+                one_above_collided = True
+                one_above_y_collision = rect.bottom
+
+    def handle_vertical_collisions():
+        nonlocal collided
+
+        for edge, rect in _colliding_rects:
+            if element.rect.colliderect(rect):
+                if edge not in (0b0011, 0b1001):
+                    if element.velocity.y > 0:  # Moving down
+                        element.rect.bottom = rect.top
+                        element.collided_down()
+                    elif element.velocity.y < 0:  # Moving up
+                        element.rect.top = rect.bottom
+                        element.collided_up()
+                    collided = True
+
+    def handle_ramps():
+        nonlocal collided
+
+        for edge, rect in ramps:
+            if element.rect.colliderect(rect):
+                dx = element.rect.right - rect.left if edge == 0b0011 else rect.right - element.rect.left
+                ramp_bottom = rect.bottom - dx
+
+                if dx > 0 and element.rect.bottom > ramp_bottom:
+                    element.rect.bottom = max(ramp_bottom, rect.top)
+                    if one_above_collided:
+                        adjust_for_one_above(edge)
+                    collided = True
+                    element.collided_down()
+
+                if tallest_down is not None and element.rect.bottom <= tallest_down:
+                    element.velocity.x = last_velocity
+
+    def adjust_for_one_above(edge):
+        nonlocal one_above_y_collision, last_velocity
+
+        new_top = max(one_above_y_collision, element.rect.top)
+        dy = new_top - element.rect.top
+        element.rect.x += dy if edge == 0b1001 else -dy
+        element.rect.top = new_top
+
+        if dy:
+            element.velocity.x = 0
+            last_velocity = 0
+
+    # Move horizontally (x direction)
+    one_above = element.rect.copy()
+    one_above.y -= commons.BLOCK_SIZE
+
+    one_above_collided = False
+    one_above_y_collision = 0.0
+
+    element.rect.x += element.velocity.x * delta_time
+    collided = False
+
+    _colliding_rects = colliding_rects[::-1] if element.velocity.x > 0 else colliding_rects
+    handle_horizontal_collisions()
+
+    if collided:
+        element.velocity.x = 0
+
+    # Move vertically (y direction)
+    element.rect.y += element.velocity.y * delta_time
+    collided = False
+
+    element.is_falling = True  # Initially assume the object is falling.
+
+    _colliding_rects = colliding_rects if element.velocity.y > 0 else colliding_rects[::-1]
+    handle_vertical_collisions()
+
+    ramps = [(edge, rect) for edge, rect in _colliding_rects if edge in (0b0011, 0b1001)]
+    handle_ramps()
+
+    if collided:
+        element.velocity.y = 0
+
+    # Update position vector to match adjusted rect
+    element.position.x, element.position.y = element.rect.topleft
+
+
+def _terrain(count: int):
+    """
+    The chunks (-2..2, -2..2) of a generated world, readable by the collision queries of World,
+    and `count` items (x, y, vx, vy) dropped a few blocks above the ground, as when blocks are mined.
+    """
+    from database.world import World
+    from physics.tile_collision import TileRegion
+    world = _GeneratedChunks(WorldGenerator(4))
+    for chunk_x in range(-2, 3):
+        for chunk_y in range(-2, 3):
+            world.load_chunk(chunk_x, chunk_y)
+    world.all_chunks = world.chunks  # What the collision queries of World read
+    world.get_collision_window = lambda *cells: World.get_collision_window(world, *cells)
+    world._collision_cells = lambda *cells: World._collision_cells(world, *cells)
+    world.focus_chunk, world.window_radius = (0, 0), 1  # The collision grid covers the chunks -2..2
+    world.collision_grid, world.collision_sources = TileRegion.EMPTY, {}
+
+    def column_top(column):
+        """World y of the first collidable cell of a column, from the top of the loaded chunks."""
+        chunk_x, col = divmod(column, commons.CHUNK_SIZE)
+        for chunk_y in range(-2, 3):
+            rows = np.flatnonzero(world.chunks[(chunk_x, chunk_y)].collidable_grid[:, col])
+            if len(rows):
+                return (chunk_y * commons.CHUNK_SIZE + rows[0]) * commons.BLOCK_SIZE
+        return 0
+
+    def surface(x):
+        """Top of the ground under an item at x, over every column its rect covers."""
+        left = int(x)
+        return min(column_top(column) for column in range(left // commons.BLOCK_SIZE, (left + int(commons.ITEM_SIZE) - 1) // commons.BLOCK_SIZE + 1))
+
+    starts = []
+    for _ in range(count):
+        x = random.uniform(-1900, 1900)
+        starts.append((x, surface(x) - random.uniform(2, 6) * commons.BLOCK_SIZE, random.uniform(-300, 300), random.uniform(-300, 0)))
+    return world, starts
+
+
+def bench_collision():
+    """500 items dropped on the terrain and sliding to rest: Rect list per item, against the grid collision regions."""
+    import pygame
+    from math import ceil
+    pygame.display.set_mode((commons.WIDTH, commons.HEIGHT))
+    BLOCK_METADATA.init()
+    S_ELEMENT_METADATA_LOADER.init()
+    ITEM_METADATA.init()
+    IMAGE_LOADER.init()
+    from database.world import World
+    from physics.item import Item
+
+    world, starts = _terrain(500)
+    delta_time = 1 / 60
+
+    def run(move):
+        items = [Item("1", (x, y), pygame.Vector2(vx, vy)) for x, y, vx, vy in starts]
+        def frame():
+            World.refresh_collision_grid(world)  # Once per step, as PhysicsManager
+            for item in items:
+                item.velocity.y = min(item.velocity.y + commons.GRAVITY_ACELERATION, commons.TERMINAL_SPEED)  # Per tick, as PhysicsManager
+                move(item)
+                item.velocity.x *= 0.97 if item.is_falling else 0.6
+        return _timed(frame, 120), [tuple(item.rect) for item in items]
+
+    def rect_lists(item):
+        x_dist = abs(ceil(item.velocity.x * delta_time)) + item.rect.width
+        y_dist = abs(ceil(item.velocity.y * delta_time)) + item.rect.height
+        _move_reference(item, _collision_blocks_around(world, item.rect.center, (x_dist, y_dist)), delta_time)
+
+    def regions(item):
+        displacement = (ceil(item.velocity.x * delta_time), ceil(item.velocity.y * delta_time))
+        item.move(World.get_collision_region(world, item.rect, displacement), delta_time)
+
+    reference_ms, reference_rects = run(rect_lists)
+    regions_ms, region_rects = run(regions)
+    mismatches = [index for index, (a, b) in enumerate(zip(reference_rects, region_rects)) if a != b]
+    print(f"  rect lists: {reference_ms:.2f} ms/frame")
+    print(f"  regions   : {regions_ms:.2f} ms/frame")
+    print(f"  final rects check: {len(mismatches)} mismatches over {len(starts)} items {mismatches[:10]}")
+    assert not mismatches, "the collision regions diverged from the reference"
+
+
+def bench_entities():
+    """Hundreds of enemies, projectiles and items around the player: every pair tested, against the spatial hashes and item arrays."""
+    import pygame
+    pygame.display.set_mode((commons.WIDTH, commons.HEIGHT))
+    ITEM_METADATA.init()
+    IMAGE_LOADER.init()
+    from physics.player import Player
+    from physics.bullet import Arrow
+    from physics.item import Item
+    from physics.physics_manager import PhysicsManager
+    from physics.entity_arena import ENEMIES, PLAYER_BULLETS, ENEMY_BULLETS
+
+    def run(count: int):
+        random.seed(count)
+        player = Player(position=pygame.Vector2(0, 0))
+        player.invulnerable = True  # Hits leave the player unchanged between the runs
+        manager = PhysicsManager(player, [], [], [], [])
+
+        def spread(index: int = 1):
+            if index % 10 == 0:  # Around the player, to exercise the pickups and the hits on the player
+                return pygame.Vector2(player.rect.centerx + random.uniform(-40, 40), player.rect.centery + random.uniform(-40, 40))
+            return pygame.Vector2(random.uniform(-4000, 4000), random.uniform(-1000, 1000))
+
+        for index in range(count):
+            enemy = manager.enemy_manager.spawn_enemy()
+            enemy.rect.topleft = spread()
+            manager.arena.add(ENEMIES, enemy)
+            manager.arena.add(PLAYER_BULLETS, Arrow(spread(), pygame.Vector2(600, 0)))
+            manager.arena.add(ENEMY_BULLETS, Arrow(spread(index), pygame.Vector2(-600, 0)))
+        items = [Item("1", spread(index), pygame.Vector2(0, 0)) for index in range(count)]  # As sprites for the reference
+        for item in items:
+            manager.items.spawn("1", item.position, (0, 0))
+
+        hits = {"reference": [0, 0, 0], "hashed": [0, 0, 0]}  # Bullets on enemies, items touching the player, hits on the player
+        counted = hits["hashed"]
+        manager._handle_bullet_hit_enemy = lambda bullet, enemy: counted.__setitem__(0, counted[0] + 1)
+        player.take_damage = lambda amount, direction='left': counted.__setitem__(2, counted[2] + 1)
+
+        def count_item(index):
+            counted[1] += 1
+            return False  # Not collected, the items stay for the next ticks
+
+        manager._handle_player_iten_collision = count_item
+        starts = [(entity, entity.rect.topleft) for entity in manager.enemies + manager.player_bullets + manager.enemy_bullets]
+        movers = [(enemy, 2 if index % 2 else -2) for index, enemy in enumerate(manager.enemies)]
+        movers += [(bullet, int(bullet.velocity.x / 60)) for bullet in manager.player_bullets + manager.enemy_bullets]
+
+        def reset():
+            for entity, topleft in starts:
+                entity.rect.topleft = topleft
+
+        def jitter():
+            for entity, dx in movers:  # Enemies walking, arrows flying, items at rest
+                entity.rect.x += dx
+
+        def reference():
+            jitter()
+            counts = hits["reference"]
+            for bullet in manager.player_bullets:
+                for enemy in manager.enemies:
+                    if bullet.rect.colliderect(enemy.rect):
+                        counts[0] += 1
+            for bullet in manager.enemy_bullets:
+                if player.rect.colliderect(bullet.rect):
+                    counts[2] += 1
+            for enemy in manager.enemies:
+                if player.rect.colliderect(enemy.rect) and enemy.is_alive():
+                    counts[2] += 1
+                if enemy.attacking and player.rect.colliderect(enemy.attack_area):
+                    counts[2] += 1
+            for item in items:
+                if player.rect.colliderect(item.rect):
+                    counts[1] += 1
+            for element in manager.moving_elements:
+                player.rect.colliderect(element.rect)
+            for item in items:
+                dif = player.position - item.position
+                if dif.length() <= commons.MAX_DISTANCE_OF_ITEM_ATTRACTION and dif.length() > 0:
+                    dif.normalize()
+
+        def hashed():
+            jitter()
+            manager.sync_spatial_hashes()
+            manager.handle_collisions()
+            manager.apply_player_attraction_force()
+
+        reset()
+        every_pair = _timed(reference, 30)
+        reset()
+        spatial_hashes = _timed(hashed, 30)
+        print(f"  {count} of each, every pair: {every_pair:.2f} ms/tick, spatial hashes: {spatial_hashes:.2f} ms/tick"
+              f" (hits {hits['reference']} / {hits['hashed']})")
+        assert hits["reference"] == hits["hashed"], "the spatial hashes missed or added collisions"
+
+    for count in (100, 300, 800):
+        run(count)
+
+
+def bench_items():
+    """Dropped items falling and resting on the terrain, then drawn: one sprite per item, against the item arrays."""
+    import pygame
+    from math import ceil
+    screen = pygame.display.set_mode((commons.WIDTH, commons.HEIGHT))
+    BLOCK_METADATA.init()
+    S_ELEMENT_METADATA_LOADER.init()
+    ITEM_METADATA.init()
+    IMAGE_LOADER.init()
+    from database.world import World
+    from physics.item import Item
+    from physics.item_store import ItemStore
+    from rendering.render_manager import RenderManager
+
+    delta_time = 1 / 60
+    player_position = pygame.Vector2(0, -200)
+    render_manager = RenderManager((0, 0))
+    render_manager.update_position((-commons.WIDTH / 2, -commons.HEIGHT / 2))
+
+    for count in (500, 2000):
+        world, starts = _terrain(count)
+        sprites = [Item("1", (x, y), pygame.Vector2(vx, vy)) for x, y, vx, vy in starts]
+        store = ItemStore()
+        for x, y, vx, vy in starts:
+            store.spawn("1", (x, y), (vx, vy))
+
+        def sprite_tick():
+            World.refresh_collision_grid(world)
+            for item in sprites:
+                item.velocity.y += commons.GRAVITY_ACELERATION
+                if item.velocity.magnitude() > commons.TERMINAL_SPEED:
+                    item.velocity.scale_to_length(commons.TERMINAL_SPEED)
+            for item in sprites:
+                dif = player_position - item.position
+                if dif.length() <= commons.MAX_DISTANCE_OF_ITEM_ATTRACTION and dif.length() > 0:
+                    item.velocity += dif.normalize() * commons.ITEM_ATTRACTION_FORCE
+            for item in sprites:
+                displacement = (ceil(item.velocity.x * delta_time), ceil(item.velocity.y * delta_time))
+                item.move(World.get_collision_region(world, item.rect, displacement), delta_time)
+            for item in sprites:
+                item.velocity.x *= 0.95 if item.is_falling else 0.85
+
+        def store_tick():
+            store.apply_gravity(commons.GRAVITY_ACELERATION, commons.TERMINAL_SPEED)
+            store.attract(player_position, commons.MAX_DISTANCE_OF_ITEM_ATTRACTION, commons.ITEM_ATTRACTION_FORCE)
+            store.move(world, delta_time)
+            store.apply_friction(0.95, 0.85)
+
+        sprite_ms, store_ms = _timed(sprite_tick, 120), _timed(store_tick, 120)
+        resting = f"{sum(not item.is_falling for item in sprites)} / {count - int(store.falling[:count].sum())} resting"
+        print(f"  {count} items, physics: sprites {sprite_ms:.2f} ms/tick, arrays {store_ms:.2f} ms/tick ({resting})")
+
+        sprite_draw = _timed(lambda: render_manager.render_moving_elements(sprites, screen), 60)
+        store_draw = _timed(lambda: render_manager.render_items(store, screen), 60)
+        render_manager.dirty_regions.sprite_rects.clear()
+        print(f"  {count} items, drawing: sprites {sprite_draw:.2f} ms/frame, arrays {store_draw:.2f} ms/frame")
+
+
+def bench_item_sleep():
+    """Ten seconds of heavy mining (two drops per step at 40 spots): item rows and cost with and without sleep and stacks."""
+    import pygame
+    screen = pygame.display.set_mode((commons.WIDTH, commons.HEIGHT))
+    BLOCK_METADATA.init()
+    S_ELEMENT_METADATA_LOADER.init()
+    ITEM_METADATA.init()
+    IMAGE_LOADER.init()
+    from physics.item_store import ItemStore
+
+    world, spots = _terrain(40)
+    delta_time = 1 / 60
+
+    for label, store in (("always simulated", ItemStore(sleep_ticks=0, merge_distance=0)), ("sleep and stacks", ItemStore())):
+        rng = random.Random(0)
+        report = []
+        times = []
+        for tick in range(600):
+            for _ in range(2):
+                x, y, _, _ = spots[rng.randrange(len(spots))]
+                store.spawn("1", (x, y), pygame.Vector2.from_polar((commons.ITEM_INITIAL_VELOCITY / 2, -180 * rng.random())))
+
+            start = perf_counter()
+            store.wake_changed_blocks(world)
+            store.apply_gravity(commons.GRAVITY_ACELERATION, commons.TERMINAL_SPEED)
+            store.move(world, delta_time)
+            store.settle()
+            store.apply_friction(0.95, 0.85)
+            times.append((perf_counter() - start) * 1000)
+
+            if tick % 120 == 119:
+                report.append(f"{(tick + 1) // 60}s: {store.count} rows {np.mean(times[-60:]):.2f} ms")
+        print(f"  {label}: " + ", ".join(report) + f" ({int(store.counts[:store.count].sum())} items)")
+
+
+def bench_arena():
+    """Thousands of projectiles with 5% expiring and respawning per tick: list.remove and concatenated render lists, against the entity arena."""
+    import random
+    from itertools import chain
+    from physics.entity_arena import EntityArena, PLAYER_BULLETS, ENEMY_BULLETS, ENEMIES
+
+    class Projectile:
+        __slots__ = ("ttl", "entity_id")
+
+        def __init__(self):
+            self.ttl = random.randrange(1, 40)  # About 5% expire per tick
+
+    for count in (1000, 5000):
+        random.seed(count)
+        lists = {kind: [Projectile() for _ in range(count)] for kind in (PLAYER_BULLETS, ENEMY_BULLETS)}
+        lists[ENEMIES] = [Projectile() for _ in range(count // 10)]
+        arena = EntityArena()
+        for kind, entities in lists.items():
+            for entity in entities:
+                arena.add(kind, Projectile())
+
+        def list_tick():
+            for entities in lists.values():
+                expired = 0
+                for entity in entities[:]:  # Copied so that the removals skip no entity
+                    entity.ttl -= 1
+                    if entity.ttl <= 0:
+                        entities.remove(entity)
+                        expired += 1
+                entities.extend(Projectile() for _ in range(expired))
+            for _ in lists[PLAYER_BULLETS] + lists[ENEMY_BULLETS] + lists[ENEMIES]:
+                pass
+
+        def arena_tick():
+            for kind in (PLAYER_BULLETS, ENEMY_BULLETS, ENEMIES):
+                expired = 0
+                for entity in arena.view(kind):
+                    entity.ttl -= 1
+                    if entity.ttl <= 0:
+                        arena.remove(entity)
+                        expired += 1
+                for _ in range(expired):
+                    arena.add(kind, Projectile())
+            arena.flush()
+            for _ in chain(arena.view(PLAYER_BULLETS), arena.view(ENEMY_BULLETS), arena.view(ENEMIES)):
+                pass
+
+        list_ms, arena_ms = _timed(list_tick, 60), _timed(arena_tick, 60)
+        print(f"  {count} of each projectile: lists {list_ms:.2f} ms/tick, arena {arena_ms:.2f} ms/tick"
+              f" ({sum(map(len, lists.values()))} / {len(arena)} entities)")
+
+
+BENCHMARKS = {
+    "generation": bench_generation,
+    "chunk_blobs": bench_chunk_blobs,
+    "connection": bench_connection,
+    "chunk_memory": bench_chunk_memory,
+    "rasterizer": bench_rasterizer,
+    "surface_cache": bench_surface_cache,
+    "window": bench_window,
+    "dirty_rects": bench_dirty_rects,
+    "static_elements": bench_static_elements,
+    "hud": bench_hud,
+    "rotation": bench_rotation,
+    "tint": bench_tint,
+    "collision": bench_collision,
+    "entities": bench_entities,
+    "items": bench_items,
+    "item_sleep": bench_item_sleep,
+    "arena": bench_arena,
+}
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    selected = sys.argv[1:] or list(BENCHMARKS)
+
+    for name in selected:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Available: {', '.join(BENCHMARKS)}")
+            continue
+        print(f"[{name}]")
+        BENCHMARKS[name]()
@@ -12,6 +12,54 @@ BLOCK_SIZE = 32
 
 CHUNK_SIZE_PIXELS = CHUNK_SIZE * BLOCK_SIZE
 
+CHUNK_GENERATION_WORKERS = 2 # Worker processes generating chunks in background
+
+CHUNK_PREFETCH_RING = 1 # Chunks beyond the rendered window generated ahead of the player
+
+RESIDENT_CHUNK_BUDGET = 64 # Chunks kept in memory, the least recently used ones far from the player are evicted
+
+ZOOM_LEVELS = (0.5, 0.75, 1.0, 1.5, 2.0) # Render scales, BLOCK_SIZE * zoom must be an integer
+
+DEFAULT_ZOOM = 1.0
+
+DIRTY_RECTS = False # Present only the screen regions changed by a frame (full frames while the camera scrolls)
+
+DIRTY_RECTS_MAX = 64 # Above this number of changed regions, the full frame is presented
+
+CHUNK_SURFACE_CACHE_BYTES = 128 * 1024 * 1024 # Memory of the rendered chunk surfaces kept for chunks re-entering the screen
+
+ROTATION_STEPS = 64 # Angles a rotated sprite (arrows, ...) can be drawn at, rotations are cached per step
+
+ROTATION_CACHE_SIZE = 512 # Rotated sprites kept, the least recently used ones are dropped
+
+TEXT_CACHE_SIZE = 256 # Rendered texts (item quantities, ...) kept by a render manager, the least recently used ones are dropped
+
+TINT_STEPS = 32 # Tints of the background layers over a day, each one rendered once
+
+TINT_CROSSFADE_LEVELS = 8 # Opacity levels of the crossfade from a tint step to the next one
+
+TINT_ROWS_PER_FRAME = 45 # Rows of a background layer tinted per frame while the next tint step is prepared
+
+TINT_CACHE_STEPS = 3 # Tinted pictures kept per background layer (current step, next step and a spare)
+
+AUTOSAVE_INTERVAL = 60 # Seconds between autosaves
+
+SIMULATION_RATE = 60 # Simulation steps per second, independent of the frame rate
+
+MAX_SIMULATION_STEPS = 5 # Steps a frame can run to catch up, the simulation slows down beyond it
+
+RENDER_FPS = 60 # Frames drawn per second, 0 for uncapped
+
+SPATIAL_HASH_CELL_SIZE = 128 # Side in pixels of the cells bucketing the entities for their collisions with each other
+
+ITEM_SLEEP_TICKS = 30 # Simulation steps a dropped item rests on the ground before sleeping (no more simulated)
+
+ITEM_SLEEP_SPEED = 5 # Horizontal speed (pixels per second) under which a grounded item is resting
+
+ITEM_MERGE_DISTANCE = BLOCK_SIZE # Sleeping items of the same kind closer than it (pixels, on each axis) merge into a stack
+
+AUTOSAVE_MAX_CHUNKS_PER_FRAME = 64 # Chunks copied by a frame starting an autosave, the rest continue on the next frames
+
 # Custom event type for handling page changes.
 # This event can be used to trigger page transitions in the game.
 # The event's dictionary contains the 'page' attribute, which specifies 
@@ -0,0 +1,95 @@
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Dict, Tuple, Iterator
+from itertools import repeat
+from .world_generator import generate_chunk_arrays, init_generation_worker
+import commons
+
+
+class ChunkProvider:
+    """
+    Generates chunks in a process pool, away from the frame thread.
+
+    Results are the plain numpy arrays returned by `WorldGenerator.generate_chunk_arrays`;
+    turning them into a Chunk is left to the World, on the main process.
+    """
+
+    def __init__(self, seed: int, workers: int = commons.CHUNK_GENERATION_WORKERS, prefetch_ring: int = commons.CHUNK_PREFETCH_RING):
+        """
+        Initializes the provider. Worker processes are only started on the first request.
+
+        :param seed: The world seed.
+        :param workers: Number of worker processes.
+        :param prefetch_ring: How many chunks beyond the rendered window are prefetched in the direction of travel.
+        """
+        self.seed = seed
+        self.prefetch_ring = prefetch_ring
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=init_generation_worker)
+        self.pending: Dict[Tuple[int, int], Future] = {}
+
+    def request(self, chunk_x: int, chunk_y: int):
+        """
+        Schedules the generation of a chunk, if it is not already pending.
+        """
+        key = (int(chunk_x), int(chunk_y))
+        if key not in self.pending:
+            self.pending[key] = self.executor.submit(generate_chunk_arrays, self.seed, *key)
+
+    def is_pending(self, chunk_x: int, chunk_y: int) -> bool:
+        return (int(chunk_x), int(chunk_y)) in self.pending
+
+    def result(self, chunk_x: int, chunk_y: int):
+        """
+        Waits for the generation of a chunk (requesting it if needed) and returns its arrays.
+        """
+        self.request(chunk_x, chunk_y)
+        return self.pending.pop((int(chunk_x), int(chunk_y))).result()
+
+    def generate_many(self, chunk_keys) -> Dict[Tuple[int, int], tuple]:
+        """
+        Generates several chunks in parallel and waits for all of them (used when saving and loading).
+
+        :param chunk_keys: Iterable of (chunk_x, chunk_y) positions.
+        :return: A dict mapping each (chunk_x, chunk_y) to its arrays.
+        """
+        keys = [(int(x), int(y)) for x, y in chunk_keys]
+        results = self.executor.map(generate_chunk_arrays, repeat(self.seed), [k[0] for k in keys], [k[1] for k in keys], chunksize=8)
+        return dict(zip(keys, results))
+
+    def completed(self) -> Iterator[Tuple[Tuple[int, int], tuple]]:
+        """
+        Yields ((chunk_x, chunk_y), arrays) for every generation finished since the last call.
+        """
+        for key, future in list(self.pending.items()):
+            if future.done():
+                del self.pending[key]
+                yield key, future.result()
+
+    def prefetch(self, chunk_x: int, chunk_y: int, direction: Tuple[int, int], loaded, window_radius: int = 1):
+        """
+        Speculatively requests the ring of chunks ahead of the rendered window in the direction of travel.
+
+        :param chunk_x: The chunk at the center of the window.
+        :param chunk_y: The chunk at the center of the window.
+        :param direction: Signs (-1, 0 or 1) of the player's velocity on each axis.
+        :param loaded: Container of the chunk positions already loaded (skipped).
+        :param window_radius: Chunks rendered on each side of the center one (1 for a 3x3 window).
+        """
+        dir_x, dir_y = direction
+
+        for distance in range(window_radius + 1, window_radius + 1 + self.prefetch_ring):
+            ahead = set()
+            if dir_x:
+                ahead.update((chunk_x + dir_x * distance, chunk_y + offset) for offset in range(-distance, distance + 1))
+            if dir_y:
+                ahead.update((chunk_x + offset, chunk_y + dir_y * distance) for offset in range(-distance, distance + 1))
+
+            for key in ahead:
+                if key not in loaded:
+                    self.request(*key)
+
+    def shutdown(self):
+        """
+        Stops the worker processes, dropping the generations not started yet.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pending.clear()
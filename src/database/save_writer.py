@@ -0,0 +1,100 @@
+from threading import Thread, Condition
+from time import perf_counter
+from typing import Callable, Dict, Optional
+import traceback
+
+
+class SaveWriter:
+    """
+    Writes save snapshots on a background thread, so the frame thread only pays for taking them.
+
+    A snapshot is a dict; its 'chunks' entry maps chunk positions to chunk snapshots
+    (see `World.snapshot_dirty_chunks`). Snapshots submitted while a write is running are
+    coalesced into a single pending one: their chunks are merged (the newest copy of a chunk wins)
+    and the other entries are replaced by the newest values.
+    """
+
+    def __init__(self, write: Callable[[dict], dict]):
+        """
+        Starts the writer thread.
+
+        :param write: Function writing a snapshot to the database, returning the counters of the save.
+        """
+        self.write = write
+        self.condition = Condition()
+        self.pending: Optional[dict] = None  # Snapshot waiting for the writer
+        self.writing: Optional[dict] = None  # Snapshot being written
+        self.busy: bool = False
+        self.closed: bool = False
+
+        self.coalesced: int = 0  # Snapshots merged into a pending one
+        self.last_stats: Dict[str, int] = {}
+        self.last_write_ms: float = 0.0
+
+        self.thread = Thread(target=self._run, name="SaveWriter", daemon=True)
+        self.thread.start()
+
+    def submit(self, snapshot: dict):
+        """
+        Queues a snapshot to be written, merging it with the pending one if the writer is busy.
+        """
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Submitting a save to a closed SaveWriter.")
+
+            if self.pending is None:
+                self.pending = snapshot
+            else:
+                chunks = self.pending.get('chunks', {})
+                chunks.update(snapshot.get('chunks', {}))
+                self.pending.update(snapshot)
+                self.pending['chunks'] = chunks
+                self.coalesced += 1
+            self.condition.notify_all()
+
+    def has_chunk(self, chunk_key) -> bool:
+        """
+        True if a copy of the chunk is waiting or being written (the database is not up to date for it yet).
+        """
+        with self.condition:
+            return any(chunk_key in snapshot.get('chunks', {}) for snapshot in (self.pending, self.writing) if snapshot)
+
+    def flush(self):
+        """
+        Waits until every submitted snapshot is written.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.pending is None and not self.busy)
+
+    def close(self):
+        """
+        Writes the pending snapshot and stops the writer thread.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending is not None or self.closed)
+                if self.pending is None:
+                    return # Closed with nothing left to write
+
+                snapshot, self.pending = self.pending, None
+                self.writing = snapshot
+                self.busy = True
+
+            start = perf_counter()
+            try:
+                self.last_stats = self.write(snapshot)
+            except Exception:
+                print("Save failed:")
+                traceback.print_exc()
+            self.last_write_ms = (perf_counter() - start) * 1000
+
+            with self.condition:
+                self.writing = None
+                self.busy = False
+                self.condition.notify_all()
@@ -1,18 +1,22 @@
-from .world_loader import WorldLoader
-from .world_elements.chunk import Chunk
+from .world_loader import WorldLoader, WORLD_LOADER
+from .world_elements.chunk import Chunk, EDGES_DTYPE
 from .world_elements.static_element import StaticElement
 from .world_generator import WorldGenerator
+from .chunk_provider import ChunkProvider
+from .save_writer import SaveWriter
 from .world_elements.block_metadata_loader import BLOCK_METADATA
 from .world_elements.item_metadata import ITEM_METADATA
 from .world_elements.static_elements_manager import S_ELEMENT_METADATA_LOADER
 from audio.audio_manager import AUDIO_MANAGER
 from pygame.math import Vector2 as v2
 from physics.player import Player
+from physics.tile_collision import TileRegion
 from pygame.rect import Rect
 import pygame
-from typing import Dict, Tuple, Set
+import numpy as np
+from typing import Dict, Tuple, Set, Optional
+from collections import OrderedDict
 import commons
-from math import ceil
 from threading import Thread
 
 
@@ -30,144 +34,294 @@ class World:
         a database interface, and a world generator.
         """
         self.world_name   : str         = world_name
-        self.all_chunks   : Dict[tuple[int, int], Chunk]        = {}
-        self.db_interface : WorldLoader = WorldLoader()
+        self.all_chunks   : OrderedDict[tuple[int, int], Chunk] = OrderedDict()  # Resident chunks, least recently used first
+        self.db_interface : WorldLoader = WORLD_LOADER  # Shared, keeps one connection per thread
         self.world        : dict        = self.db_interface.get_world(self.world_name)
         self.world_id     : int         = self.world['world_id']
         self.generator    : WorldGenerator = WorldGenerator(self.world['seed'])
+        self.chunk_provider: ChunkProvider = ChunkProvider(self.world['seed'])  # Generates new chunks in background
         self.mining_blocks: Dict[Tuple[int, int, int, int], int] = {}  # Tracks mining level of blocks being mined
         self.mining_objects: Dict[StaticElement, Chunk] = {}  # Tracks mining level of blocks being mined
+        self.last_save_stats: Dict[str, int] = {}  # Chunks and rows written by the last save
+        self.stored_chunks: Set[Tuple[int, int]] = set()  # Saved chunks without blob, waiting for their generation
+        self.resident_budget: int = commons.RESIDENT_CHUNK_BUDGET
+        self.focus_chunk: Tuple[int, int] = (0, 0)  # Chunk of the player, never evicted with its surroundings
+        self.window_radius: int = 1  # Chunks rendered around the focus on each side, set by the render manager
+        self.save_writer: Optional[SaveWriter] = None  # Writer of the game saves, set by the game page
+        self.collision_grid: TileRegion = TileRegion.EMPTY  # Collidable cells around the focus, see `refresh_collision_grid`
+        self.collision_sources: Dict[Tuple[int, int], tuple] = {}  # Chunk -> (collidable, edges, blocks version) copied in the grid
 
 
         if self.world_id is None:
             raise ValueError(f"World '{self.world_name}' does not exist in the database.")
 
-        self.load_all_data()
+        if self.world['block_storage'] < WorldLoader.DELTA_BLOCK_STORAGE:
+            self.db_interface.migrate_to_delta_storage(self.world_id, self.generator)
 
-    def _gen(self, chunk: Chunk):
+        # Chunks are streamed from the database on demand by `load_chunk`
+
+    def _gen(self, chunk: Chunk, arrays=None):
+        """
+        Fill a chunk with generated terrain, waiting for its generation if `arrays` is not given.
+        Saved chunks without a blob get their stored changes replayed on top of the generation.
+        """
         chunk_x, chunk_y = chunk.pos
-        self.generator.generate_chunk(chunk)
-
-        # Verifying around chunks to update their edges matrix
-        for i in range(0, 4):
-            match i:
-                case 0:
-                    around_chunk = self.all_chunks.get((chunk_x-1, chunk_y))
-                case 1:
-                    around_chunk = self.all_chunks.get((chunk_x, chunk_y-1))
-                case 2:
-                    around_chunk = self.all_chunks.get((chunk_x+1, chunk_y))
-                case 3:
-                    around_chunk = self.all_chunks.get((chunk_x, chunk_y+1))
-            
-            if around_chunk: #Check if it exists
-                self.generator.update_edges_matrix(chunk, around_chunk, index=i)
-        
-        chunk.completed_created = True
+        if arrays is None:
+            arrays = self.chunk_provider.result(chunk_x, chunk_y)
+        self.generator.fill_chunk(chunk, arrays)
+
+        chunk_key = (int(chunk_x), int(chunk_y))
+        if chunk_key in self.stored_chunks:
+            self.stored_chunks.discard(chunk_key)
+            self._restore_saved(chunk, replay_blocks=True)
+
+        self._complete(chunk)
 
-    def load_chunk(self, chunk_x, chunk_y):
+    def _new_chunk(self, chunk_x: int, chunk_y: int) -> Chunk:
         """
-        Load a specific chunk by its coordinates.
-        If the chunk does not exist in the database, generate a new chunk.
+        Create and register a chunk. A chunk saved as a blob is restored at once,
+        the others are placeholders (completed_created is False) to be filled by `_gen`.
         """
         chunk_key = (chunk_x, chunk_y)
-        if chunk_key in self.all_chunks:
-            chunk = self.all_chunks[chunk_key]
-            chunk.changes['all'] = True
-            return chunk  # Return already loaded chunk
-        
+        chunk = Chunk(chunk_x, chunk_y)
+        self.all_chunks[chunk_key] = chunk
 
-        if True or not blocks:
-            # Generate a new chunk if no data exists
-            chunk = Chunk(chunk_x, chunk_y)
-            
-            self._gen(chunk)
+        # A copy of the chunk may still be on its way to the database
+        if self.save_writer is not None and self.save_writer.has_chunk(chunk_key):
+            self.save_writer.flush()
 
-            # Optionally, save the generated chunk back to the database here
+        with self.db_interface.transaction():
+            if not self.db_interface.has_chunk(self.world_id, chunk_x, chunk_y):
+                return chunk
 
-        else:
-            # Create a new chunk
-            chunk = Chunk(chunk_x, chunk_y)
+            blob = self.db_interface.load_chunk_blob(self.world_id, chunk_x, chunk_y)
+            if blob is None:
+                self.stored_chunks.add(chunk_key) # Generated, then patched by `_gen`
+                return chunk
 
-            # Add loaded data to the chunk
-            for block in blocks:
-                chunk.add_block(block)
-            for static_object in static_objects:
-                chunk.add_static_object(static_object)
-            # for entity in moving_entities:
-            #    chunk.add_moving_entity(entity)
+            chunk.set_blocks(blob[0])
+            self._restore_saved(chunk, replay_blocks=False)
 
-        # Store the chunk in the dictionary
-        self.all_chunks[chunk_key] = chunk
+        self._complete(chunk)
         return chunk
 
-    def save_all_data(self):
-        blocks_to_be_saved = []
-        static_elements_to_be_saved = []
-        chunks_to_be_saved = []
-        for chunk in self.all_chunks.values():
-            chunks_to_be_saved.append({'x': chunk.pos.x, 'y': chunk.pos.y})
-            for x in range(commons.CHUNK_SIZE):
-                for y in range(commons.CHUNK_SIZE):
-                    l0 = {'x': x+chunk.pos.x*commons.CHUNK_SIZE, 'y': y+chunk.pos.y*commons.CHUNK_SIZE, 'type': int(chunk.blocks_grid[0, y, x]), 'layer': 0}
-                    l1 = {'x': x+chunk.pos.x*commons.CHUNK_SIZE, 'y': y+chunk.pos.y*commons.CHUNK_SIZE, 'type': int(chunk.blocks_grid[1, y, x]), 'layer': 1}
-                    blocks_to_be_saved.append(l0)
-                    blocks_to_be_saved.append(l1)
-            
-            for s in chunk.world_elements:
-                static_elements_to_be_saved.append(
-                    {'x': s.rect.x, 
-                     'y': s.rect.bottom,
-                     'width': s.rect.w,
-                     'height': s.rect.h,
-                     'health': s.health,
-                     'type': s.id
-                     }
-                )
+    def _restore_saved(self, chunk: Chunk, replay_blocks: bool):
+        """
+        Apply the saved static elements of a chunk and, if asked, the block rows stored by older saves.
+        """
+        x, y = int(chunk.pos.x), int(chunk.pos.y)
+
+        if replay_blocks:
+            blocks = self.db_interface.load_blocks(self.world_id, x*commons.CHUNK_SIZE, (x+1)*commons.CHUNK_SIZE-1, y*commons.CHUNK_SIZE, (y+1)*commons.CHUNK_SIZE-1)
+            if blocks:
+                block_x, block_y, layer, block_type = np.array(blocks, dtype=int).T
+                blocks_grid = np.array(chunk.blocks_grid)
+                blocks_grid[layer, block_y % commons.CHUNK_SIZE, block_x % commons.CHUNK_SIZE] = block_type
+                chunk.set_blocks(blocks_grid)
+
+        static_elements = self.db_interface.load_static_objects(self.world_id, x*commons.CHUNK_SIZE_PIXELS, (x+1)*commons.CHUNK_SIZE_PIXELS-1, y*commons.CHUNK_SIZE_PIXELS, (y+1)*commons.CHUNK_SIZE_PIXELS-1)
+
+        # The saved static elements replace the generated ones (destroyed trees are not stored)
+        chunk.world_elements = [StaticElement.from_dict(s) for s in static_elements]
+
+    def _complete(self, chunk: Chunk):
+        """
+        Stitch a filled chunk with the loaded chunks around and mark it as created.
+        """
+        # Stitching the edges matrix with the around chunks in a single pass
+        chunk.changes['all'] = True
+        chunk.update_edges(**self.get_neighbours(int(chunk.pos.x), int(chunk.pos.y)))
+
+        chunk.completed_created = True
+        chunk.mark_saved(chunk.version) # Equal to the database (or to the generation) until changed
+
+    def get_neighbours(self, chunk_x, chunk_y) -> Dict[str, Chunk]:
+        """
+        Get the loaded chunks around a chunk position, as expected by `Chunk.update_edges`.
+
+        :return: A dict with the 'left', 'top', 'right' and 'bottom' chunks (None if not loaded).
+        """
+        neighbours = {'left':   self.all_chunks.get((chunk_x-1, chunk_y)),
+                      'top':    self.all_chunks.get((chunk_x, chunk_y-1)),
+                      'right':  self.all_chunks.get((chunk_x+1, chunk_y)),
+                      'bottom': self.all_chunks.get((chunk_x, chunk_y+1))}
         
-        self.db_interface.save_blocks(self.world_id, blocks_to_be_saved)
-        self.db_interface.save_static_objects(self.world_id, static_elements_to_be_saved)
-        self.db_interface.save_chunks(self.world_id, chunks_to_be_saved)
+        # Chunks still being generated are placeholders, they are stitched when they are filled
+        return {side: c if c and c.completed_created else None for side, c in neighbours.items()}
 
-    def load_all_data(self):
-        self.load_all_chunks()
+    def load_chunk(self, chunk_x, chunk_y, wait=True):
+        """
+        Load a specific chunk by its coordinates, from memory, the database or the generator.
 
-    def load_all_chunks(self, min_health=None):
-        chunks = self.db_interface.load_chunks(self.world_id)
-        for c in chunks:
+        :param wait: If False, a chunk not generated yet is returned as a placeholder
+                     (completed_created is False) and filled once its generation finishes.
+        """
+        chunk_key = (int(chunk_x), int(chunk_y))
+        chunk = self.all_chunks.get(chunk_key)
 
-            x, y = c['x'], c['y']
-            new_chunk = Chunk(x, y)
-            blocks = self.db_interface.load_blocks(self.world_id, x*commons.CHUNK_SIZE, (x+1)*commons.CHUNK_SIZE-1, y*commons.CHUNK_SIZE, (y+1)*commons.CHUNK_SIZE-1)
-            for b in blocks:
-                new_chunk.add_block(b[3], b[0]%commons.CHUNK_SIZE, b[1]%commons.CHUNK_SIZE, b[2])
+        if chunk is not None:
+            self.all_chunks.move_to_end(chunk_key) # Most recently used
+            if wait and not chunk.completed_created:
+                self._gen(chunk)
+            return chunk  # Return already loaded chunk
 
-            static_elements = self.db_interface.load_static_objects(self.world_id, x*commons.CHUNK_SIZE_PIXELS, (x+1)*commons.CHUNK_SIZE_PIXELS-1, y*commons.CHUNK_SIZE_PIXELS, (y+1)*commons.CHUNK_SIZE_PIXELS-1)
+        chunk = self._new_chunk(*chunk_key)
 
-            for s in static_elements:
-                new_chunk.add_static_element(StaticElement.from_dict(s))
-            
-            self.all_chunks[(x, y)] = new_chunk
-
-            # Verifying around chunks to update their edges matrix
-            for i in range(0, 4):
-                match i:
-                    case 0:
-                        around_chunk = self.all_chunks.get((x-1, y))
-                    case 1:
-                        around_chunk = self.all_chunks.get((x, y-1))
-                    case 2:
-                        around_chunk = self.all_chunks.get((x+1, y))
-                    case 3:
-                        around_chunk = self.all_chunks.get((x, y+1))
-                
-                if around_chunk: #Check if it exists
-                    self.generator.update_edges_matrix(new_chunk, around_chunk, index=i)
-            
-            new_chunk.changes['all'] = True
+        if not chunk.completed_created:
+            if wait:
+                self._gen(chunk)
+            else:
+                self.chunk_provider.request(*chunk_key)
+
+        return chunk
 
-            new_chunk.completed_created = True
+    def collect_generated_chunks(self):
+        """
+        Fill the chunks whose background generation finished, including the prefetched ones.
+        """
+        for chunk_key, arrays in self.chunk_provider.completed():
+            chunk = self.all_chunks.get(chunk_key)
+            if chunk is None:
+                chunk = self._new_chunk(*chunk_key)
             
+            if not chunk.completed_created:
+                self._gen(chunk, arrays)
+
+    def evict_chunks(self):
+        """
+        Drop the least recently used chunks beyond the resident budget, keeping the ones around the focus.
+        Changed chunks are flushed first: handed to the save writer, or written at once without one.
+        """
+        excess = len(self.all_chunks) - self.resident_budget
+        if excess <= 0:
+            return
+
+        focus_x, focus_y = self.focus_chunk
+        protected_radius = self.window_radius + self.chunk_provider.prefetch_ring # Rendered window and prefetched ring
+
+        evicted = []
+        for chunk_key, chunk in self.all_chunks.items():
+            if len(evicted) == excess:
+                break
+            if not chunk.completed_created: 
+                continue # Still being generated
+            if max(abs(chunk_key[0] - focus_x), abs(chunk_key[1] - focus_y)) <= protected_radius:
+                continue
+            evicted.append(chunk_key)
+
+        snapshot = {}
+        for chunk_key in evicted:
+            chunk = self.all_chunks.pop(chunk_key)
+            if chunk.is_dirty:
+                snapshot[chunk_key] = self._snapshot_chunk(chunk)
+
+        if snapshot:
+            if self.save_writer is not None:
+                self.save_writer.submit({'chunks': snapshot})
+            else:
+                self.write_snapshot(snapshot)
+
+    def prefetch_chunks(self, position, velocity):
+        """
+        Speculatively generate the chunks ahead of a moving position (usually the player).
+
+        :param position: The (x, y) position in world coordinates.
+        :param velocity: The velocity, whose signs give the direction of travel.
+        """
+        chunk_x = int(position[0] // commons.CHUNK_SIZE_PIXELS)
+        chunk_y = int(position[1] // commons.CHUNK_SIZE_PIXELS)
+        self.focus_chunk = (chunk_x, chunk_y)
+
+        direction = tuple(0 if abs(v) < 1 else (1 if v > 0 else -1) for v in velocity)
+        if direction == (0, 0):
+            return
+
+        self.chunk_provider.prefetch(chunk_x, chunk_y, direction, self.all_chunks, self.window_radius)
+
+    def close(self):
+        """
+        Release the background generation workers.
+        """
+        self.chunk_provider.shutdown()
+
+    def snapshot_dirty_chunks(self, limit=None) -> Dict[Tuple[int, int], tuple]:
+        """
+        Copy the chunks changed since their last snapshot, for a save that may run on another thread.
+        Only the blocks grid is copied (a few KiB per chunk), static elements are turned into dicts.
+
+        :param limit: Maximum number of chunks to take, the others are left for the next snapshot.
+        :return: A dict mapping (chunk_x, chunk_y) to (chunk, version, blocks_grid, static_elements).
+        """
+        snapshot = {}
+        for chunk in self.all_chunks.values():
+            if not chunk.completed_created or not chunk.needs_snapshot:
+                continue # Skipping placeholders of chunks still being generated and chunks already taken
+            if limit is not None and len(snapshot) >= limit:
+                break
+            snapshot[(int(chunk.pos.x), int(chunk.pos.y))] = self._snapshot_chunk(chunk)
+
+        return snapshot
+
+    def _snapshot_chunk(self, chunk: Chunk) -> tuple:
+        """
+        Copy the saved data of a chunk, see `snapshot_dirty_chunks`.
+        """
+        static_elements = [
+            {'x': s.rect.x, 
+             'y': s.rect.bottom,
+             'width': s.rect.w,
+             'height': s.rect.h,
+             'health': s.health,
+             'type': s.id
+             }
+            for s in chunk.world_elements
+        ]
+        chunk.queued_version = chunk.version
+        return (chunk, chunk.version, chunk.blocks_grid.copy(), static_elements)
+
+    def write_snapshot(self, snapshot: Dict[Tuple[int, int], tuple]) -> Dict[str, int]:
+        """
+        Write a snapshot taken by `snapshot_dirty_chunks`. Chunks differing from their procedural generation
+        are stored as compressed blobs (see `WorldLoader.save_chunk_blobs`), untouched chunks cost no block data.
+        Safe to call from a writer thread.
+
+        :return: The counters of the save, also kept in `last_save_stats`.
+        """
+        try:
+            generated = self.chunk_provider.generate_many(snapshot)
+
+            chunk_blobs = {}
+            chunk_static_elements = {}
+            for chunk_key, (chunk, version, blocks_grid, static_elements) in snapshot.items():
+                modified = not np.array_equal(blocks_grid, generated[chunk_key][0])
+                chunk_blobs[chunk_key] = (blocks_grid, None) if modified else None
+                chunk_static_elements[chunk_key] = static_elements
+
+            with self.db_interface.transaction():
+                blob_rows = self.db_interface.save_chunk_blobs(self.world_id, chunk_blobs)
+                static_rows = self.db_interface.replace_static_objects(self.world_id, chunk_static_elements)
+                chunk_rows = self.db_interface.save_chunks(self.world_id, [{'x': x, 'y': y} for x, y in snapshot])
+        except Exception:
+            for chunk, _, _, _ in snapshot.values():
+                chunk.requeue()
+            raise
+
+        for chunk, version, _, _ in snapshot.values():
+            chunk.mark_saved(version)
+
+        self.last_save_stats = {'chunks': len(snapshot),
+                                'blob_rows': blob_rows,
+                                'static_rows': static_rows,
+                                'rows': blob_rows + static_rows + chunk_rows}
+        return self.last_save_stats
+
+    def save_all_data(self):
+        """
+        Save the chunks changed since the last save, on the calling thread.
+
+        :return: The counters of the save, also kept in `last_save_stats`.
+        """
+        return self.write_snapshot(self.snapshot_dirty_chunks())
 
     def mine(self, position, dimensions, damage, delta_time):
         """
@@ -228,7 +382,7 @@ class World:
                 chunk = self.all_chunks.get(chunk_key)
 
                 # Skip if the chunk is not loaded
-                if chunk is None:
+                if chunk is None or not chunk.completed_created:
                     continue
                 
                 visited_chunks.add(chunk)
@@ -246,6 +400,7 @@ class World:
                 if mining_area.colliderect(s_el.rect):
                     # Apply damage to the static object's mining state
                     s_el.take_damage(damage, delta_time)
+                    chunk.mark_dirty()
                     self.mining_objects[s_el] = chunk
                     AUDIO_MANAGER.play_sound("CUT")
     
@@ -283,7 +438,7 @@ class World:
         cols_range = final_abs_x - block_abs_x
 
 
-        update_around = False
+        border_chunks : Set[Chunk] = set() # Chunks with blocks put on their borders
 
         visited_chunks : Set[Chunk] = set()
 
@@ -291,7 +446,7 @@ class World:
             for col_offset in range(0, cols_range + 1):
                 # Determine the local block coordinates
                 if quant == putted:
-                    return putted
+                    break # The border chunks still need their edges stitched below
                 
                 local_col = block_x + col_offset
                 local_row = block_y + row_offset
@@ -319,7 +474,7 @@ class World:
                 chunk = self.all_chunks.get(chunk_key)
 
                 # Skip if the chunk is not loaded
-                if chunk is None:
+                if chunk is None or not chunk.completed_created:
                     continue
                 
                 visited_chunks.add(chunk)
@@ -337,38 +492,31 @@ class World:
                 if chunk.blocks_grid[1, local_row, local_col] == 0 and down: #verify if it's air
                     #chunk.changes['block'].append((local_col, local_row))
                     if local_col == commons.CHUNK_SIZE - 1 or local_col == 0 or local_row == 0 or local_row == commons.CHUNK_SIZE -1:
-                        update_around = True
+                        border_chunks.add(chunk)
                     
                     chunk.add_block(block_type, local_col, local_row, 1)
                     putted += 1
                 
                 if chunk.blocks_grid[0, local_row, local_col] == 0 and not down:
                     if local_col == commons.CHUNK_SIZE - 1 or local_col == 0 or local_row == 0 or local_row == commons.CHUNK_SIZE -1:
-                        update_around = True
+                        border_chunks.add(chunk)
                     #chunk.changes['block'].append((local_col, local_row))
                     chunk.add_block(block_type, local_col, local_row, 0)
                     putted += 1
+
+            if quant == putted:
+                break
         
-        if update_around and (cchunk := self.all_chunks.get((chunk_x, chunk_y), None)):
-            for i in range(0, 4):
-                match i:
-                    case 0: 
-                        around_chunk = self.all_chunks.get((chunk_x-1, chunk_y))
-                    case 1:
-                        around_chunk = self.all_chunks.get((chunk_x, chunk_y-1))
-                    case 2:
-                        around_chunk = self.all_chunks.get((chunk_x+1, chunk_y))
-                    case 3:
-                        around_chunk = self.all_chunks.get((chunk_x, chunk_y+1))
-                
-                if around_chunk: #Check if it exists
-                    self.generator.update_edges_matrix(cchunk, around_chunk, index=i)
+        for cchunk in border_chunks:
+            cchunk.update_edges(**self.get_neighbours(int(cchunk.pos.x), int(cchunk.pos.y)))
         
         return putted
                     
         
 
     def update_world_state(self, delta_time: float):
+        self.collect_generated_chunks()
+        self.evict_chunks()
         self.update_blocks_state(delta_time)
         self.update_objects_state(delta_time)
     
@@ -412,25 +560,9 @@ class World:
 
                                 pygame.event.post(pygame.event.Event(commons.ITEM_DROP_EVENT, drop_event_dict))
                         
-                        if col == 0 and (side_chunk := self.all_chunks.get((chunk_x-1, chunk_y), None)):
-                            
-                            if side_chunk.edges_matrix[layer, row, commons.CHUNK_SIZE-1] & 0b0010:
-                                side_chunk.edges_matrix[layer, row, commons.CHUNK_SIZE-1] -= 0b0010
-                                side_chunk.changes['block'].append((commons.CHUNK_SIZE-1, row))
-                            
-                        if col == commons.CHUNK_SIZE-1 and (side_chunk := self.all_chunks.get((chunk_x+1, chunk_y), None)):
-                            if side_chunk.edges_matrix[layer, row, 0] & 0b1000:
-                                side_chunk.edges_matrix[layer, row, 0] -= 0b1000
-                                side_chunk.changes['block'].append((0, row))
-                        
-                        if row == 0 and (side_chunk := self.all_chunks.get((chunk_x, chunk_y-1), None)):
-                            if side_chunk.edges_matrix[layer, commons.CHUNK_SIZE-1, col] & 0b0001:
-                                side_chunk.edges_matrix[layer, commons.CHUNK_SIZE-1, col] -= 0b0001
-                                side_chunk.changes['block'].append((col, commons.CHUNK_SIZE-1))
-                        if row == commons.CHUNK_SIZE-1 and (side_chunk := self.all_chunks.get((chunk_x, chunk_y+1), None)):
-                            if side_chunk.edges_matrix[layer, 0, col] & 0b0100:
-                                side_chunk.edges_matrix[layer, 0, col] -= 0b0100
-                                side_chunk.changes['block'].append((col, 0))
+                        if col in (0, commons.CHUNK_SIZE-1) or row in (0, commons.CHUNK_SIZE-1):
+                            # Border block: the around chunks lose their edge to it
+                            chunk.update_edges(**self.get_neighbours(chunk_x, chunk_y))
                         
                     else:
                         # Decrease block damage, considering recuperation
@@ -461,7 +593,7 @@ class World:
                     item_id = ITEM_METADATA.get_id_by_name(iten_name)
                     for _ in range(quant):
                         pygame.event.post(pygame.event.Event(commons.ITEM_DROP_EVENT, {"item": item_id, "pos": s_el.rect.center}))
-                chunk.world_elements.remove(s_el)
+                chunk.remove_static_element(s_el)
                 destroyed_objects.append(s_el)
                 pygame.event.post(pygame.event.Event(commons.S_ELEMENT_BROKEN))
             else:
@@ -474,80 +606,146 @@ class World:
         for o in destroyed_objects:
             self.mining_objects.pop(o)
 
-    def get_collision_blocks_around(self, position, dimensions):
+    def refresh_collision_grid(self):
         """
-        Get all collidable blocks in a rectangular area around a specific position.
-
-        :param position: A tuple (x, y) representing the central position in world coordinates.
-        :param dimensions: A tuple (width, height) specifying the rectangular area's size in world coordinates.
-        :return: A list of Rect objects representing the collidable blocks.
+        Keep `collision_grid` stitched from the chunks around the focus: the rendered window and one chunk of
+        margin. Called once per physics step, before the moves. Only the chunks whose grids changed since the
+        last step are copied again; the whole grid is stitched anew when the focus moves.
         """
-        # Extract coordinates
-        x, y = position
-
-        # Determine the chunk and block indices for the starting position
-        chunk_x, block_x_offset = divmod(x, commons.CHUNK_SIZE_PIXELS)
-        block_x = block_x_offset // commons.BLOCK_SIZE
-        if x < 0 and not chunk_x:
-            chunk_x -= 1
-
-        chunk_y, block_y_offset = divmod(y, commons.CHUNK_SIZE_PIXELS)
-        block_y = block_y_offset // commons.BLOCK_SIZE
-        if y < 0 and not chunk_y:
-            chunk_y -= 1
-
-        # Initialize the list to store collidable blocks
-        collidable_blocks = []
-        edge_blocks = []
-
-        # Calculate the number of blocks in each direction based on dimensions
-        rows_range = max(ceil(dimensions[1] / commons.BLOCK_SIZE), 1)  # Vertical range
-        cols_range = max(ceil(dimensions[0] / commons.BLOCK_SIZE), 1)  # Horizontal range
-
-        # Iterate through the potential grid area
-        for row_offset in range(-rows_range, rows_range+1):
-            for col_offset in range(-cols_range, cols_range+1):
-                # Calculate the relative coordinates of the block
-                local_col = block_x + col_offset
-                local_row = block_y + row_offset
-
-                # Adjust chunk coordinates and block indices for wrapping
-                current_chunk_x = chunk_x
-                current_chunk_y = chunk_y
-
-                # Handle column wrapping
-                if local_col < 0:
-                    current_chunk_x -= 1
-                    local_col %= commons.CHUNK_SIZE
-                elif local_col >= commons.CHUNK_SIZE:
-                    current_chunk_x += 1
-                    local_col %= commons.CHUNK_SIZE
+        cells = commons.CHUNK_SIZE
+        radius = self.window_radius + 1
+        focus_x, focus_y = self.focus_chunk
+        col0, row0 = (focus_x - radius) * cells, (focus_y - radius) * cells
+        span = (2 * radius + 1) * cells
+
+        grid = self.collision_grid
+        if (grid.col0, grid.row0, grid.collidable.shape) != (col0, row0, (span, span)):
+            collidable, edges = self._collision_cells(col0, row0, col0 + span, row0 + span)
+            self.collision_grid = TileRegion(np.array(collidable), np.array(edges), col0, row0)
+            self.collision_sources = {}
+            grid = None
+
+        # The chunks replace their grids when they are filled or their edges change, and count their block writes
+        for chunk_y in range(focus_y - radius, focus_y + radius + 1):
+            for chunk_x in range(focus_x - radius, focus_x + radius + 1):
+                chunk = self.all_chunks.get((chunk_x, chunk_y))
+                source = None if chunk is None else (chunk.collidable_grid, chunk.edges_matrix, chunk.blocks_version)
+                copied = self.collision_sources.get((chunk_x, chunk_y))
+                if source is None or copied is None:
+                    if source is copied:
+                        continue
+                elif copied[0] is source[0] and copied[1] is source[1] and copied[2] == source[2]:
+                    continue
 
-                # Handle row wrapping
-                if local_row < 0:
-                    current_chunk_y -= 1
-                    local_row %= commons.CHUNK_SIZE
-                elif local_row >= commons.CHUNK_SIZE:
-                    current_chunk_y += 1
-                    local_row %= commons.CHUNK_SIZE
+                self.collision_sources[(chunk_x, chunk_y)] = source
+                if grid is None:
+                    continue  # Just stitched
+                rows = slice(chunk_y * cells - row0, (chunk_y + 1) * cells - row0)
+                cols = slice(chunk_x * cells - col0, (chunk_x + 1) * cells - col0)
+                grid.collidable[rows, cols] = False if chunk is None else chunk.collidable_grid
+                grid.edges[rows, cols] = 0 if chunk is None else chunk.edges_matrix[0]
+                grid.refresh(rows, cols)
 
-                # Get the chunk at the current position
-                chunk_key = (current_chunk_x, current_chunk_y)
-                chunk = self.all_chunks.get(chunk_key, None)
+    def get_collision_region(self, rect: Rect, displacement: Tuple[int, int]) -> TileRegion:
+        """
+        Get the collidable cells an entity can touch while moving: its rect swept by a displacement,
+        with one block of margin around.
 
-                if chunk is None:
-                    continue# If the chunk isn't loaded, raise an error
-                    raise RuntimeError("Attempting to get collision blocks from non-generated chunks")
+        :param rect: The rect of the entity in world coordinates.
+        :param displacement: The (dx, dy) move of the entity in pixels.
+        :return: The TileRegion of the cells, empty where the chunks are not loaded.
+        """
+        size = commons.BLOCK_SIZE
+        cells = commons.CHUNK_SIZE
+        dx, dy = displacement
+
+        col0 = (rect.left + min(dx, 0) - size) // size
+        col1 = -(-(rect.right + max(dx, 0) + size) // size)
+        row0 = (rect.top + min(dy, 0) - size) // size
+        row1 = -(-(rect.bottom + max(dy, 0) + size) // size)
+
+        # Around the focus, the stitched grid: nothing to build, the moves read it in place
+        grid = self.collision_grid
+        r0, r1, c0, c1 = row0 - grid.row0, row1 - grid.row0, col0 - grid.col0, col1 - grid.col0
+        rows, cols = grid.collidable.shape
+        if 0 <= r0 and r1 <= rows and 0 <= c0 and c1 <= cols:
+            return grid if np.count_nonzero(grid.collidable[r0:r1, c0:c1]) else TileRegion.EMPTY
+
+        # Elsewhere, a region of its own: views of the grids of the chunk when the window lies in one
+        chunk_x, chunk_y = col0 // cells, row0 // cells
+        if (col1 - 1) // cells == chunk_x and (row1 - 1) // cells == chunk_y:
+            chunk = self.all_chunks.get((chunk_x, chunk_y))
+            if chunk is None:
+                return TileRegion.EMPTY
+            local = (slice(row0 - chunk_y * cells, row1 - chunk_y * cells), slice(col0 - chunk_x * cells, col1 - chunk_x * cells))
+            collidable = chunk.collidable_grid[local]
+            if not np.count_nonzero(collidable):
+                return TileRegion.EMPTY
+            return TileRegion(collidable, chunk.edges_matrix[0][local], col0, row0)
 
-                # Check if the block at the local position is collidable
-                if chunk.collidable_grid[local_row, local_col]:
-                    # Calculate the world coordinates for the block
-                    block_world_x = current_chunk_x * commons.CHUNK_SIZE_PIXELS + local_col * commons.BLOCK_SIZE
-                    block_world_y = current_chunk_y * commons.CHUNK_SIZE_PIXELS + local_row * commons.BLOCK_SIZE
+        return TileRegion(*self._collision_cells(col0, row0, col1, row1), col0, row0)
 
-                    # Append the block as a Rect object
-                    collidable_blocks.append((chunk.edges_matrix[0, local_row, local_col], Rect(block_world_x, block_world_y, commons.BLOCK_SIZE, commons.BLOCK_SIZE)))
+    def get_collision_window(self, col0: int, row0: int, col1: int, row1: int) -> Tuple[np.ndarray, np.ndarray, int, int]:
+        """
+        Get the collidable cells and front edges of a rectangle of cells, stitched from the chunks it covers.
+        The rectangle is clipped to the loaded chunks: the cells outside it are empty.
+
+        :param col0: First column, in world cells.
+        :param row0: First row, in world cells.
+        :param col1: Column after the last one.
+        :param row1: Row after the last one.
+        :return: The (collidable, edges) arrays, indexed [row, col] and read-only, and the (column, row) of their first cell.
+        """
+        cells = commons.CHUNK_SIZE
 
-        return collidable_blocks
+        if self.all_chunks:
+            chunks_x = [chunk_x for chunk_x, _ in self.all_chunks]
+            chunks_y = [chunk_y for _, chunk_y in self.all_chunks]
+            col0, col1 = max(col0, min(chunks_x) * cells), min(col1, (max(chunks_x) + 1) * cells)
+            row0, row1 = max(row0, min(chunks_y) * cells), min(row1, (max(chunks_y) + 1) * cells)
+        col1, row1 = max(col1, col0), max(row1, row0)
 
+        return (*self._collision_cells(col0, row0, col1, row1), col0, row0)
 
+    def _collision_cells(self, col0: int, row0: int, col1: int, row1: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The (collidable, edges) cells of a rectangle of world cells, indexed [row, col] and read-only.
+        Views of the chunk grids when the rectangle lies in one chunk, stitched copies otherwise.
+        """
+        cells = commons.CHUNK_SIZE
+        chunk_x0, chunk_x1 = col0 // cells, (col1 - 1) // cells
+        chunk_y0, chunk_y1 = row0 // cells, (row1 - 1) // cells
+
+        if col1 <= col0 or row1 <= row0:
+            shape = (max(row1 - row0, 0), max(col1 - col0, 0))
+            return np.zeros(shape, dtype=bool), np.zeros(shape, dtype=EDGES_DTYPE)
+
+        if chunk_x0 == chunk_x1 and chunk_y0 == chunk_y1:
+            chunk = self.all_chunks.get((chunk_x0, chunk_y0))
+            if chunk is not None:
+                local = (slice(row0 - chunk_y0 * cells, row1 - chunk_y0 * cells), slice(col0 - chunk_x0 * cells, col1 - chunk_x0 * cells))
+                return chunk.collidable_grid[local], chunk.edges_matrix[0][local]
+
+        # Views of the chunks, joined by rows of chunks then stacked (the chunks not loaded are empty)
+        collidable_bands, edges_bands = [], []
+        for chunk_y in range(chunk_y0, chunk_y1 + 1):
+            top = chunk_y * cells
+            rows = slice(max(row0 - top, 0), min(row1 - top, cells))
+            collidables, edges = [], []
+            for chunk_x in range(chunk_x0, chunk_x1 + 1):
+                left = chunk_x * cells
+                cols = slice(max(col0 - left, 0), min(col1 - left, cells))
+                chunk = self.all_chunks.get((chunk_x, chunk_y))
+                if chunk is None:
+                    shape = (rows.stop - rows.start, cols.stop - cols.start)
+                    collidables.append(np.zeros(shape, dtype=bool))
+                    edges.append(np.zeros(shape, dtype=EDGES_DTYPE))
+                else:
+                    collidables.append(chunk.collidable_grid[rows, cols])
+                    edges.append(chunk.edges_matrix[0, rows, cols])
+            collidable_bands.append(collidables[0] if len(collidables) == 1 else np.concatenate(collidables, axis=1))
+            edges_bands.append(edges[0] if len(edges) == 1 else np.concatenate(edges, axis=1))
+
+        if len(collidable_bands) == 1:
+            return collidable_bands[0], edges_bands[0]
+        return np.concatenate(collidable_bands), np.concatenate(edges_bands)
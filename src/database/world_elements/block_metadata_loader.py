@@ -1,4 +1,5 @@
 import json
+import numpy as np
 from pathlib import Path
 import commons
 
@@ -85,6 +86,22 @@ class BlockMetadataLoader:
         
         return self.metadata[block_id][property_name]
 
+    def get_property_array(self, property_name, default=0) -> np.ndarray:
+        """
+        Builds a lookup array of a property indexed by block ID, for vectorized queries over block grids.
+
+        :param property_name: The name of the property to retrieve.
+        :param default: Value used for blocks without the property.
+        :return: A numpy array where array[block_id] is the property value.
+        """
+        self._check_initialized()
+
+        lookup = np.full(max(int(block_id) for block_id in self.metadata) + 1, default)
+        for block_id, block_data in self.metadata.items():
+            lookup[int(block_id)] = block_data.get(property_name, default)
+
+        return lookup
+
     def get_id_by_name(self, block_name):
         """
         Retrieves the ID of a block based on its name.
@@ -6,6 +6,72 @@ from pygame.math import Vector2 as v2
 from .block_metadata_loader import BLOCK_METADATA
 from .static_element import StaticElement
 
+
+BLOCKS_DTYPE = np.uint8  # Block IDs (np.uint16 once there are more than 256 block types)
+EDGES_DTYPE = np.uint8   # 4 edge bits per cell
+
+
+def compact(array: np.ndarray) -> np.ndarray:
+    """
+    Stores an array holding a single value along each index of its first axis (a uniform layer,
+    e.g. all air or all stone) as a read-only broadcast of those values; other arrays are returned as they are.
+    Chunks make their arrays writable again (`Chunk.materialize`) before their first write.
+
+    :param array: The array to compact.
+    :return: The compact view or `array` itself.
+    """
+    flat = array.reshape(array.shape[0], -1)
+    values = flat[:, :1]
+    if not (flat == values).all():
+        return array
+    return np.broadcast_to(values.reshape((array.shape[0],) + (1,) * (array.ndim - 1)).copy(), array.shape)
+
+
+def storage_bytes(array: np.ndarray) -> int:
+    """
+    Returns the bytes actually held by an array, counting a compact (broadcast) array by its stored values.
+    """
+    return array.itemsize * int(np.prod([size for size, stride in zip(array.shape, array.strides) if stride]))
+
+
+def compute_edges(blocks_grid: np.ndarray, left: np.ndarray = None, top: np.ndarray = None,
+                  right: np.ndarray = None, bottom: np.ndarray = None) -> np.ndarray:
+    """
+    Derives the edges matrix of every layer from a blocks grid in a single pass.
+
+    Each block gets the bit of every side touching another block:
+    0b0001 (down), 0b0010 (right), 0b0100 (up) and 0b1000 (left).
+
+    :param blocks_grid: The (layers, rows, cols) block matrix of the chunk.
+    :param left: Optional (layers, rows) last column of the chunk at the left.
+    :param top: Optional (layers, cols) last row of the chunk above.
+    :param right: Optional (layers, rows) first column of the chunk at the right.
+    :param bottom: Optional (layers, cols) first row of the chunk below.
+    :return: The (layers, rows, cols) edges matrix.
+    """
+    filled = blocks_grid != 0
+    layers, rows, cols = filled.shape
+
+    # Filled mask with a one cell border holding the neighbours' blocks (empty if not given)
+    padded = np.zeros((layers, rows + 2, cols + 2), dtype=bool)
+    padded[:, 1:-1, 1:-1] = filled
+    if left is not None:
+        padded[:, 1:-1, 0] = left != 0
+    if top is not None:
+        padded[:, 0, 1:-1] = top != 0
+    if right is not None:
+        padded[:, 1:-1, -1] = right != 0
+    if bottom is not None:
+        padded[:, -1, 1:-1] = bottom != 0
+
+    edges_matrix = (padded[:, 2:, 1:-1] * 0b0001
+                    | padded[:, 1:-1, 2:] * 0b0010
+                    | padded[:, :-2, 1:-1] * 0b0100
+                    | padded[:, 1:-1, :-2] * 0b1000)
+
+    return (edges_matrix * filled).astype(EDGES_DTYPE) # Air has no edges
+
+
 class Chunk:
     def __init__(self, x: float, y: float, layers: int = 2):
         """
@@ -17,12 +83,20 @@ class Chunk:
         """
         self.pos: v2 = v2(x, y)  # Position of the chunk in chunk coordinates
         self.world_elements: List[StaticElement] = []  # List of static elements (trees, chests, etc.)
-        self.blocks_grid: np.ndarray = np.zeros((layers, commons.CHUNK_SIZE, commons.CHUNK_SIZE), dtype=int)  # 3D matrix for block layers
-        self.collidable_grid: np.ndarray = np.zeros((commons.CHUNK_SIZE, commons.CHUNK_SIZE), dtype=bool)  # Collidable matrix
-        self.edges_matrix: np.ndarray = np.zeros((2, commons.CHUNK_SIZE, commons.CHUNK_SIZE), dtype=int)  # Edge matrix
+        self.elements_version: int = 0  # Incremented when static elements are added or removed
+        self.blocks_version: int = 0  # Incremented when blocks are added or removed
+        # The grids start all air, stored compact (see `compact`) until the first write
+        self.blocks_grid: np.ndarray = compact(np.zeros((layers, commons.CHUNK_SIZE, commons.CHUNK_SIZE), dtype=BLOCKS_DTYPE))  # 3D matrix for block layers
+        self.collidable_grid: np.ndarray = compact(np.zeros((commons.CHUNK_SIZE, commons.CHUNK_SIZE), dtype=bool))  # Collidable matrix
+        self.edges_matrix: np.ndarray = compact(np.zeros((layers, commons.CHUNK_SIZE, commons.CHUNK_SIZE), dtype=EDGES_DTYPE))  # Edge matrix
 
         self.completed_created: bool = False
 
+        # Persistence tracking: every change that must be saved increments the version
+        self.version: int = 0
+        self.saved_version: int = -1  # Version written by the last successful save (-1: never saved)
+        self.queued_version: int = -1  # Version of the last snapshot handed to a save
+
         # Changes dictionary tracks the changes of the chunk for rendering optimization
         self.changes: Dict[str, list] = {
             'all': False,          # If True, the entire chunk must be rendered
@@ -39,6 +113,65 @@ class Chunk:
                         'block': [],
                         'breaking': {}}
 
+    @property
+    def is_dirty(self) -> bool:
+        """True if the chunk changed since its last successful save."""
+        return self.version != self.saved_version
+
+    def mark_dirty(self):
+        """Flags a change of the chunk that must be persisted by the next save."""
+        self.version += 1
+
+    @property
+    def needs_snapshot(self) -> bool:
+        """True if the chunk changed since its last snapshot for a save."""
+        return self.version != self.queued_version
+
+    def mark_saved(self, version: int):
+        """
+        Records a successful save.
+
+        :param version: The version the saved data was taken at (later changes stay dirty).
+        """
+        self.saved_version = version
+        self.queued_version = max(self.queued_version, version)
+
+    def requeue(self):
+        """Makes the next snapshot take the chunk again, after a failed save."""
+        self.queued_version = self.saved_version
+
+    def refresh_collidable(self):
+        """
+        Rebuilds the collidable grid from the base layer after a bulk change of blocks_grid.
+        """
+        self.collidable_grid = compact(BLOCK_METADATA.get_property_array('collidable', False).astype(bool)[self.blocks_grid[0]])
+
+    def set_blocks(self, blocks_grid: np.ndarray):
+        """
+        Replaces the whole blocks grid (e.g. loaded from a save), keeping it compact if possible.
+        The edges must be updated afterwards (`update_edges`).
+
+        :param blocks_grid: The new (layers, rows, cols) block matrix.
+        """
+        self.blocks_grid = compact(blocks_grid.astype(BLOCKS_DTYPE))
+        self.refresh_collidable()
+        self.blocks_version += 1
+
+    def materialize(self):
+        """
+        Turns the compact grids back into regular arrays, before writing single cells.
+        """
+        for name in ('blocks_grid', 'collidable_grid', 'edges_matrix'):
+            array = getattr(self, name)
+            if not array.flags.writeable:
+                setattr(self, name, np.array(array))
+
+    def storage_bytes(self) -> int:
+        """
+        Returns the bytes held by the grids of the chunk.
+        """
+        return storage_bytes(self.blocks_grid) + storage_bytes(self.collidable_grid) + storage_bytes(self.edges_matrix)
+
     def add_block(self, block, col, row, layer):
         """
         Adds a block to the chunk at the specified local position and layer.
@@ -49,6 +182,8 @@ class Chunk:
         :param layer: The layer index to which the block belongs.
         """
 
+        self.materialize()
+
         need_around_update = bool(self.blocks_grid[layer, row, col]) ^ bool(block)
 
         need_update = self.blocks_grid[layer, row, col] != block and (layer == 1 and not self.blocks_grid[0, row, col] or layer == 0)
@@ -63,6 +198,9 @@ class Chunk:
         self.update_around(block, layer, col, row)
         if need_update:
             self.changes['block'].append((col, row))
+
+        self.blocks_version += 1
+        self.mark_dirty()
     
     def remove_block(self, col, row, layer):
         """
@@ -78,6 +216,7 @@ class Chunk:
             # No block to remove
             return
 
+        self.materialize()
         self.changes['block'].append((col, row))
 
         # Mark the block as removed
@@ -90,12 +229,54 @@ class Chunk:
 
         # Update neighboring blocks
         self.update_around(0, layer, col, row)
+
+        self.blocks_version += 1
+        self.mark_dirty()
     
-    def update_edges(self):
-        for x in range(commons.CHUNK_SIZE):
-            for y in range(commons.CHUNK_SIZE):
-                for l in range(2):
-                    self.update_around(self.blocks_grid[l, x, y], l, x, y)
+    def update_edges(self, left: 'Chunk' = None, top: 'Chunk' = None, right: 'Chunk' = None, bottom: 'Chunk' = None):
+        """
+        Recomputes the edges matrix of both layers in one pass, seamless with the given neighbours.
+        The facing border of each neighbour is patched as well, so the pair stays consistent.
+
+        :param left: The chunk at the left, if loaded.
+        :param top: The chunk above, if loaded.
+        :param right: The chunk at the right, if loaded.
+        :param bottom: The chunk below, if loaded.
+        """
+        self._set_edges(compute_edges(
+            self.blocks_grid,
+            left=left.blocks_grid[:, :, -1] if left else None,
+            top=top.blocks_grid[:, -1, :] if top else None,
+            right=right.blocks_grid[:, :, 0] if right else None,
+            bottom=bottom.blocks_grid[:, 0, :] if bottom else None
+        ))
+
+        # (neighbour, neighbour's border, own border, neighbour's bit pointing to this chunk)
+        sides = ((left,   np.s_[:, :, -1], np.s_[:, :, 0],  0b0010),
+                 (top,    np.s_[:, -1, :], np.s_[:, 0, :],  0b0001),
+                 (right,  np.s_[:, :, 0],  np.s_[:, :, -1], 0b1000),
+                 (bottom, np.s_[:, 0, :],  np.s_[:, -1, :], 0b0100))
+
+        for neighbour, their_border, own_border, bit in sides:
+            if neighbour is None:
+                continue
+
+            touching = (neighbour.blocks_grid[their_border] != 0) & (self.blocks_grid[own_border] != 0)
+            edges_matrix = neighbour.edges_matrix.copy()
+            edges_matrix[their_border] = (edges_matrix[their_border] & (0b1111 ^ bit)) | touching * bit
+            neighbour._set_edges(edges_matrix)
+
+    def _set_edges(self, edges_matrix: np.ndarray):
+        """
+        Replaces the edges matrix, flagging the cells whose edges changed for rendering.
+
+        :param edges_matrix: The new (layers, rows, cols) edges matrix.
+        """
+        if not self.changes['all']:
+            rows, cols = np.nonzero((edges_matrix != self.edges_matrix).any(axis=0))
+            self.changes['block'].extend(zip(cols.tolist(), rows.tolist()))
+
+        self.edges_matrix = compact(edges_matrix)
 
     
     def update_around(self, block, layer, col, row):
@@ -154,4 +335,16 @@ class Chunk:
 
         :param static_element: The static element to add.
         """
-        self.world_elements.append(static_element)
\ No newline at end of file
+        self.world_elements.append(static_element)
+        self.elements_version += 1
+        self.mark_dirty()
+
+    def remove_static_element(self, static_element):
+        """
+        Removes a static element (e.g., a destroyed tree) from the chunk.
+
+        :param static_element: The static element to remove.
+        """
+        self.world_elements.remove(static_element)
+        self.elements_version += 1
+        self.mark_dirty()
\ No newline at end of file
@@ -1,12 +1,13 @@
 import numpy as np
 import pygame
 from random import randint
-from .world_elements.chunk import Chunk
+from .world_elements.chunk import Chunk, compute_edges, compact, BLOCKS_DTYPE
 from .world_elements.block_metadata_loader import BLOCK_METADATA
 import commons
 import noise
 import random
 from .world_elements.static_elements_manager import S_ELEMENT_METADATA_LOADER
+from typing import List, Tuple
 
 class WorldGenerator:
     """
@@ -27,10 +28,134 @@ class WorldGenerator:
     
     def generate_chunk(self, chunk: Chunk):
         """
-        Generates a chunk at a specific chunk position.
+        Generates a chunk at a specific chunk position, in the calling process.
 
-        :param chunk_pos: Tuple of (chunk_x, chunk_y) defining the chunk's position.
-        :return: A Chunk object with generated terrain.
+        :param chunk: The Chunk object to be filled with generated terrain.
+        """
+        self.fill_chunk(chunk, self.generate_chunk_arrays(int(chunk.pos.x), int(chunk.pos.y)))
+
+    def generate_chunk_arrays(self, chunk_x: int, chunk_y: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Tuple[int, int]]]:
+        """
+        Generates the terrain of a chunk as plain numpy arrays, so it can run in a worker process.
+
+        The whole chunk is built array-at-a-time: the coordinate grids are created once,
+        the noise is sampled into full arrays and surface, dirt and stone are classified
+        with boolean masks. The output is bit-exact with `_generate_chunk_reference`.
+        Edges only consider blocks inside the chunk; the world stitches the borders with
+        `Chunk.update_edges` once the neighbours are known.
+
+        :param chunk_x: The chunk's x-coordinate in the world grid.
+        :param chunk_y: The chunk's y-coordinate in the world grid.
+        :return: (blocks_grid, collidable_grid, edges_matrix, trees), where trees is a list of (row, col) positions.
+        """
+        GRASS = int(BLOCK_METADATA.get_id_by_name("GRASS")) # Get the ID for the "GRASS" block.
+        DIRT  = int(BLOCK_METADATA.get_id_by_name("DIRT"))  # Get the ID for the "DIRT" block.
+        STONE = int(BLOCK_METADATA.get_id_by_name("STONE")) # Get the ID for the "STONE" block.
+
+        chunk_world_x = chunk_x * commons.CHUNK_SIZE
+        chunk_world_y = chunk_y * commons.CHUNK_SIZE
+
+        # Coordinate grids, indexed as [y, x] like the chunk matrices
+        world_x = chunk_world_x + np.arange(commons.CHUNK_SIZE, dtype=float)
+        world_y = chunk_world_y + np.arange(commons.CHUNK_SIZE, dtype=float)
+        grid_x, grid_y = np.meshgrid(world_x, world_y)
+
+        surface_y = np.array([self.surface(x) for x in world_x], dtype=float)[np.newaxis, :] # One height per column
+
+        # pnoise2(x, y, octaves, persistence, lacunarity, repeatx, repeaty, base) broadcast over the grids
+        pnoise2 = np.frompyfunc(noise.pnoise2, 8, 1)
+        noise_args = (1, 0.5, 2.0, 1024, 1024, self.seed)
+        unoise = pnoise2(grid_x*0.09, grid_y*0.09, *noise_args).astype(float) * 0.3
+        unoise += pnoise2(grid_x*0.02, grid_y*0.02, *noise_args).astype(float)
+        unoise = np.abs(unoise)
+
+        surface = grid_y == surface_y
+        underground = grid_y > surface_y + commons.CHUNK_SIZE
+        dirt_zone = (grid_y > surface_y) & ~underground
+
+        blocks_grid = np.zeros((self.LAYERS, commons.CHUNK_SIZE, commons.CHUNK_SIZE), dtype=BLOCKS_DTYPE)
+
+        blocks_grid[0][surface & (unoise >= 0.01)] = GRASS
+        blocks_grid[0][underground & (unoise >= 0.1)] = STONE
+        blocks_grid[0][dirt_zone & (unoise >= 0.03)] = DIRT
+
+        blocks_grid[1][surface] = GRASS
+        blocks_grid[1][underground & (unoise >= 0.0009)] = STONE
+        blocks_grid[1][dirt_zone & (unoise >= 0.0009)] = DIRT
+
+        collidible_grid = blocks_grid[0] != 0
+
+        # Trees are rolled in the same column-major order as the reference loop
+        chunk_random = self.chunk_random(chunk_x, chunk_y)
+        trees = []
+        cols, rows = np.nonzero((surface & (unoise >= 0.01)).T)
+        for x, y in zip(cols.tolist(), rows.tolist()):
+            if chunk_random.random() > 0.95:
+                trees.append((y, x))
+
+        return blocks_grid, collidible_grid, compute_edges(blocks_grid), trees
+
+    def fill_chunk(self, chunk: Chunk, arrays: Tuple[np.ndarray, np.ndarray, np.ndarray, List[Tuple[int, int]]]):
+        """
+        Fills a chunk with the output of `generate_chunk_arrays`, creating its static elements.
+
+        :param chunk: The Chunk object to be filled.
+        :param arrays: The (blocks_grid, collidable_grid, edges_matrix, trees) tuple.
+        """
+        blocks_grid, collidible_grid, edges_matrix, trees = arrays
+        base_x, base_y = chunk.pos
+
+        chunk.blocks_grid = compact(blocks_grid)
+        chunk.collidable_grid = compact(collidible_grid)
+        chunk.edges_matrix = compact(edges_matrix)
+        chunk.changes['all'] = True
+        chunk.world_elements = [self.gen_obj("Large Tree", row, col, base_x, base_y) for row, col in trees]
+
+    def chunk_random(self, chunk_x: int, chunk_y: int) -> random.Random:
+        """
+        Random generator for the procedural details of a chunk (e.g. tree placement).
+        It only depends on (seed, chunk), so worker processes and the main process agree.
+        """
+        return random.Random(f"{self.seed}:{int(chunk_x)}:{int(chunk_y)}")
+
+    def compare_with_reference(self, seeds, chunk_positions) -> list:
+        """
+        Bit-exact comparison mode: generates each chunk with both the vectorized path and
+        the reference loop and reports every chunk whose output differs.
+
+        :param seeds: Iterable of world seeds to check.
+        :param chunk_positions: Iterable of (chunk_x, chunk_y) positions to generate for each seed.
+        :return: A list of (seed, chunk_x, chunk_y, grid_name) tuples for every mismatch found.
+        """
+        original_seed = self.seed
+        mismatches = []
+
+        try:
+            for seed in seeds:
+                self.seed = seed
+                for chunk_x, chunk_y in chunk_positions:
+                    vectorized = Chunk(chunk_x, chunk_y)
+                    self.generate_chunk(vectorized)
+
+                    reference = Chunk(chunk_x, chunk_y)
+                    self._generate_chunk_reference(reference)
+
+                    for grid_name in ('blocks_grid', 'collidable_grid', 'edges_matrix'):
+                        if not np.array_equal(getattr(vectorized, grid_name), getattr(reference, grid_name)):
+                            mismatches.append((seed, chunk_x, chunk_y, grid_name))
+
+                    if [e.rect.bottomleft for e in vectorized.world_elements] != [e.rect.bottomleft for e in reference.world_elements]:
+                        mismatches.append((seed, chunk_x, chunk_y, 'world_elements'))
+        finally:
+            self.seed = original_seed
+
+        return mismatches
+
+    def _generate_chunk_reference(self, chunk: Chunk):
+        """
+        Reference cell-by-cell implementation of `generate_chunk`, kept for the bit-exact comparison mode.
+
+        :param chunk: The Chunk object to be filled with generated terrain.
         """
 
         GRASS = BLOCK_METADATA.get_id_by_name("GRASS") # Get the ID for the "GRASS" block.
@@ -43,6 +168,7 @@ class WorldGenerator:
         edges_matrix = np.zeros((2, commons.CHUNK_SIZE, commons.CHUNK_SIZE), dtype=int)
 
         chunk_elements = []
+        chunk_random = self.chunk_random(chunk.pos.x, chunk.pos.y)
 
         #noise = self.perlin.gen
 
@@ -73,7 +199,7 @@ class WorldGenerator:
                         blocks_grid[0, y, x] = GRASS
                         collidible_grid[y, x] = True
 
-                        if random.random() > 0.95:
+                        if chunk_random.random() > 0.95:
                             chunk_elements.append(self.gen_obj("Large Tree", y, x, base_x, base_y))
                     
                     blocks_grid[1, y, x] = GRASS
@@ -146,56 +272,17 @@ class WorldGenerator:
 
         return obj
 
-        
 
-    def update_edges_matrix(self, chunk1: Chunk, chunk2: Chunk, index: int):
-        match index:
-            case 0: # left
-                for i in range(commons.CHUNK_SIZE):
-                    if chunk2.blocks_grid[0, i, -1] and chunk1.blocks_grid[0, i, 0]: # Last column <-> First column
-                        chunk1.edges_matrix[0, i, 0] += 0b1000 if not chunk1.edges_matrix[0, i, 0] & 0b1000 else 0
-                        chunk2.edges_matrix[0, i, -1] += 0b0010 if not chunk2.edges_matrix[0, i, -1] & 0b0010 else 0
+def generate_chunk_arrays(seed: int, chunk_x: int, chunk_y: int):
+    """
+    Process pool entry point: generates the arrays of a chunk with a fresh WorldGenerator.
+    """
+    return WorldGenerator(seed).generate_chunk_arrays(chunk_x, chunk_y)
 
-                    if chunk2.blocks_grid[1, i, -1] and chunk1.blocks_grid[1, i, 0]: # Last column <-> First column
-                        chunk1.edges_matrix[1, i, 0] += 0b1000 if not chunk1.edges_matrix[1, i, 0] & 0b1000 else 0
-                        chunk2.edges_matrix[1, i, -1] += 0b0010 if not chunk2.edges_matrix[1, i, -1] & 0b0010 else 0
-                
-                chunk2.changes['column'] = [commons.CHUNK_SIZE-1]
-                chunk1.changes['column'] = [0]
-            case 1: # top
-                for i in range(commons.CHUNK_SIZE):
-                    if chunk2.blocks_grid[0, -1, i] and chunk1.blocks_grid[0, 0, i]: # Last column <-> First column
-                        chunk1.edges_matrix[0, 0, i] += 0b0100 if not chunk1.edges_matrix[0, 0, i] & 0b0100 else 0
-                        chunk2.edges_matrix[0, -1, i] += 0b0001 if not chunk2.edges_matrix[0, -1, i] & 0b0001 else 0
-
-                    if chunk2.blocks_grid[1, -1, i] and chunk1.blocks_grid[1, 0, i]: # Last column <-> First column
-                        chunk1.edges_matrix[1, 0, i] += 0b0100 if not chunk1.edges_matrix[1, 0, i] & 0b0100 else 0
-                        chunk2.edges_matrix[1, -1, i] += 0b0001 if not chunk2.edges_matrix[1, -1, i] & 0b0001 else 0
-                
-                chunk2.changes['line'] = [commons.CHUNK_SIZE-1]
-                chunk1.changes['line'] = [0]
-            case 2: # right
-                for i in range(commons.CHUNK_SIZE):
-                    if chunk2.blocks_grid[0, i, 0] and chunk1.blocks_grid[0, i, -1]: # First column <-> Last column
-                        chunk1.edges_matrix[0, i, -1] += 0b0010 if not chunk1.edges_matrix[0, i, -1] & 0b0010 else 0
-                        chunk2.edges_matrix[0, i, 0] += 0b1000 if not chunk2.edges_matrix[0, i, 0] & 0b1000 else 0
-
-                    if chunk2.blocks_grid[1, i, 0] and chunk1.blocks_grid[1, i, -1]: # First column <-> Last column
-                        chunk1.edges_matrix[1, i, -1] += 0b0010 if not chunk1.edges_matrix[1, i, -1] & 0b0010 else 0
-                        chunk2.edges_matrix[1, i, 0] += 0b1000 if not chunk2.edges_matrix[1, i, 0] & 0b1000 else 0
-                
-                chunk2.changes['column'] = [0]
-                chunk1.changes['column'] = [commons.CHUNK_SIZE-1]
-            case 3: #bottom
-                for i in range(commons.CHUNK_SIZE):
-                    if chunk2.blocks_grid[0, 0, i] and chunk1.blocks_grid[0, -1, i]: # First row <-> Last row
-                        chunk1.edges_matrix[0, -1, i] += 0b0001 if not chunk1.edges_matrix[0, -1, i] & 0b0001 else 0
-                        chunk2.edges_matrix[0, 0, i] += 0b0100 if not chunk2.edges_matrix[0, 0, i] & 0b0100 else 0
-
-                    if chunk2.blocks_grid[1, 0, i] and chunk1.blocks_grid[1, -1, i]: # First row <-> Last row
-                        chunk1.edges_matrix[1, -1, i] += 0b0001 if not chunk1.edges_matrix[1, -1, i] & 0b0001 else 0
-                        chunk2.edges_matrix[1, 0, i] += 0b0100 if not chunk2.edges_matrix[1, 0, i] & 0b0100 else 0
-                
-                chunk2.changes['line'] = [0]
-                chunk1.changes['line'] = [commons.CHUNK_SIZE-1]
 
+def init_generation_worker():
+    """
+    Process pool initializer: loads the block metadata needed to generate chunks.
+    """
+    if not BLOCK_METADATA._initialized:
+        BLOCK_METADATA.init()
@@ -1,5 +1,10 @@
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
+import zlib
+import struct
+import numpy as np
 import commons
 import random
 from utils.inventory import Inventory
@@ -8,11 +13,85 @@ from typing import List, Any, Dict
 class WorldLoader:
     FILENAME = 'game.db'
 
-    def __init__(self):
-        """Initialize the WorldLoader with the database name."""
-        self.db_name = commons.DEFAULT_DB_PATH + self.FILENAME
+    # Blocks storage versions of a world (Worlds.block_storage)
+    FULL_BLOCK_STORAGE = 0   # Every block of every saved chunk is a row of Blocks
+    DELTA_BLOCK_STORAGE = 1  # Only the blocks that differ from the procedural generation are stored
+
+    # Chunk blob format: header (magic, format version, flags, layers, rows, cols) followed by
+    # the zlib compressed uint16 blocks grid and, if flagged, the uint8 edges matrix
+    CHUNK_BLOB_MAGIC = b'CHNK'
+    CHUNK_BLOB_VERSION = 1
+    CHUNK_BLOB_HEADER = struct.Struct('<4sBBBBB')
+    CHUNK_BLOB_HAS_EDGES = 0b0001
+    CHUNK_BLOB_COMPRESSION_LEVEL = 6
+
+    # Connection tuning, applied once per thread connection
+    CACHED_STATEMENTS = 256     # Prepared statements kept by each connection
+    CONNECTION_PRAGMAS = (
+        'PRAGMA journal_mode = WAL',    # Readers don't block the writer thread (and vice versa)
+        'PRAGMA synchronous = NORMAL',  # Durable at checkpoints, safe with WAL
+        'PRAGMA cache_size = -16384',   # 16 MiB page cache
+        'PRAGMA temp_store = MEMORY',
+        'PRAGMA foreign_keys = ON',
+    )
+
+    def __init__(self, db_name=None):
+        """
+        Initialize the WorldLoader with the database name.
+
+        :param db_name: Path of the database file, the game database by default.
+        """
+        self.db_name = db_name or commons.DEFAULT_DB_PATH + self.FILENAME
+        self._local = threading.local()  # One connection (and transaction depth) per thread
         self._ensure_database()
 
+    def connection(self) -> sqlite3.Connection:
+        """
+        Get the connection of the calling thread, opening and tuning it on first use.
+        Transactions are explicit (see `transaction`), the connection itself is in autocommit mode.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_name, isolation_level=None, cached_statements=self.CACHED_STATEMENTS)
+            for pragma in self.CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the statements of the block in one transaction of the calling thread's connection,
+        committed when the outermost block exits and rolled back if it raises.
+        Blocks nest, so several calls can be batched into a single transaction:
+
+            with loader.transaction():
+                loader.save_chunk_blobs(world_id, blobs)
+                loader.save_chunks(world_id, chunks)
+        """
+        conn = self.connection()
+        if self._local.depth == 0:
+            conn.execute('BEGIN')
+        self._local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.execute('ROLLBACK')
+            raise
+        self._local.depth -= 1
+        if self._local.depth == 0:
+            conn.execute('COMMIT')
+
+    def close(self):
+        """Close the connection of the calling thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
     def _ensure_database(self):
         """Check if the database exists; if not, create it."""
         if not os.path.exists(self.db_name):
@@ -20,15 +99,41 @@ class WorldLoader:
             self.create_database()
         else:
             print(f"Database {self.db_name} found.")
+            self._migrate_schema()
+
+    def _migrate_schema(self):
+        """Add the columns introduced after the database was created."""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute('PRAGMA table_info(Worlds)')
+            columns = [row[1] for row in cursor.fetchall()]
+
+            if 'block_storage' not in columns:
+                # Existing worlds keep full chunks until migrated by `migrate_to_delta_storage`
+                cursor.execute(f'ALTER TABLE Worlds ADD COLUMN block_storage INTEGER DEFAULT {self.FULL_BLOCK_STORAGE}')
+                print("Worlds table migrated: block_storage column added.")
+
+            self._create_chunk_blobs_table(cursor)
+
+    @staticmethod
+    def _create_chunk_blobs_table(cursor):
+        """Create the ChunkBlobs table, holding the modified chunks as compressed blobs."""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ChunkBlobs (
+                world_id INTEGER NOT NULL,
+                chunk_x INTEGER NOT NULL,
+                chunk_y INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (world_id, chunk_x, chunk_y),
+                FOREIGN KEY(world_id) REFERENCES Worlds(world_id) ON DELETE CASCADE
+            );
+        ''')
 
     def create_database(self):
         """Create the database and all necessary tables."""
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
 
-            # Enable foreign keys
-            cursor.execute('PRAGMA foreign_keys = ON;')  # Adicionado para ativar as chaves estrangeiras
-
             # Create Worlds table without size_x and size_y
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS Worlds (
@@ -36,7 +141,8 @@ class WorldLoader:
                     name TEXT UNIQUE,
                     deaths INTEGER DEFAULT 0,
                     kills INTEGER DEFAULT 0,
-                    seed INTEGER DEFAULT 4
+                    seed INTEGER DEFAULT 4,
+                    block_storage INTEGER DEFAULT 0
                 );
             ''')
 
@@ -118,6 +224,9 @@ class WorldLoader:
                 );
             ''')
 
+            # Create ChunkBlobs table
+            self._create_chunk_blobs_table(cursor)
+
             print("Database and tables created successfully.")
     
     def create_world(self, name, seed=None):
@@ -136,7 +245,7 @@ class WorldLoader:
             seed = int(random.random() * 1000)
 
         try:
-            with sqlite3.connect(self.db_name) as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
 
                 # Check if the world already exists
@@ -147,9 +256,9 @@ class WorldLoader:
 
                 # Insert the new world into the Worlds table
                 cursor.execute('''
-                    INSERT INTO Worlds (name, seed)
-                    VALUES (?, ?);
-                ''', (name, seed))
+                    INSERT INTO Worlds (name, seed, block_storage)
+                    VALUES (?, ?, ?);
+                ''', (name, seed, self.DELTA_BLOCK_STORAGE))
 
                 print(f"World '{name}' created successfully, seed {seed}.")
 
@@ -170,12 +279,9 @@ class WorldLoader:
             bool: True if the world was successfully deleted, False if the world was not found.
         """
         try:
-            with sqlite3.connect(self.db_name) as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
 
-                # Enable foreign keys
-                cursor.execute('PRAGMA foreign_keys = ON;')  # Garantir que as chaves estrangeiras estejam ativadas
-
                 # Check if the world exists
                 cursor.execute('SELECT world_id FROM Worlds WHERE name = ?', (name,))
                 world = cursor.fetchone()
@@ -185,7 +291,6 @@ class WorldLoader:
 
                 # Delete the world (triggers cascading deletion)
                 cursor.execute('DELETE FROM Worlds WHERE name = ?', (name,))
-                conn.commit()
 
                 print(f"World '{name}' and all associated data have been successfully deleted.")
                 return True
@@ -205,7 +310,7 @@ class WorldLoader:
             ValueError: If the world does not exist.
         """
         try:
-            with sqlite3.connect(self.db_name) as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
 
                 # Check if the world exists
@@ -219,7 +324,6 @@ class WorldLoader:
                     SET score = ?
                     WHERE name = ?;
                 ''', (score, name))
-                conn.commit()
 
                 print(f"Score for world '{name}' updated to {score}.")
         except sqlite3.Error as e:
@@ -227,7 +331,7 @@ class WorldLoader:
 
     def save_player_location(self, world_id, x, y, deaths:int=0, kills: int=0):
         """Save the player's location in the given world."""
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             try:
                 # Use INSERT OR REPLACE to update location if it already exists
@@ -241,7 +345,7 @@ class WorldLoader:
 
     def load_player_location(self, world_id):
         """Load the player's location for the given world."""
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             try:
                 cursor.execute('''
@@ -270,7 +374,7 @@ class WorldLoader:
                 - item_count (int): Number of items in the slot.
                 - item_type (int): Type of item in the slot.
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
 
             # Insert new inventory data
@@ -282,7 +386,6 @@ class WorldLoader:
                     (world_id, slot, quant, item)
                 )
 
-            conn.commit()
             print(f"Inventory for world_id {world_id} saved successfully.")
 
     def load_inventory(self, world_id, inventory: Inventory):
@@ -297,7 +400,7 @@ class WorldLoader:
                 - item_count (int): Number of items in the slot.
                 - item_type (int): Type of item in the slot.
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
 
             # Fetch inventory data
@@ -315,7 +418,7 @@ class WorldLoader:
 
     def _execute_query(self, query, params):
         """Helper method to execute a query and fetch results."""
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
             return cursor.fetchall()
@@ -326,13 +429,147 @@ class WorldLoader:
         :param world_id: The ID of the world.
         :param blocks: A list of dictionaries, each representing a block.
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.executemany('''
                 INSERT OR REPLACE INTO Blocks (world_id, x, y, layer, type)
                 VALUES (?, ?, ?, ?, ?)
             ''', [(world_id, block['x'], block['y'], block['layer'], block['type']) for block in blocks])
-            conn.commit()
+
+    def migrate_to_delta_storage(self, world_id, generator):
+        """
+        Migrate a world saved with full chunks to delta storage, dropping every block row
+        equal to what the generator produces.
+        :param world_id: The ID of the world.
+        :param generator: The WorldGenerator of the world, used to regenerate its chunks.
+        """
+        removed = 0
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT x, y FROM Chunks WHERE world_id = ?', (world_id,))
+            for chunk_x, chunk_y in cursor.fetchall():
+                generated_blocks = generator.generate_chunk_arrays(chunk_x, chunk_y)[0]
+
+                cursor.execute('''
+                    SELECT x, y, layer, type
+                    FROM Blocks
+                    WHERE world_id = ? AND x BETWEEN ? AND ? AND y BETWEEN ? AND ?
+                ''', (world_id, *self._chunk_block_range(chunk_x, chunk_y)))
+
+                unchanged = [(world_id, x, y, layer) for x, y, layer, block_type in cursor.fetchall()
+                             if generated_blocks[layer, y % commons.CHUNK_SIZE, x % commons.CHUNK_SIZE] == block_type]
+
+                cursor.executemany('DELETE FROM Blocks WHERE world_id = ? AND x = ? AND y = ? AND layer = ?', unchanged)
+                removed += len(unchanged)
+
+            cursor.execute('UPDATE Worlds SET block_storage = ? WHERE world_id = ?', (self.DELTA_BLOCK_STORAGE, world_id))
+
+        # Give the space of the removed rows back to the file system (not possible inside a batch)
+        if not self._local.depth:
+            self.connection().execute('VACUUM')
+
+        print(f"World {world_id} migrated to delta storage: {removed} block rows removed.")
+
+    @classmethod
+    def encode_chunk_blob(cls, blocks_grid, edges_matrix=None) -> bytes:
+        """
+        Encode a chunk as a versioned, compressed blob.
+        :param blocks_grid: The (layers, rows, cols) block matrix of the chunk.
+        :param edges_matrix: Optional (layers, rows, cols) edges matrix, stored too if given.
+        :return: The blob bytes.
+        """
+        layers, rows, cols = blocks_grid.shape
+        payload = blocks_grid.astype('<u2').tobytes()
+        flags = 0
+        if edges_matrix is not None:
+            payload += edges_matrix.astype(np.uint8).tobytes()
+            flags |= cls.CHUNK_BLOB_HAS_EDGES
+
+        header = cls.CHUNK_BLOB_HEADER.pack(cls.CHUNK_BLOB_MAGIC, cls.CHUNK_BLOB_VERSION, flags, layers, rows, cols)
+        return header + zlib.compress(payload, cls.CHUNK_BLOB_COMPRESSION_LEVEL)
+
+    @classmethod
+    def decode_chunk_blob(cls, data: bytes):
+        """
+        Decode a blob made by `encode_chunk_blob`.
+        :param data: The blob bytes.
+        :return: A (blocks_grid, edges_matrix) tuple of writable arrays, edges_matrix being None if not stored.
+        """
+        magic, version, flags, layers, rows, cols = cls.CHUNK_BLOB_HEADER.unpack_from(data)
+        if magic != cls.CHUNK_BLOB_MAGIC or version != cls.CHUNK_BLOB_VERSION:
+            raise ValueError(f"Unsupported chunk blob (magic={magic!r}, version={version}).")
+
+        payload = bytearray(zlib.decompress(data[cls.CHUNK_BLOB_HEADER.size:]))  # bytearray keeps the arrays writable
+        shape = (layers, rows, cols)
+        blocks_size = layers * rows * cols * 2
+
+        blocks_grid = np.frombuffer(payload, dtype='<u2', count=layers * rows * cols).reshape(shape)
+        edges_matrix = None
+        if flags & cls.CHUNK_BLOB_HAS_EDGES:
+            edges_matrix = np.frombuffer(payload, dtype=np.uint8, offset=blocks_size).reshape(shape)
+
+        return blocks_grid, edges_matrix
+
+    def save_chunk_blobs(self, world_id, chunk_blobs):
+        """
+        Save several chunks as compressed blobs, in a single transaction.
+        The Blocks rows of these chunks (delta or full storage) are dropped, the blob superseding them.
+        :param world_id: The ID of the world.
+        :param chunk_blobs: A dict mapping (chunk_x, chunk_y) to a (blocks_grid, edges_matrix) tuple,
+                            edges_matrix being optional (None). A None value instead of the tuple removes
+                            the chunk blob, for chunks equal to their procedural generation.
+        :return: The number of blobs written.
+        """
+        blobs = []
+        removed = []
+        for (chunk_x, chunk_y), grids in chunk_blobs.items():
+            if grids is None:
+                removed.append((world_id, chunk_x, chunk_y))
+            else:
+                blobs.append((world_id, chunk_x, chunk_y, self.encode_chunk_blob(*grids)))
+
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO ChunkBlobs (world_id, chunk_x, chunk_y, data)
+                VALUES (?, ?, ?, ?)
+            ''', blobs)
+            cursor.executemany('DELETE FROM ChunkBlobs WHERE world_id = ? AND chunk_x = ? AND chunk_y = ?', removed)
+
+            cursor.executemany('''
+                DELETE FROM Blocks
+                WHERE world_id = ? AND x BETWEEN ? AND ? AND y BETWEEN ? AND ?
+            ''', [(world_id, *self._chunk_block_range(chunk_x, chunk_y)) for chunk_x, chunk_y in chunk_blobs])
+        return len(blobs)
+
+    def load_chunk_blob(self, world_id, chunk_x, chunk_y):
+        """
+        Load the blob of a chunk.
+        :param world_id: The ID of the world.
+        :return: A (blocks_grid, edges_matrix) tuple (see `decode_chunk_blob`), or None if the chunk has no blob.
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT data FROM ChunkBlobs WHERE world_id = ? AND chunk_x = ? AND chunk_y = ?', (world_id, chunk_x, chunk_y))
+            row = cursor.fetchone()
+            return self.decode_chunk_blob(row[0]) if row else None
+
+    def load_chunk_blobs(self, world_id):
+        """
+        Load the blobs of every chunk of a world.
+        :param world_id: The ID of the world.
+        :return: A dict mapping (chunk_x, chunk_y) to a (blocks_grid, edges_matrix) tuple.
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT chunk_x, chunk_y, data FROM ChunkBlobs WHERE world_id = ?', (world_id,))
+            return {(chunk_x, chunk_y): self.decode_chunk_blob(data) for chunk_x, chunk_y, data in cursor.fetchall()}
+
+    @staticmethod
+    def _chunk_block_range(chunk_x, chunk_y):
+        """Return the (x_min, x_max, y_min, y_max) block coordinates of a chunk."""
+        return (chunk_x * commons.CHUNK_SIZE, (chunk_x + 1) * commons.CHUNK_SIZE - 1,
+                chunk_y * commons.CHUNK_SIZE, (chunk_y + 1) * commons.CHUNK_SIZE - 1)
 
     def load_blocks(self, world_id, x_min, x_max, y_min, y_max):
         """
@@ -344,7 +581,7 @@ class WorldLoader:
         :param y_max: Maximum y-coordinate.
         :return: A list of dictionaries representing the blocks.
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT x, y, layer, type
@@ -360,15 +597,38 @@ class WorldLoader:
         :param world_id: The ID of the world.
         :param static_objects: A list of dictionaries, each representing a static object.
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.executemany('''
                 INSERT OR REPLACE INTO StaticObjects (world_id, x, y, type, width, height, health)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             ''', [(world_id, obj['x'], obj['y'], obj['type'], obj.get('width', 1), obj.get('height', 1), obj.get('health', 100)) for obj in static_objects])
-            conn.commit()
             print(f"Saved {len(static_objects)} static objects for world {world_id}.")
 
+    def replace_static_objects(self, world_id, chunk_objects):
+        """
+        Replace the static objects stored for several chunks (destroyed objects are removed).
+        :param world_id: The ID of the world.
+        :param chunk_objects: A dict mapping (chunk_x, chunk_y) to a list of dictionaries, each representing a static object.
+        :return: The number of static object rows written.
+        """
+        rows_written = 0
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            for (chunk_x, chunk_y), static_objects in chunk_objects.items():
+                cursor.execute('''
+                    DELETE FROM StaticObjects
+                    WHERE world_id = ? AND x BETWEEN ? AND ? AND y BETWEEN ? AND ?
+                ''', (world_id, chunk_x * commons.CHUNK_SIZE_PIXELS, (chunk_x + 1) * commons.CHUNK_SIZE_PIXELS - 1,
+                      chunk_y * commons.CHUNK_SIZE_PIXELS, (chunk_y + 1) * commons.CHUNK_SIZE_PIXELS - 1))
+
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO StaticObjects (world_id, x, y, type, width, height, health)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', [(world_id, obj['x'], obj['y'], obj['type'], obj.get('width', 1), obj.get('height', 1), obj.get('health', 100)) for obj in static_objects])
+                rows_written += len(static_objects)
+        return rows_written
+
     def load_static_objects(self, world_id, x_min, x_max, y_min, y_max):
         """
         Load static objects for a specific world within a coordinate range.
@@ -379,7 +639,7 @@ class WorldLoader:
         :param y_max: Maximum y-coordinate.
         :return: A list of dictionaries representing the static objects.
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT x, y, type, width, height, health
@@ -394,15 +654,27 @@ class WorldLoader:
         Save a list of chunks to the database.
         :param world_id: The ID of the world.
         :param chunks: A list of dictionaries, each representing a chunk with x and y coordinates.
+        :return: The number of chunk rows written.
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.executemany('''
                 INSERT OR IGNORE INTO Chunks (world_id, x, y)
                 VALUES (?, ?, ?)
             ''', [(world_id, chunk['x'], chunk['y']) for chunk in chunks])
-            conn.commit()
             print(f"Saved {len(chunks)} chunks for world {world_id}.")
+            return len(chunks)
+
+    def has_chunk(self, world_id, chunk_x, chunk_y):
+        """
+        Check if a chunk was saved.
+        :param world_id: The ID of the world.
+        :return: True if the chunk has a row in Chunks.
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1 FROM Chunks WHERE world_id = ? AND x = ? AND y = ?', (world_id, chunk_x, chunk_y))
+            return cursor.fetchone() is not None
 
     def load_chunks(self, world_id):
         """
@@ -410,7 +682,7 @@ class WorldLoader:
         :param world_id: The ID of the world.
         :return: A list of dictionaries representing the chunks.
         """
-        with sqlite3.connect(self.db_name) as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT x, y
@@ -454,7 +726,7 @@ class WorldLoader:
                 with keys 'world_id', 'name', 'score', and 'seed'.
         """
         try:
-            with sqlite3.connect(self.db_name) as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
 
                 # Query all worlds from the Worlds table
@@ -481,16 +753,16 @@ class WorldLoader:
                         'name', 'score', and 'seed' if found; None if the world does not exist.
         """
         try:
-            with sqlite3.connect(self.db_name) as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
 
                 # Query the world from the Worlds table
-                cursor.execute('SELECT world_id, name, deaths, kills, seed FROM Worlds WHERE name = ?', (name,))
+                cursor.execute('SELECT world_id, name, deaths, kills, seed, block_storage FROM Worlds WHERE name = ?', (name,))
                 row = cursor.fetchone()
 
                 if row:
                     # Return the world as a dictionary
-                    return {'world_id': row[0], 'name': row[1], 'deaths': row[2], 'kills': row[3], 'seed': row[4]}
+                    return {'world_id': row[0], 'name': row[1], 'deaths': row[2], 'kills': row[3], 'seed': row[4], 'block_storage': row[5]}
                 else:
                     # Return None if the world does not exist
                     return None
@@ -511,7 +783,7 @@ class WorldLoader:
             bool: True if the score was successfully updated, False otherwise.
         """
         try:
-            with sqlite3.connect(self.db_name) as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
 
                 # Check if the world exists
@@ -529,7 +801,6 @@ class WorldLoader:
                     WHERE name = ?;
                 ''', (kills, deaths, name))
 
-                conn.commit()
                 print(f"Score updated for world '{name}': kills={kills}, deaths={deaths}.")
                 return True
         except sqlite3.Error as e:
@@ -1,10 +1,12 @@
 import pygame
 import json
 import commons
+import numpy as np
 from pygame.math import Vector2 as v2
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 import os
 import pprint
+from collections import OrderedDict
 
 
 class ImageLoader:
@@ -17,14 +19,30 @@ class ImageLoader:
     - "sprite_regions": (optional): A list of dictionaries defining regions in a sprite sheet:
         - "name": The unique name for the sprite.
         - "x", "y", "width", "height": The region's position and size.
+
+    Every image also gets a dense integer handle once loaded: `surfaces[handle]` and `offsets[handle]`
+    give its Surface and "offset" attribute with a list lookup, for the code running every frame.
     """
     FILENAME = 'images_metadata.json'
+    EDGE_COMBINATIONS = 16
 
     def __init__(self):
         """Initialize the loader, but leave images uninitialized until explicitly set."""
         self.images: Dict[str, Tuple[pygame.Surface, dict]] = {}
         self.blocks: List[str] = []
         self.masks: List[str] = []
+
+        self.handles: Dict[str, int] = {}
+        self.surfaces: List[pygame.Surface] = []
+        self.offsets: List[Optional[Tuple[int, int]]] = []
+        self.block_tiles: Optional[np.ndarray] = None     # block_tiles[block_id, edge, layer] -> Surface (None if not drawable)
+        self.breaking_tiles: Optional[np.ndarray] = None  # breaking_tiles[level, edge] -> Surface
+        self.scaled_tiles: Dict[Tuple[str, int], np.ndarray] = {}  # Tile tables of the zoomed block sizes
+        self.scaled_images: Dict[Tuple[int, float], pygame.Surface] = {}  # (handle, zoom) -> Surface
+        self.surface_handles: Dict[pygame.Surface, int] = {}
+        self.rotated_images: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()  # (handle, angle step[, zoom]) -> Surface
+        self.rotation_keys: Dict[pygame.Surface, Tuple[int, int]] = {}  # Rotated Surface -> (handle, angle step)
+
         self._initialized = False  # Track if the loader has been initialized
 
     def init(self):
@@ -73,7 +91,51 @@ class ImageLoader:
             raise ValueError(f"Error parsing JSON file '{json_path}': {e}")
 
         self.generate_masked_blocks()
+        self.assign_handles()
+        self.breaking_tiles = self.build_tiles([f"BREAKING_{level}" for level in range(self.count_breaking_levels())], "{}.{:04b}")
         #pprint.pprint(self.images)
+
+    def assign_handles(self):
+        """Give a handle to every image that doesn't have one yet."""
+        for name, (image, details) in self.images.items():
+            if name not in self.handles:
+                self.handles[name] = len(self.surfaces)
+                self.surface_handles.setdefault(image, len(self.surfaces))
+                self.surfaces.append(image)
+                self.offsets.append(tuple(details["offset"]) if details and "offset" in details else None)
+
+    def count_breaking_levels(self) -> int:
+        level = 0
+        while f"BREAKING_{level}" in self.images:
+            level += 1
+        return level
+
+    def build_tiles(self, image_names: List[Optional[str]], pattern: str) -> np.ndarray:
+        """
+        Build a [index, edge] table of the masked tiles of some block images.
+
+        :param image_names: The block image names, None (or a name without tiles) giving a row of None.
+        :param pattern: Format of the tile names, from the image name and the edge.
+        :return: An object array of Surfaces.
+        """
+        tiles = np.full((len(image_names), self.EDGE_COMBINATIONS), None, dtype=object)
+        for index, image_name in enumerate(image_names):
+            if image_name and f"{image_name}.1111" in self.images:
+                for edge in range(self.EDGE_COMBINATIONS):
+                    tiles[index, edge] = self.images[pattern.format(image_name, edge)][0]
+        return tiles
+
+    def build_block_tiles(self, image_names: List[Optional[str]]):
+        """
+        Build the `block_tiles` table, so chunk rendering needs no image name.
+
+        :param image_names: The image name of every block ID (BLOCK_METADATA.get_property_array('image_name', None)).
+        """
+        if self.block_tiles is not None:
+            return
+
+        self.block_tiles = np.stack([self.build_tiles(image_names, "{}.{:04b}"),
+                                     self.build_tiles(image_names, "BACK_{}.{:04b}")], axis=-1)
     
     def load_bunch_of_images(self, name: str, details: dict):
         assert details['path'].count("#") == name.count("#"), "Different # number in name and path counting"
@@ -265,6 +327,107 @@ class ImageLoader:
             raise KeyError(f"Image '{image_name}' not found in the ImageLoader!")
 
 
+    @staticmethod
+    def scale_surface(surface: Optional[pygame.Surface], size) -> Optional[pygame.Surface]:
+        """Nearest neighbour scaling keeping the color key (the mask color stays exact)."""
+        if surface is None:
+            return None
+        scaled = pygame.transform.scale(surface, size)
+        scaled.set_colorkey(surface.get_colorkey())
+        return scaled
+
+    def _scaled_table(self, name: str, tiles: np.ndarray, size: int) -> np.ndarray:
+        if size == commons.BLOCK_SIZE:
+            return tiles
+
+        if (name, size) not in self.scaled_tiles:
+            scaled = np.empty_like(tiles)
+            for index, tile in np.ndenumerate(tiles):
+                scaled[index] = self.scale_surface(tile, (size, size))
+            self.scaled_tiles[(name, size)] = scaled
+        return self.scaled_tiles[(name, size)]
+
+    def get_block_tiles(self, size: int = commons.BLOCK_SIZE) -> np.ndarray:
+        """The `block_tiles` table scaled to a block size, scaled once per size."""
+        return self._scaled_table('block', self.block_tiles, size)
+
+    def get_breaking_tiles(self, size: int = commons.BLOCK_SIZE) -> np.ndarray:
+        """The `breaking_tiles` table scaled to a block size, scaled once per size."""
+        return self._scaled_table('breaking', self.breaking_tiles, size)
+
+    def get_scaled(self, image, zoom: float) -> pygame.Surface:
+        """
+        Returns an image (handle or Surface) scaled by a zoom factor.
+        Images with a handle are scaled once per zoom, the rotated ones (`get_rotated`) once per angle step and
+        zoom; other surfaces every call.
+        """
+        if isinstance(image, int):
+            handle, surface = image, self.surfaces[image]
+        else:
+            handle, surface = self.surface_handles.get(image), image
+
+        if zoom == 1:
+            return surface
+
+        if handle is None:
+            rotation = self.rotation_keys.get(surface)
+            if rotation is None:
+                return pygame.transform.scale_by(surface, zoom)
+
+            key = (*rotation, zoom)  # Kept with the rotations, under the same budget
+            scaled = self.rotated_images.get(key)
+            if scaled is None:
+                width, height = surface.get_size()
+                scaled = self.scale_surface(surface, (round(width * zoom), round(height * zoom)))
+                self._keep_rotated(key, scaled)
+            else:
+                self.rotated_images.move_to_end(key)
+            return scaled
+
+        if (scaled := self.scaled_images.get((handle, zoom))) is None:
+            width, height = surface.get_size()
+            scaled = self.scale_surface(surface, (round(width * zoom), round(height * zoom)))
+            self.scaled_images[(handle, zoom)] = scaled
+        return scaled
+
+    def get_rotated(self, handle: int, angle: float, steps: int = commons.ROTATION_STEPS) -> pygame.Surface:
+        """
+        Returns an image rotated by an angle (degrees, counterclockwise), quantized to `steps` angles.
+        Rotations are shared by every caller and kept for the last commons.ROTATION_CACHE_SIZE (handle, step) pairs.
+        """
+        step = round(angle * steps / 360) % steps
+        key = (handle, step)
+
+        rotated = self.rotated_images.get(key)
+        if rotated is None:
+            rotated = pygame.transform.rotate(self.surfaces[handle], step * 360 / steps)
+            self.rotation_keys[rotated] = key
+            self._keep_rotated(key, rotated)
+        else:
+            self.rotated_images.move_to_end(key)
+        return rotated
+
+    def _keep_rotated(self, key: tuple, surface: pygame.Surface):
+        """Adds a surface to `rotated_images`, dropping the least recently used one beyond commons.ROTATION_CACHE_SIZE."""
+        self.rotated_images[key] = surface
+        if len(self.rotated_images) > commons.ROTATION_CACHE_SIZE:
+            _, dropped = self.rotated_images.popitem(last=False)
+            self.rotation_keys.pop(dropped, None)
+
+    def get_handle(self, name) -> int:
+        """Retrieve the handle of an image or sprite by name."""
+        if not self._initialized:
+            raise RuntimeError("ImageLoader is not initialized! Call 'init()' before using it.")
+
+        if (handle := self.handles.get(name)) is not None:
+            return handle
+
+        if name not in self.images:
+            raise KeyError(f"Image '{name}' not found in the ImageLoader!")
+
+        self.assign_handles()  # Image added after the initialization
+        return self.handles[name]
+
     def get_image_atribute(self, name, atribute):
         """Retrieve an image or sprite by name."""
         if not self._initialized:
@@ -6,41 +6,59 @@ from page_manager import PageManager
 from pages import EntryMenu, WorldsPage, SettingsPage, WorldPage, CreatingPage, GamePage
 import commons
 import images.image_loader as image_loader
+from utils.timestep import FixedTimestep
 
-pygame.init()
-screen = pygame.display.set_mode((commons.WIDTH, commons.HEIGHT), pygame.RESIZABLE)
 
-image_loader.IMAGE_LOADER.init()
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((commons.WIDTH, commons.HEIGHT), pygame.RESIZABLE)
 
-page_manager = PageManager()
-page_manager.add_page("entry", EntryMenu())
-page_manager.add_page("worlds_page", WorldsPage())
-page_manager.add_page("settings", SettingsPage())
-page_manager.add_page("world", WorldPage())
-page_manager.add_page("create", CreatingPage())
-page_manager.add_page("game", GamePage())
+    image_loader.IMAGE_LOADER.init()
 
-page_manager.set_page("entry")
+    page_manager = PageManager()
+    page_manager.add_page("entry", EntryMenu())
+    page_manager.add_page("worlds_page", WorldsPage())
+    page_manager.add_page("settings", SettingsPage())
+    page_manager.add_page("world", WorldPage())
+    page_manager.add_page("create", CreatingPage())
+    page_manager.add_page("game", GamePage())
 
-AUDIO_MANAGER.play_music("MUSIC", loop=True)
+    page_manager.set_page("entry")
 
-running = True
-clock = pygame.time.Clock()
+    AUDIO_MANAGER.play_music("MUSIC", loop=True)
 
-while running:
-    for event in pygame.event.get():
-        page_manager.handle_events(event)
-        
-        if event.type == pygame.WINDOWRESIZED or event.type == pygame.WINDOWMAXIMIZED or event.type == pygame.WINDOWMINIMIZED:
-            commons.WIDTH, commons.HEIGHT = pygame.display.get_window_size()
-        if event.type == pygame.QUIT:
-            running = False
-        
-        
+    running = True
+    clock = pygame.time.Clock()
+    timestep = FixedTimestep()
+    caption = pygame.display.get_caption()[0]
+    reported_rate = None
 
-    
-    delta_time = clock.tick(60) / 1000
-    page_manager.update(delta_time)
-    page_manager.draw(screen)
+    while running:
+        for event in pygame.event.get():
+            page_manager.handle_events(event)
 
-pygame.quit()
+            if event.type == pygame.WINDOWRESIZED or event.type == pygame.WINDOWMAXIMIZED or event.type == pygame.WINDOWMINIMIZED:
+                commons.WIDTH, commons.HEIGHT = pygame.display.get_window_size()
+            if event.type == pygame.QUIT:
+                running = False
+
+
+
+
+        frame_time = clock.tick(commons.RENDER_FPS) / 1000
+
+        # The simulation runs in fixed steps, the frame is drawn between the last two states
+        for _ in range(timestep.advance(frame_time)):
+            page_manager.update(timestep.step)
+        page_manager.draw(screen, timestep.alpha)
+
+        if timestep.render_rate != reported_rate:
+            reported_rate = timestep.render_rate
+            pygame.display.set_caption(f"{caption} - {timestep.stats()}")
+
+    pygame.quit()
+
+
+# Chunk generation runs in worker processes, which import this module again on spawn-based platforms
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,10 @@ class PageManager:
         if self.current_page:
             self.current_page.update(delta_time)
 
-    def draw(self, screen):
+    def draw(self, screen, interpolation: float = 1.0):
+        """
+        :param interpolation: Fraction of a simulation step elapsed since the last update.
+        """
         if self.current_page:
+            self.current_page.interpolation = interpolation
             self.current_page.draw(screen)
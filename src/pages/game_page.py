@@ -14,12 +14,15 @@ from physics.bullet import Arrow, Axe
 from database.world_elements.block_metadata_loader import BLOCK_METADATA
 from images.image_loader import IMAGE_LOADER
 from database.world_loader import WORLD_LOADER
+from database.save_writer import SaveWriter
 from database.world_elements.static_elements_manager import S_ELEMENT_METADATA_LOADER
 from database.world_elements.item_metadata import ITEM_METADATA
 from rendering.color_filter import ColorFilter
 from rendering.background import BackLayer
 import commons
 from pygame.math import Vector2 as v2
+from time import perf_counter
+from copy import deepcopy
 
 class GamePage(Page):
     def __init__(self):
@@ -36,6 +39,10 @@ class GamePage(Page):
         self.color_filter = None
         self.back = None
         self.back1 = None
+        self.save_writer = None
+        self.autosave_timer = 0
+        self.autosave_continues = False  # The last autosave was cut by the chunk limit, its chunks continue on the next frame
+        self.last_autosave_ms = 0.0  # Frame time spent starting the last autosave
 
     def reset(self, world_name, *args, **kwargs):
         """
@@ -74,6 +81,11 @@ class GamePage(Page):
         self.back = BackLayer("SKY", 0.04)
         self.back1 = BackLayer("MOUNTAIN", 0.09, -0.1)
 
+        self.save_writer = SaveWriter(self.write_save)
+        self.world.save_writer = self.save_writer  # Evicted chunks are flushed through it
+        self.autosave_timer = commons.AUTOSAVE_INTERVAL
+        self.autosave_continues = False
+
     def resize(self, display_size):
         """
         Adjust the game page elements and background based on the new screen size.
@@ -90,7 +102,7 @@ class GamePage(Page):
         """
         if event.type == pygame.QUIT:
             self.running = False
-            self.save()
+            self.close()
             self.go_to_worlds_page()
         elif event.type == pygame.WINDOWRESIZED:
             self.resize(pygame.display.get_window_size())
@@ -110,11 +122,23 @@ class GamePage(Page):
         elif event.type == pygame.KEYDOWN:
             if event.unicode.isnumeric():
                 self.player.inventory.selected = int(event.unicode) - 1
+            if event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                self.change_zoom(1)
+            if event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self.change_zoom(-1)
             if event.key == pygame.K_ESCAPE:
                 self.running = False
-                self.save()
+                self.close()
                 self.go_to_worlds_page()
     
+    def change_zoom(self, step: int):
+        """
+        Moves to the next (step 1) or previous (step -1) zoom level.
+        """
+        levels = commons.ZOOM_LEVELS
+        index = min(max(levels.index(self.render_manager.zoom) + step, 0), len(levels) - 1)
+        self.render_manager.set_zoom(levels[index], self.world)
+
     def go_to_worlds_page(self):
         """
         Action to trigger a custom event that changes the page to the WorldsPage.
@@ -136,7 +160,7 @@ class GamePage(Page):
                     block = BLOCK_METADATA.get_id_by_name(block_name)
                     if block:
                         self.player.inventory.pick_item(self.world.put(
-                            v2(pygame.mouse.get_pos()) + commons.CURRENT_POSITION,
+                            v2(pygame.mouse.get_pos()) / self.render_manager.zoom + commons.CURRENT_POSITION,
                             v2(10, 10), int(block), quant, self.player,
                             keys[pygame.K_LSHIFT]
                         ))
@@ -144,39 +168,99 @@ class GamePage(Page):
         if mouse_pressed[0]:
             mouse_pos = pygame.mouse.get_pos()
             mouse_rect = pygame.Rect(0, 0, 10, 10)
-            mouse_rect.center = v2(mouse_pos) + commons.CURRENT_POSITION
+            mouse_rect.center = v2(mouse_pos) / self.render_manager.zoom + commons.CURRENT_POSITION
             self.world.mine(mouse_rect.topleft, mouse_rect.size, 50, delta_time)
 
         self.world.update_world_state(delta_time)
         self.render_manager.update_chunks(self.world)
         self.player.handle_input(keys)
         self.physics_manager.update(delta_time, self.world)
+        self.world.prefetch_chunks(self.player.rect.center, self.player.velocity)
 
-        commons.CURRENT_POSITION = pygame.Vector2(self.player.rect.center) - pygame.Vector2(commons.WIDTH, commons.HEIGHT) / 2
+        commons.CURRENT_POSITION = pygame.Vector2(self.player.rect.center) - pygame.Vector2(self.render_manager.view_size) / 2
         self.render_manager.update_position((commons.CURRENT_POSITION[0], commons.CURRENT_POSITION[1]))
 
         self.back.update(-commons.CURRENT_POSITION.x, delta_time)
         self.back1.update(-commons.CURRENT_POSITION.x, delta_time)
 
         self.color = self.color_filter.get_color(delta_time)
+
+        # Safe point: the world is not being changed until the next update
+        self.autosave_timer -= delta_time
+        if self.autosave_timer <= 0 or self.autosave_continues:
+            self.autosave()
         
 
     def draw(self, screen):
         """
-        Draw all game elements on the screen.
+        Draw all game elements on the screen, between the last two simulation steps.
         """
+        # The camera follows the interpolated player
+        self.render_manager.interpolation = self.interpolation
+        player_center = v2(self.render_manager.interpolated_topleft(self.player)) + v2(self.player.rect.size) / 2
+        camera = player_center - v2(self.render_manager.view_size) / 2
+        self.render_manager.update_position((camera[0], camera[1]))
 
-        self.back.draw(screen, self.color)
-        self.back1.draw(screen, self.color)
+        if self.back.draw(screen, self.color_filter) | self.back1.draw(screen, self.color_filter):
+            self.render_manager.dirty_regions.mark_full()
 
-        self.render_manager.render_all(screen, self.physics_manager.get_renderable_elements(), self.player)
-        pygame.display.update()
+        self.render_manager.render_all(screen, self.physics_manager.get_renderable_elements(), self.player, self.physics_manager.items)
+        self.render_manager.present()
     
+    def take_snapshot(self, chunk_limit=None):
+        """
+        Copy the game state to be saved, see `write_save`.
+
+        :param chunk_limit: Maximum number of dirty chunks to copy.
+        """
+        return {
+            'chunks': self.world.snapshot_dirty_chunks(chunk_limit),
+            'player': (self.player.rect.x, self.player.rect.y, self.player.deaths, self.player.kills),
+            'inventory': deepcopy(self.player.inventory),
+            'score': (self.player.kills, self.player.deaths)
+        }
+
+    def write_save(self, snapshot):
+        """
+        Write a snapshot to the database. Runs on the save writer thread.
+        Snapshots of evicted chunks only hold 'chunks'.
+        """
+        with self.world.db_interface.transaction(): # The whole save is committed at once
+            if 'player' in snapshot:
+                self.world.db_interface.save_player_location(self.world.world_id, *snapshot['player'])
+                self.world.db_interface.save_inventory(self.world.world_id, snapshot['inventory'])
+                self.world.db_interface.save_score(self.world_name, *snapshot['score'])
+            return self.world.write_snapshot(snapshot['chunks'])
+
+    def autosave(self):
+        """
+        Start a background save of the dirty chunks, the player and the inventory.
+        Beyond `AUTOSAVE_MAX_CHUNKS_PER_FRAME` dirty chunks, the chunks are copied over the next frames;
+        the player and the inventory are copied once, by the first one.
+        """
+        start = perf_counter()
+        if self.autosave_continues:
+            snapshot = {'chunks': self.world.snapshot_dirty_chunks(commons.AUTOSAVE_MAX_CHUNKS_PER_FRAME)}  # The player was taken by the first frame
+        else:
+            snapshot = self.take_snapshot(commons.AUTOSAVE_MAX_CHUNKS_PER_FRAME)
+            self.autosave_timer = commons.AUTOSAVE_INTERVAL
+        self.save_writer.submit(snapshot)
+        self.last_autosave_ms = (perf_counter() - start) * 1000
+
+        # A snapshot cut by the chunk limit continues on the next frame
+        self.autosave_continues = len(snapshot['chunks']) >= commons.AUTOSAVE_MAX_CHUNKS_PER_FRAME
+
     def save(self):
         """
-        Main game loop.
+        Save the game and wait for the write to finish.
+        """
+        self.save_writer.submit(self.take_snapshot())
+        self.save_writer.flush()
+
+    def close(self):
+        """
+        Save the game and release the save writer and the world.
         """
-        self.world.db_interface.save_player_location(self.world.world_id, self.player.rect.x, self.player.rect.y, self.player.deaths, self.player.kills)
-        self.world.db_interface.save_inventory(self.world.world_id, self.player.inventory)
-        self.world.save_all_data()
-        self.world.db_interface.save_score(self.world_name, self.player.kills, self.player.deaths)
+        self.save()
+        self.save_writer.close()
+        self.world.close()
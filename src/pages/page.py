@@ -4,7 +4,7 @@ import pygame
 
 class Page(ABC):
     def __init__(self):
-        pass
+        self.interpolation: float = 1.0  # Fraction of a simulation step elapsed since the last update, for drawing
 
     @abstractmethod
     def resize(self, display_size):
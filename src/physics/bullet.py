@@ -18,7 +18,7 @@ class ThrowableItem(CollidableMovingElement):
         """
         super().__init__(pos, size, velocity)
         self.animation = animation
-        self.image = IMAGE_LOADER.get_image(animation.get_current_frame())
+        self.image = animation.get_current_surface()
         self.dying = False
     
     def is_alive(self):
@@ -34,13 +34,14 @@ class ThrowableItem(CollidableMovingElement):
 
         # Update animation
         self.animation.update(delta_time)
-        self.image = IMAGE_LOADER.get_image(self.animation.get_current_frame())
+        self.image = self.animation.get_current_surface()
 
 
 class DirectionalThrowableItem(ThrowableItem):
     def __init__(self, pos: v2, size: v2, velocity: v2, animation: Animation):
         """
         Initialize a directional throwable item that rotates based on its velocity.
+        Its hitbox is a fixed square (the smallest side of `size`) at the center of `size`, whatever the rotation.
 
         :param pos: Initial position of the throwable item.
         :param size: Size of the throwable item.
@@ -48,6 +49,12 @@ class DirectionalThrowableItem(ThrowableItem):
         :param animation: Animation to display for the throwable item.
         """
         super().__init__(pos, size, velocity, animation)
+        center = self.rect.center
+        side = min(self.rect.size)
+        self.size = v2(side, side)
+        self.rect = pygame.Rect(0, 0, side, side)
+        self.rect.center = center
+        self.image_offset = (0, 0)
 
     def update(self, delta_time: float):
         """
@@ -60,10 +67,10 @@ class DirectionalThrowableItem(ThrowableItem):
         # Calculate the angle of rotation based on velocity
         angle = self.velocity.angle_to(v2(1, 0))
 
-        # Rotate the image to match the velocity direction
+        # Rotate the image to match the velocity direction, centered on the hitbox
         if self.image:
-            self.image = pygame.transform.rotate(IMAGE_LOADER.get_image(self.animation.get_current_frame()), angle)
-            self.rect = self.image.get_rect(center=self.rect.center)
+            self.image = IMAGE_LOADER.get_rotated(self.animation.get_current_handle(), angle)
+            self.image_offset = ((self.rect.width - self.image.get_width()) / 2, (self.rect.height - self.image.get_height()) / 2)
 
 
 class Bullet(ThrowableItem):
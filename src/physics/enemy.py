@@ -6,11 +6,14 @@ from rendering.animation import Animation
 from physics.player import Player
 from pygame.math import Vector2 as v2
 from .game_actor import GameActor
+from .entity_arena import EntityArena, ENEMIES
 from images.image_loader import ImageLoader  # Importando o ImageLoader
 
 class EnemyManager:
-    def __init__(self):
-        self.enemies = []  # Lista de inimigos ativos
+    def __init__(self, arena: EntityArena = None):
+        self.owns_arena = arena is None  # Sem o arena do PhysicsManager, o proprio EnemyManager aplica as remocoes
+        self.arena = EntityArena() if self.owns_arena else arena
+        self.enemies = self.arena.view(ENEMIES)  # Lista de inimigos ativos
         self.spawn_interval = commons.ENEMY_SPAWN_RATE[commons.CURRENT_DIFFICULTY_MODE]  # Intervalo para gerar novos inimigos (em segundos)
         self.last_spawn_time = 0  # Tempo de última geração de inimigos
         
@@ -29,17 +32,19 @@ class EnemyManager:
         # Atualiza o temporizador para criação de novos inimigos
         self.last_spawn_time += dt
         if self.last_spawn_time > self.spawn_interval and len(self.enemies) < self.max_enemies:
-            self.enemies.append(self.spawn_enemy())  # Cria um novo inimigo
+            self.arena.add(ENEMIES, self.spawn_enemy())  # Cria um novo inimigo
             self.last_spawn_time = 0  # Reinicia o contador de tempo
 
         # Atualiza todos os inimigos existentes
         for enemy in self.enemies:
             enemy.update_ai(player)
             if enemy.is_alive() and v2(enemy.position).distance_to(player.position) > commons.DESPAWN_DISTANCE:
-                self.enemies.remove(enemy)
+                self.arena.remove(enemy)  # Removido no fim do tick
 
         # Remove inimigos mortos
         #self.enemies = [enemy for enemy in self.enemies if not enemy.is_alive()]
+        if self.owns_arena:
+            self.arena.flush()
 
     def spawn_enemy(self):
         """
@@ -0,0 +1,122 @@
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+# Kinds of the entities of the simulation
+MOVING_ELEMENTS = 'moving_elements'
+PLAYER_BULLETS = 'player_bullets'
+ENEMY_BULLETS = 'enemy_bullets'
+ENEMIES = 'enemies'
+
+
+class EntityId(NamedTuple):
+    """Stable id of an entity: its slot in the arena, and the generation of the slot when it was added."""
+    slot: int
+    generation: int
+
+
+class EntityArena:
+    """
+    Registry of the entities of the simulation, by kind.
+
+    Every entity gets a slot and a generational id (`entity.entity_id`): once the entity is removed, the generation
+    of its slot is incremented, so the ids kept elsewhere stop resolving (`get`) even when the slot is reused.
+    The entities of a kind are packed in a dense list, its view (`view`), iterated without copy. Removals are
+    deferred to `flush`, called between the passes over the entities: the views do not change while they are
+    iterated, and each removal swaps the last entity of the kind into the freed place (O(1), the order of a kind
+    is not kept).
+    """
+
+    def __init__(self, kinds: Iterable[str] = (MOVING_ELEMENTS, PLAYER_BULLETS, ENEMY_BULLETS, ENEMIES)):
+        """
+        :param kinds: The kinds of entities held, in their iteration order.
+        """
+        self.views: Dict[str, list] = {kind: [] for kind in kinds}  # Kind -> its entities, packed
+        self.view_slots: Dict[str, List[int]] = {kind: [] for kind in kinds}  # Kind -> slots of its entities
+
+        # Per slot
+        self.entities: List[Optional[object]] = []
+        self.generations: List[int] = []
+        self.slot_kinds: List[Optional[str]] = []
+        self.dense_indices: List[int] = []  # Index of the entity in the view of its kind
+
+        self.free: List[int] = []  # Slots of the removed entities, to reuse
+        self.pending: List[int] = []  # Slots to remove at the next flush
+        self.removing: List[bool] = []
+
+    def __len__(self) -> int:
+        return sum(len(view) for view in self.views.values())
+
+    def view(self, kind: str) -> list:
+        """The entities of a kind, packed (read-only: add and remove them through the arena)."""
+        return self.views[kind]
+
+    def iterate(self, *kinds: str) -> Iterator:
+        """Iterates over the entities of some kinds (all by default), without copying the views."""
+        return chain.from_iterable(self.views[kind] for kind in (kinds or self.views))
+
+    def add(self, kind: str, entity) -> EntityId:
+        """
+        Adds an entity at the end of the view of its kind.
+
+        :return: The id of the entity, also set as its `entity_id`.
+        """
+        if self.free:
+            slot = self.free.pop()
+        else:
+            slot = len(self.entities)
+            self.entities.append(None)
+            self.generations.append(0)
+            self.slot_kinds.append(None)
+            self.dense_indices.append(0)
+            self.removing.append(False)
+
+        view = self.views[kind]
+        self.entities[slot] = entity
+        self.slot_kinds[slot] = kind
+        self.dense_indices[slot] = len(view)
+        view.append(entity)
+        self.view_slots[kind].append(slot)
+
+        entity.entity_id = EntityId(slot, self.generations[slot])
+        return entity.entity_id
+
+    def get(self, entity_id: EntityId):
+        """The entity of an id, None if it was removed."""
+        slot, generation = entity_id
+        if slot < len(self.entities) and self.generations[slot] == generation:
+            return self.entities[slot]
+        return None
+
+    def remove(self, entity):
+        """Schedules the removal of an entity (or id) at the next `flush`. Removing it again does nothing."""
+        entity_id = entity if isinstance(entity, EntityId) else getattr(entity, 'entity_id', None)
+        if entity_id is None or self.get(entity_id) is None:
+            return
+
+        slot = entity_id.slot
+        if not self.removing[slot]:
+            self.removing[slot] = True
+            self.pending.append(slot)
+
+    def flush(self):
+        """Applies the scheduled removals: each one swaps the last entity of its kind into its place."""
+        for slot in self.pending:
+            kind = self.slot_kinds[slot]
+            view, slots = self.views[kind], self.view_slots[kind]
+            index = self.dense_indices[slot]
+
+            last = len(view) - 1
+            if index != last:
+                view[index], slots[index] = view[last], slots[last]
+                self.dense_indices[slots[index]] = index
+            view.pop()
+            slots.pop()
+
+            self.entities[slot].entity_id = None
+            self.entities[slot] = None
+            self.slot_kinds[slot] = None
+            self.generations[slot] += 1
+            self.removing[slot] = False
+            self.free.append(slot)
+
+        self.pending.clear()
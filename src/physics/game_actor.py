@@ -6,6 +6,7 @@ from pygame.math import Vector2 as v2
 from pygame.rect import Rect
 from images.image_loader import IMAGE_LOADER
 from typing import List
+from .tile_collision import TileRegion
 
 class GameActor(CollidableMovingElement):
     def __init__(self, pos: v2, size: v2, life: float, max_vel: float, jump_strength: float, attack_damage: float,
@@ -50,7 +51,8 @@ class GameActor(CollidableMovingElement):
         self._current_anim   : Animation = self.idle_anim_right
 
         # Set the image based on the current animation or default to None
-        self.image : str = self._current_anim.get_current_frame()
+        self.image        : pygame.Surface = self._current_anim.get_current_surface()
+        self.image_offset : tuple = self._current_anim.get_current_offset()
 
         # State variables
         self.w_left  = False
@@ -67,8 +69,8 @@ class GameActor(CollidableMovingElement):
 
         self.time_since_last_damage: float = 0.0  # Time since the last attack
     
-    def move(self, colliding_rects: List[pygame.Rect], delta_time: float):
-        super().move(colliding_rects, delta_time)
+    def move(self, region: TileRegion, delta_time: float):
+        super().move(region, delta_time)
 
     @property
     def current_animation(self) -> Animation:
@@ -120,7 +122,8 @@ class GameActor(CollidableMovingElement):
             self.current_animation = self.dying_anim_left if self.facing_left else self.dying_anim_right
             if self.current_animation:
                 self.current_animation.update(delta_time)
-                self.image = self.current_animation.get_current_frame()
+                self.image = self.current_animation.get_current_surface()
+                self.image_offset = self.current_animation.get_current_offset()
 
                 # Check if the dying animation is completed
             if self.dying_time <= 0:
@@ -151,7 +154,8 @@ class GameActor(CollidableMovingElement):
         # Update the current animation
         if self.current_animation:
             self.current_animation.update(delta_time)
-            self.image = self.current_animation.get_current_frame()
+            self.image = self.current_animation.get_current_surface()
+            self.image_offset = self.current_animation.get_current_offset()
 
     def jump(self):
         """
@@ -0,0 +1,315 @@
+import numpy as np
+import pygame
+import commons
+from typing import Dict, List, Tuple
+from images.image_loader import IMAGE_LOADER
+from database.world_elements.item_metadata import ITEM_METADATA
+from .tile_collision import RAMP_EDGES
+
+
+class ItemStore:
+    """
+    The dropped items, stored as packed arrays (struct of arrays) instead of one sprite per item.
+
+    Row i of the arrays (`ARRAYS`) describes the i-th item, for the first `count` rows; the arrays grow by doubling.
+    Gravity, friction, the attraction of the player and the moves against the world grids run as array operations
+    over the items awake. Removed items are compacted away, keeping the order.
+
+    An item resting on the ground for `sleep_ticks` steps falls asleep: it is skipped by the simulation until a block
+    of its chunk changes (`Chunk.blocks_version`) or the player comes near. Falling asleep, it merges into a sleeping
+    stack of the same kind within `merge_distance`, if any: a row stands for `counts` identical items.
+
+    The item ids are strings: `kinds` holds indices into `item_ids`, and `handles` the image of each kind.
+    """
+
+    ARRAYS = ('positions', 'previous', 'velocities', 'kinds', 'counts', 'ages', 'falling', 'sleeping', 'resting')
+
+    def __init__(self, capacity: int = 64, sleep_ticks: int = commons.ITEM_SLEEP_TICKS,
+                 merge_distance: float = commons.ITEM_MERGE_DISTANCE):
+        """
+        :param capacity: Number of items the arrays can hold before growing.
+        :param sleep_ticks: Steps an item rests before sleeping, 0 to never sleep.
+        :param merge_distance: Distance (on each axis) under which the sleeping items of a kind merge, 0 to never merge.
+        """
+        self.count: int = 0
+        self.size: float = commons.ITEM_SIZE  # Side of the items
+        self.sleep_ticks = sleep_ticks
+        self.merge_distance = merge_distance
+
+        self.positions = np.zeros((capacity, 2), dtype=np.float64)  # World position of the top-left corners
+        self.previous = np.zeros((capacity, 2), dtype=np.float64)   # Positions before the last simulation step
+        self.velocities = np.zeros((capacity, 2), dtype=np.float64)
+        self.kinds = np.zeros(capacity, dtype=np.int32)
+        self.ages = np.zeros(capacity, dtype=np.float64)  # Seconds since the drop
+        self.falling = np.ones(capacity, dtype=bool)
+        self.counts = np.ones(capacity, dtype=np.int32)  # Items in the stack
+        self.sleeping = np.zeros(capacity, dtype=bool)
+        self.resting = np.zeros(capacity, dtype=np.int32)  # Steps spent resting on the ground
+
+        self.item_ids: List[str] = []
+        self.handles: List[int] = []
+        self.kind_indices: Dict[str, int] = {}
+        self.seen_blocks: Dict[Tuple[int, int], tuple] = {}  # Chunk position -> (chunk, blocks version) seen last
+
+    def __len__(self) -> int:
+        return self.count
+
+    def kind_of(self, item_id) -> int:
+        """Index of an item id in `item_ids`, registering it on its first drop."""
+        kind = self.kind_indices.get(item_id)
+        if kind is None:
+            kind = self.kind_indices[item_id] = len(self.item_ids)
+            self.item_ids.append(item_id)
+            self.handles.append(IMAGE_LOADER.get_handle(ITEM_METADATA.get_property_by_id(item_id, 'image_name')))
+        return kind
+
+    def spawn(self, item_id, position: Tuple[float, float], velocity: Tuple[float, float], count: int = 1) -> int:
+        """
+        Adds an item (a stack of `count` items).
+
+        :return: Its row in the arrays.
+        """
+        if self.count == len(self.positions):
+            self._grow(2 * len(self.positions))
+
+        index = self.count
+        self.positions[index] = self.previous[index] = position
+        self.velocities[index] = velocity
+        self.kinds[index] = self.kind_of(item_id)
+        self.ages[index] = 0
+        self.falling[index] = True
+        self.counts[index] = count
+        self.sleeping[index] = False
+        self.resting[index] = 0
+        self.count += 1
+        return index
+
+    def remove(self, indices):
+        """Removes the items of some rows, the others keep their order."""
+        keep = np.ones(self.count, dtype=bool)
+        keep[indices] = False
+        kept = int(keep.sum())
+
+        for name in self.ARRAYS:
+            array = getattr(self, name)
+            array[:kept] = array[:self.count][keep]
+        self.count = kept
+
+    def _grow(self, capacity: int):
+        for name in self.ARRAYS:
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            setattr(self, name, grown)
+
+    def item_id(self, index: int):
+        """The item id of a row."""
+        return self.item_ids[self.kinds[index]]
+
+    def save_previous(self):
+        """Keeps the current positions, for the interpolation of the rendering."""
+        self.previous[:self.count] = self.positions[:self.count]
+
+    def apply_gravity(self, gravity: float, terminal_speed: float):
+        """Accelerates the items awake downwards, their speed limited to `terminal_speed`."""
+        velocities = self.velocities[:self.count]
+        awake = ~self.sleeping[:self.count]
+        velocities[awake, 1] += gravity
+
+        speeds = np.hypot(velocities[:, 0], velocities[:, 1])
+        over = speeds > terminal_speed
+        if over.any():
+            velocities[over] *= (terminal_speed / speeds[over])[:, None]
+
+    def attract(self, point: Tuple[float, float], distance: float, force: float):
+        """Accelerates the items awake within `distance` of a point (positions compared) towards it."""
+        differences = np.asarray(point, dtype=np.float64) - self.positions[:self.count]
+        lengths = np.hypot(differences[:, 0], differences[:, 1])
+        near = (lengths <= distance) & (lengths > 0) & ~self.sleeping[:self.count]
+        if near.any():
+            self.velocities[:self.count][near] += differences[near] / lengths[near, None] * force
+
+    def apply_friction(self, falling: float, grounded: float):
+        """Slows down the horizontal moves, by a factor per step for the falling and the grounded items."""
+        self.velocities[:self.count, 0] *= np.where(self.falling[:self.count], falling, grounded)
+
+    def wake(self, rows):
+        """Wakes up the items of some rows."""
+        self.sleeping[rows] = False
+        self.resting[rows] = 0
+
+    def wake_near(self, point: Tuple[float, float], distance: float):
+        """Wakes up the items within `distance` of a point (positions compared)."""
+        differences = self.positions[:self.count] - np.asarray(point, dtype=np.float64)
+        near = np.hypot(differences[:, 0], differences[:, 1]) <= distance
+        self.wake(np.flatnonzero(near & self.sleeping[:self.count]))
+
+    def wake_changed_blocks(self, world):
+        """
+        Wakes up the sleeping items whose ground is in a chunk whose blocks changed (or that was reloaded)
+        since the last call.
+        """
+        sleeping = self.sleeping[:self.count]
+        if not sleeping.any():
+            return
+
+        seen = self.seen_blocks
+        changed = []
+        for key, chunk in world.all_chunks.items():
+            entry = seen.get(key)
+            if entry is None or entry[0] is not chunk or entry[1] != chunk.blocks_version:
+                seen[key] = (chunk, chunk.blocks_version)
+                changed.append(key)
+        for key in [key for key in seen if key not in world.all_chunks]:
+            del seen[key]
+        if not changed:
+            return
+
+        # Chunks of the cells under the bottom corners of the items
+        chunk_size = commons.CHUNK_SIZE_PIXELS
+        positions = self.positions[:self.count]
+        ground = (positions[:, 1] + self.size) // chunk_size
+        left, right = positions[:, 0] // chunk_size, (positions[:, 0] + self.size - 1e-6) // chunk_size
+
+        touched = np.zeros(self.count, dtype=bool)
+        for chunk_x, chunk_y in changed:
+            touched |= (ground == chunk_y) & ((left == chunk_x) | (right == chunk_x))
+        self.wake(np.flatnonzero(touched & sleeping))
+
+    def settle(self):
+        """
+        Counts the steps the items awake rest on the ground, puts to sleep the ones resting for `sleep_ticks` steps
+        and merges them into the sleeping stacks around.
+        """
+        if not self.sleep_ticks:
+            return
+
+        count = self.count
+        velocities = self.velocities[:count]
+        resting = ~self.sleeping[:count] & ~self.falling[:count] & (np.abs(velocities[:, 0]) < commons.ITEM_SLEEP_SPEED)
+        self.resting[:count] = np.where(resting, self.resting[:count] + 1, 0)
+
+        asleep = np.flatnonzero(self.resting[:count] >= self.sleep_ticks)
+        if not len(asleep):
+            return
+        self.sleeping[asleep] = True
+        self.resting[asleep] = 0
+        velocities[asleep] = 0
+        self.merge(asleep)
+
+    def merge(self, rows):
+        """Merges each item of `rows` into a sleeping stack of the same kind within `merge_distance`, if any."""
+        if not self.merge_distance:
+            return
+
+        count = self.count
+        positions, kinds = self.positions[:count], self.kinds[:count]
+        merged = np.zeros(count, dtype=bool)
+
+        for row in rows.tolist():
+            near = (np.abs(positions - positions[row]) < self.merge_distance).all(axis=1)
+            candidates = np.flatnonzero(near & (kinds == kinds[row]) & self.sleeping[:count] & ~merged)
+            target = candidates[candidates != row][:1]
+            if len(target):
+                self.counts[target[0]] += self.counts[row]
+                merged[row] = True
+
+        if merged.any():
+            self.remove(np.flatnonzero(merged))
+
+    def touching(self, rect: pygame.Rect) -> np.ndarray:
+        """Rows of the items overlapping a rect."""
+        x, y = self.positions[:self.count, 0], self.positions[:self.count, 1]
+        return np.flatnonzero((x < rect.right) & (x + self.size > rect.left) & (y < rect.bottom) & (y + self.size > rect.top))
+
+    def move(self, world, delta_time: float):
+        """
+        Moves the items awake by their velocities, first in x then in y, stopping them at the blocking cells of the world
+        and lifting them onto the ramps they sink into.
+
+        The collidable cells around all the items are read at once (`World.get_collision_window`). The moves are
+        split in sub-steps shorter than a block, so that checking the cells at the leading side of each item is
+        enough; an item is smaller than a block and overlaps two rows and two columns at most.
+        """
+        count = self.count
+        self.ages[:count] += delta_time
+        rows = np.flatnonzero(~self.sleeping[:count])
+        if not len(rows):
+            return
+
+        positions, velocities, falling = self.positions[rows], self.velocities[rows], self.falling[rows]
+        self._integrate(world, positions, velocities, falling, delta_time)
+        self.positions[rows], self.velocities[rows], self.falling[rows] = positions, velocities, falling
+
+    def _integrate(self, world, positions: np.ndarray, velocities: np.ndarray, falling: np.ndarray, delta_time: float):
+        """Moves the items of the (gathered) arrays, see `move`."""
+        block = commons.BLOCK_SIZE
+        displacements = velocities * delta_time
+
+        # Cells the moves can reach, with one cell of margin
+        reach = np.abs(displacements).max(axis=0)
+        col0 = int((positions[:, 0].min() - reach[0]) // block) - 1
+        row0 = int((positions[:, 1].min() - reach[1]) // block) - 1
+        col1 = int((positions[:, 0].max() + self.size + reach[0]) // block) + 2
+        row1 = int((positions[:, 1].max() + self.size + reach[1]) // block) + 2
+        collidable, edges, col0, row0 = world.get_collision_window(col0, row0, col1, row1)
+        falling[:] = True
+
+        if not collidable.any():  # Nothing to collide with (no chunk loaded around)
+            positions += displacements
+            return
+
+        ramps = (edges == RAMP_EDGES[0]) | (edges == RAMP_EDGES[1])
+        blocking = collidable & ~ramps
+        ramps &= collidable
+        rows_count, cols_count = collidable.shape
+
+        def lookup(grid, cols, rows):
+            """Values of a window grid at world cells, 0 outside the window."""
+            cols, rows = cols - col0, rows - row0
+            inside = (cols >= 0) & (cols < cols_count) & (rows >= 0) & (rows < rows_count)
+            return np.where(inside, grid[np.clip(rows, 0, rows_count - 1), np.clip(cols, 0, cols_count - 1)], grid.dtype.type(0))
+
+        steps = int(reach.max() // (block / 2)) + 1
+
+        for _ in range(steps):
+            step = velocities * (delta_time / steps)
+
+            # Horizontal move: the column at the leading side
+            x = positions[:, 0] + step[:, 0]
+            top = (positions[:, 1] // block).astype(np.int64)
+            bottom = ((positions[:, 1] + self.size - 1e-6) // block).astype(np.int64)
+            right = step[:, 0] > 0
+            lead = np.where(right, (x + self.size - 1e-6) // block, x // block).astype(np.int64)
+            hit = (step[:, 0] != 0) & (lookup(blocking, lead, top) | lookup(blocking, lead, bottom))
+            positions[:, 0] = np.where(hit, np.where(right, lead * block - self.size, (lead + 1) * block), x)
+            velocities[hit, 0] = 0
+
+            # Vertical move: the row at the leading side
+            y = positions[:, 1] + step[:, 1]
+            left = (positions[:, 0] // block).astype(np.int64)
+            right = ((positions[:, 0] + self.size - 1e-6) // block).astype(np.int64)
+            down = step[:, 1] > 0
+            lead = np.where(down, (y + self.size - 1e-6) // block, y // block).astype(np.int64)
+            hit = (step[:, 1] != 0) & (lookup(blocking, left, lead) | lookup(blocking, right, lead))
+            positions[:, 1] = np.where(hit, np.where(down, lead * block - self.size, (lead + 1) * block), y)
+            falling &= ~(hit & down)
+            velocities[hit, 1] = 0
+
+        # Ramps: the bottom of an item overlapping a ramp is lifted to the slope, under its overlapped side
+        x, y = positions[:, 0], positions[:, 1]
+        for row_side, col_side in ((0, 0), (0, 1), (1, 0), (1, 1)):
+            col = ((x + col_side * (self.size - 1e-6)) // block).astype(np.int64)
+            row = ((y + row_side * (self.size - 1e-6)) // block).astype(np.int64)
+            edge = lookup(edges, col, row)
+            on_ramp = lookup(ramps, col, row)
+            if not on_ramp.any():
+                continue
+
+            cell_x, cell_y = col * block, row * block
+            depth = np.where(edge == RAMP_EDGES[0], x + self.size - cell_x, cell_x + block - x)
+            slope = np.maximum(cell_y + block - depth, cell_y)
+            lifted = on_ramp & (depth > 0) & (y + self.size > slope)
+            y[lifted] = slope[lifted] - self.size
+            velocities[lifted, 1] = 0
+            falling &= ~lifted
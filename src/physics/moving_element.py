@@ -2,6 +2,7 @@ import pygame
 import commons
 from typing import Tuple, List
 from pygame.math import Vector2 as v2
+from .tile_collision import TileRegion
 
 class MovingElement(pygame.sprite.Sprite):
     """
@@ -29,6 +30,8 @@ class MovingElement(pygame.sprite.Sprite):
 
         # Create the pygame Rect for collisions and rendering
         self.rect = pygame.Rect(self.position.x, self.position.y, *self.size)
+        self.previous_topleft: Tuple[int, int] = self.rect.topleft  # Rect position before the last simulation step
+        self.entity_id = None  # Id in the entity arena of the simulation, None while not in it
 
 
 class CollidableMovingElement(MovingElement):
@@ -50,115 +53,71 @@ class CollidableMovingElement(MovingElement):
         super().__init__(position, size, velocity)
         self.is_falling = True  # Initially assume the object is falling.
 
-    def move(self, colliding_rects: List[pygame.Rect], delta_time: float):
+    def move(self, region: TileRegion, delta_time: float):
         """
-        Move the element first in the x direction, check for collisions, 
-        then move in the y direction and check for collisions.
+        Move the element first in the x direction, then in the y direction, stopping it at the blocking cells
+        of the region and climbing the ramps.
 
-        :param colliding_rects: A list of rectangles to check for collisions.
+        :param region: The collidable cells around the element (see `World.get_collision_region`).
         :param delta_time: The time delta for movement calculations.
         """
-
-        tallest_down = None
+        size = commons.BLOCK_SIZE
         last_velocity = self.velocity.x
-
-        def get_tallest_down_collision(rect: pygame.Rect):
-            nonlocal tallest_down
-            if tallest_down is None  or rect.top < tallest_down:
-                tallest_down = rect.top
-
-
-        def handle_horizontal_collisions():
-            nonlocal collided
-
-            for edge, rect in _colliding_rects:
-                if self.rect.colliderect(rect):
-                    if edge not in (0b0011, 0b1001):
-                        if self.velocity.x > 0:  # Moving right
-                            self.rect.right = rect.left
-                            self.collided_right()
-                        elif self.velocity.x < 0:  # Moving left
-                            self.rect.left = rect.right
-                            self.collided_left()
-                        collided = True
-                        get_tallest_down_collision(rect)
-
-                if one_above.colliderect(rect):
-                    nonlocal one_above_collided, one_above_y_collision
-                    one_above_collided = True
-                    one_above_y_collision = rect.bottom
-
-        def handle_vertical_collisions():
-            nonlocal collided
-
-            for edge, rect in _colliding_rects:
-                if self.rect.colliderect(rect):
-                    if edge not in (0b0011, 0b1001):
-                        if self.velocity.y > 0:  # Moving down
-                            self.rect.bottom = rect.top
-                            self.collided_down()
-                        elif self.velocity.y < 0:  # Moving up
-                            self.rect.top = rect.bottom
-                            self.collided_up()
-                        collided = True
-
-        def handle_ramps():
-            nonlocal collided
-
-            for edge, rect in ramps:
-                if self.rect.colliderect(rect):
-                    dx = self.rect.right - rect.left if edge == 0b0011 else rect.right - self.rect.left
-                    ramp_bottom = rect.bottom - dx
-
-                    if dx > 0 and self.rect.bottom > ramp_bottom:
-                        self.rect.bottom = max(ramp_bottom, rect.top)
-                        if one_above_collided:
-                            adjust_for_one_above(edge)
-                        collided = True
-                        self.collided_down()
-                    
-                    if tallest_down is not None and self.rect.bottom <= tallest_down:
-                        self.velocity.x = last_velocity
-
-        def adjust_for_one_above(edge):
-            nonlocal one_above_y_collision, last_velocity
-
-            new_top = max(one_above_y_collision, self.rect.top)
-            dy = new_top - self.rect.top
-            self.rect.x += dy if edge == 0b1001 else -dy
-            self.rect.top = new_top
-
-            if dy:
-                self.velocity.x = 0
-                last_velocity = 0
+        previous = self.rect.copy()
+        one_above = previous.move(0, -size)
 
         # Move horizontally (x direction)
-        one_above = self.rect.copy()
-        one_above.y -= commons.BLOCK_SIZE
-
-        one_above_collided = False
-        one_above_y_collision = 0.0
-
         self.rect.x += self.velocity.x * delta_time
-        collided = False
-
-        _colliding_rects = colliding_rects[::-1] if self.velocity.x > 0 else colliding_rects
-        handle_horizontal_collisions()
+        tallest_down = region.resolve_x(self.rect, previous, self.velocity.x)
 
-        if collided:
+        if tallest_down is not None:
+            if self.velocity.x > 0:  # Moving right
+                self.collided_right()
+            elif self.velocity.x < 0:  # Moving left
+                self.collided_left()
             self.velocity.x = 0
 
         # Move vertically (y direction)
+        previous = self.rect.copy()
         self.rect.y += self.velocity.y * delta_time
-        collided = False
 
         self.is_falling = True  # Initially assume the object is falling.
 
-        _colliding_rects = colliding_rects if self.velocity.y > 0 else colliding_rects[::-1]
-        handle_vertical_collisions()
-
-        ramps = [(edge, rect) for edge, rect in _colliding_rects if edge in (0b0011, 0b1001)]
-        handle_ramps()
+        collided = region.resolve_y(self.rect, previous, self.velocity.y)
+        if collided:
+            if self.velocity.y > 0:  # Moving down
+                self.collided_down()
+            elif self.velocity.y < 0:  # Moving up
+                self.collided_up()
+
+        # Climb the ramps
+        ramps = region.ramps_under(self.rect.inflate(2 * size, 2 * size), self.velocity.y > 0)
+        for edge, x, y in ramps:
+            if not (x < self.rect.right and x + size > self.rect.left and y < self.rect.bottom and y + size > self.rect.top):
+                continue
+
+            dx = self.rect.right - x if edge == 0b0011 else x + size - self.rect.left
+            ramp_bottom = y + size - dx
+
+            if dx > 0 and self.rect.bottom > ramp_bottom:
+                self.rect.bottom = max(ramp_bottom, y)
+
+                # Don't climb into the blocks above the starting position
+                ceiling = region.ceiling(one_above, last_velocity > 0)
+                if ceiling is not None:
+                    new_top = max(ceiling, self.rect.top)
+                    dy = new_top - self.rect.top
+                    self.rect.x += dy if edge == 0b1001 else -dy
+                    self.rect.top = new_top
+                    if dy:
+                        self.velocity.x = 0
+                        last_velocity = 0
+
+                collided = True
+                self.collided_down()
+
+            if tallest_down is not None and self.rect.bottom <= tallest_down:
+                self.velocity.x = last_velocity
 
         if collided:
             self.velocity.y = 0
@@ -166,8 +125,6 @@ class CollidableMovingElement(MovingElement):
         # Update position vector to match adjusted rect
         self.position.x, self.position.y = self.rect.topleft
 
-
-    
     def collided_up(self):
         """
         Handle the collision when the object collides from above.
@@ -6,7 +6,10 @@ from .moving_element import MovingElement, CollidableMovingElement
 from .bullet import Arrow, Axe
 from .enemy import Enemy
 from .enemy import EnemyManager
-from .item import Item
+from .item_store import ItemStore
+from .spatial_hash import SpatialHash
+from .entity_arena import EntityArena, MOVING_ELEMENTS, PLAYER_BULLETS, ENEMY_BULLETS, ENEMIES
+from itertools import chain
 from typing import List
 from math import ceil
 from random import random
@@ -29,15 +32,28 @@ class PhysicsManager:
         :param moving_elements: A list of MovingElement objects (e.g., projectiles, platforms).
         """
         self.player: Player = player
-        self.player_bullets: List[Bullet] = player_bullets
+
+        # Every entity lives in the arena: the lists below are its views, added to and removed from through it
+        self.arena = EntityArena()
+        for kind, entities in ((PLAYER_BULLETS, player_bullets), (ENEMIES, enemies),
+                               (ENEMY_BULLETS, enemy_bullets), (MOVING_ELEMENTS, moving_elements)):
+            for entity in entities:
+                self.arena.add(kind, entity)
+
+        self.player_bullets: List[Bullet] = self.arena.view(PLAYER_BULLETS)
         
-        self.moving_elements: List[MovingElement] = moving_elements 
-        self.itens: List[Item] = []
-        self.enemy_bullets: List[Bullet] = enemy_bullets 
-        self.enemy_manager = EnemyManager()
+        self.moving_elements: List[MovingElement] = self.arena.view(MOVING_ELEMENTS)
+        self.items: ItemStore = ItemStore()  # Dropped items
+        self.enemy_bullets: List[Bullet] = self.arena.view(ENEMY_BULLETS)
+        self.enemy_manager = EnemyManager(self.arena)
         self.enemies: List[Enemy] = self.enemy_manager.enemies
         self.gravity: int = commons.GRAVITY_ACELERATION
         self.terminal_speed = commons.TERMINAL_SPEED
+
+        # Broadphase of the collisions between entities, synchronised once per tick after the moves
+        self.enemy_hash = SpatialHash(bounds=self._attack_bounds)
+        self.enemy_bullet_hash = SpatialHash()
+        self.element_hash = SpatialHash()  # Moving elements
     
     def enemy_throw(self, throwable: str, pos: v2):
         if not self.player:
@@ -59,19 +75,17 @@ class PhysicsManager:
             case _:
                 return
             
-        self.enemy_bullets.append(new_bullet)
+        self.arena.add(ENEMY_BULLETS, new_bullet)
     
     def spawn_item(self, item_id, pos):
         r_angle = -180 * random()
         init_vel = v2.from_polar((commons.ITEM_INITIAL_VELOCITY, r_angle))
 
-        new_item = Item(item_id,pos, init_vel)
-        
-        self.moving_elements.append(new_item)
-        self.itens.append(new_item)
+        self.items.spawn(item_id, pos, init_vel)
     
     def get_renderable_elements(self):
-        return self.moving_elements + [self.player] + self.player_bullets + self.enemy_bullets + self.enemies
+        """Iterates over the entities to render, straight from the views of the arena."""
+        return chain(self.moving_elements, (self.player,), self.player_bullets, self.enemy_bullets, self.enemies)
 
 
     def update(self, delta_time, world):
@@ -80,10 +94,22 @@ class PhysicsManager:
         
         :param delta_time: Time elapsed since the last update (in seconds).
         """
+        # Positions before the step, the rendering interpolates from them
+        for element in self.get_renderable_elements():
+            element.previous_topleft = element.rect.topleft
+        self.items.save_previous()
+
+        # Wake up the sleeping items whose ground changed or near the player
+        self.items.wake_changed_blocks(world)
+        if self.player:
+            self.items.wake_near(self.player.position, commons.MAX_DISTANCE_OF_ITEM_ATTRACTION)
+
         self.enemy_manager.update(delta_time, self.player)
+        self.arena.flush()  # The despawned enemies leave before the step, out of the moves and collisions
         self.apply_gravity(delta_time)
         self.apply_player_attraction_force()
         self.move_entities_and_handle_world_collisions(world, delta_time)
+        self.sync_spatial_hashes()
         self.apply_friction()
         self.handle_collisions()
 
@@ -99,26 +125,30 @@ class PhysicsManager:
         for bullet in self.player_bullets:
             bullet.update(delta_time)
             if not bullet.is_alive():
-                self.player_bullets.remove(bullet)
+                self.arena.remove(bullet)
 
         # Update enemies bullets
         for bullet in self.enemy_bullets:
             bullet.update(delta_time)
             if not bullet.is_alive():
-                self.enemy_bullets.remove(bullet)
+                self.arena.remove(bullet)
 
         # Update enemies
         for enemy in self.enemies:
             enemy.update(delta_time)
             if not enemy.is_alive() and not enemy.dying:
                 self.player.kills += 1
-                self.enemies.remove(enemy)
+                self.arena.remove(enemy)
 
         # Update other moving elements
         for element in self.moving_elements:
             element.update(delta_time)
             if hasattr(element, "is_alive") and not element.is_alive():
-                self.moving_elements.remove(element)
+                self.arena.remove(element)
+                self.element_hash.remove(element)
+
+        # The removals of the tick are applied once everything was iterated
+        self.arena.flush()
     
     def apply_friction(self):
         # Update player
@@ -153,15 +183,23 @@ class PhysicsManager:
                 element.velocity.x *= 0.95  # Reduced friction for falling elements
             else:
                 element.velocity.x *= 0.85  # Normal friction for grounded elements
+
+        # Update dropped items
+        self.items.apply_friction(0.95, 0.85)
     
     def apply_player_attraction_force(self):
         if not self.player:
             return
         
-        for i in range(len(self.itens)):
-            dif = self.player.position - self.itens[i].position
-            if dif.length() <= commons.MAX_DISTANCE_OF_ITEM_ATTRACTION and dif.length() > 0:
-                self.itens[i].velocity += dif.normalize() * commons.ITEM_ATTRACTION_FORCE
+        self.items.attract(self.player.position, commons.MAX_DISTANCE_OF_ITEM_ATTRACTION, commons.ITEM_ATTRACTION_FORCE)
+
+    def sync_spatial_hashes(self):
+        """
+        Bucket the entities at their positions of the tick, for `handle_collisions`.
+        """
+        self.enemy_hash.sync(self.enemies)
+        self.enemy_bullet_hash.sync(self.enemy_bullets)
+        self.element_hash.sync(self.moving_elements)
     
     def apply_gravity(self, delta_time):
         """
@@ -184,6 +222,9 @@ class PhysicsManager:
         # Apply gravity to moving elements
         for element in self.moving_elements:
             self._apply_gravity_to_entity(element, delta_time)
+
+        # Apply gravity to dropped items
+        self.items.apply_gravity(self.gravity, self.terminal_speed)
         
     def _apply_gravity_to_entity(self, entity: MovingElement, delta_time):
         """
@@ -197,30 +238,37 @@ class PhysicsManager:
         if entity.velocity.magnitude() > self.terminal_speed:
             entity.velocity.scale_to_length(self.terminal_speed)
 
+    @staticmethod
+    def _attack_bounds(actor) -> pygame.Rect:
+        """
+        The rect of an actor, joined with its attack area while it attacks.
+        """
+        if actor.attacking and actor.attack_area.width and actor.attack_area.height:
+            return actor.rect.union(actor.attack_area)
+        return actor.rect
+
     def handle_collisions(self):
         """
         Handle collisions between entities (e.g., player and enemies, bullets and enemies).
+        The pairs are found with the spatial hashes, each entity is only tested against the ones around it.
         """
         # Check collisions between player bullets and enemies
         for bullet in self.player_bullets:
-            for enemy in self.enemies:
+            for enemy in self.enemy_hash.query(bullet.rect):
                 if bullet.rect.colliderect(enemy.rect):  # Assuming entities have a `rect` attribute for collision
                     self._handle_bullet_hit_enemy(bullet, enemy)
-        
-        for bullet in self.enemy_bullets:
-            if not self.player:
-                break
-            
+
+        if not self.player:
+            return
+
+        for bullet in self.enemy_bullet_hash.query(self.player.rect):
             if self.player.rect.colliderect(bullet.rect):
                 self.player.take_damage(bullet.damage, 'left' if self.player.rect.x < bullet.rect.x else 'right')
                 bullet.collided_down()
 
 
-        # Check collisions between player and enemies
-        for enemy in self.enemies:
-            if not self.player:
-                break
-
+        # Check collisions between player and enemies (their attack areas are in their hashed bounds)
+        for enemy in self.enemy_hash.query(self._attack_bounds(self.player)):
             if self.player.rect.colliderect(enemy.rect) and enemy.is_alive():
                 self.player.take_damage(3, 'left' if self.player.rect.x < enemy.rect.x else 'right')
 
@@ -230,14 +278,14 @@ class PhysicsManager:
             if self.player.attacking and enemy.rect.colliderect(self.player.attack_area):
                 enemy.take_damage(self.player.attack_damage, 'left' if self.player.attack_area.x > enemy.rect.x else 'right')
         
-        # Check collisions between player and itens (optional)
-        for iten in self.itens:
-            if self.player and self.player.rect.colliderect(iten.rect):
-                self._handle_player_iten_collision(iten)
+        # Check collisions between player and itens
+        collected = [index for index in self.items.touching(self.player.rect).tolist() if self._handle_player_iten_collision(index)]
+        if collected:
+            self.items.remove(collected)
 
         # Check collisions between player and moving elements (optional)
-        for element in self.moving_elements:
-            if self.player and self.player.rect.colliderect(element.rect):
+        for element in self.element_hash.query(self.player.rect):
+            if self.player.rect.colliderect(element.rect):
                 self._handle_player_element_collision(element)
 
     def _handle_bullet_hit_enemy(self, bullet, enemy):
@@ -250,19 +298,19 @@ class PhysicsManager:
         enemy.take_damage(bullet.damage)  # Assuming `take_damage()` exists in the Enemy class
         bullet.destroy()  # Assuming bullets have a `destroy()` method
     
-    def _handle_player_iten_collision(self, iten: Item):
+    def _handle_player_iten_collision(self, index: int) -> bool:
         """
-        Handle the event where the player collides with a moving element.
+        Handle the event where the player collides with a dropped item (or stack of items).
 
-        :param element: The Item instance that collided with the player.
+        :param index: The row of the item in `items`.
+        :return: True if the player collected the whole stack, to be removed.
         """
-        # Example: Reduce player's life, or trigger a specific effect
-        # self.player.take_damage(element.collision_damage)
-
-        if self.player.collect(iten.id):
-            pygame.event.post(pygame.event.Event(commons.ITEM_COLLECT_EVENT, {'item': iten.id}))
-            self.itens.remove(iten)
-            self.moving_elements.remove(iten)
+        item_id = self.items.item_id(index)
+        counts = self.items.counts
+        while counts[index] and self.player.collect(item_id):
+            counts[index] -= 1
+            pygame.event.post(pygame.event.Event(commons.ITEM_COLLECT_EVENT, {'item': item_id}))
+        return not counts[index]
 
     def _handle_player_element_collision(self, element):
         """
@@ -280,6 +328,8 @@ class PhysicsManager:
 
         :param world: The World instance to check for collisions.
         """
+        world.refresh_collision_grid()  # The cells around the focus, stitched once for all the moves of the step
+
         # Move player and check collisions
         if self.player:
             self._move_entity_and_handle_collision(self.player, world, delta_time)
@@ -300,6 +350,10 @@ class PhysicsManager:
         for element in self.moving_elements:
             self._move_entity_and_handle_collision(element, world, delta_time)
 
+        # Move the dropped items awake, all at once, and put to sleep the ones at rest
+        self.items.move(world, delta_time)
+        self.items.settle()
+
     def _move_entity_and_handle_collision(self, entity: MovingElement, world, delta_time):
         """
         Move a single entity and handle its collisions with the world.
@@ -308,10 +362,9 @@ class PhysicsManager:
         :param world: The World instance to check for collisions.
         """
 
-        # Get nearby blocks that may collide with the entity
-        x_dist = abs(ceil(entity.velocity.x * delta_time)) + entity.rect.width
-        y_dist = abs(ceil(entity.velocity.y * delta_time)) + entity.rect.height
-        collision_blocks = world.get_collision_blocks_around(entity.rect.center, (x_dist, y_dist))
+        # Get the cells the entity can touch during its move
+        displacement = (ceil(entity.velocity.x * delta_time), ceil(entity.velocity.y * delta_time))
+        region = world.get_collision_region(entity.rect, displacement)
 
         # Move the entity
-        entity.move(collision_blocks, delta_time)
+        entity.move(region, delta_time)
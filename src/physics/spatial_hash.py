@@ -0,0 +1,117 @@
+import pygame
+import commons
+from math import floor
+from typing import Callable, Dict, Iterable, List, Tuple
+
+Cells = Tuple[int, int, int, int]  # First column, first row, last column, last row (inclusive)
+
+
+class SpatialHash:
+    """
+    Uniform grid bucketing entities by the cells their rect overlaps, the broadphase of the collisions between entities.
+
+    Each entity is kept in the buckets of every cell its rect touches, and is moved between buckets only when that
+    range of cells changes, so a synchronisation per tick costs little for the entities at rest. A query only reads
+    the buckets of the cells it overlaps: its cost depends on the entities around, not on their total number.
+    The queries return candidates; the exact tests (`colliderect`, distances) are left to the caller.
+    """
+
+    def __init__(self, cell_size: int = commons.SPATIAL_HASH_CELL_SIZE,
+                 bounds: Callable[[object], pygame.Rect] = lambda entity: entity.rect):
+        """
+        :param cell_size: Side of the cells in pixels.
+        :param bounds: Returns the rect an entity is hashed by (its `rect` by default).
+        """
+        self.cell_size = cell_size
+        self.bounds = bounds
+        self.buckets: Dict[Tuple[int, int], List] = {}  # (column, row) -> entities touching the cell
+        self.cells: Dict[object, Cells] = {}  # Entity -> cells it is bucketed in
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, entity) -> bool:
+        return entity in self.cells
+
+    def cells_of(self, rect: pygame.Rect) -> Cells:
+        """The range of cells overlapped by a rect (empty for a rect without area)."""
+        size = self.cell_size
+        return rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size
+
+    def insert(self, entity):
+        """Adds an entity, or moves it to the cells of its current bounds."""
+        cells = self.cells_of(self.bounds(entity))
+        old = self.cells.get(entity)
+        if old == cells:
+            return
+        if old is not None:
+            self._unlink(entity, old)
+        self._link(entity, cells)
+
+    def remove(self, entity):
+        """Removes an entity, if hashed."""
+        cells = self.cells.pop(entity, None)
+        if cells is not None:
+            self._unlink(entity, cells)
+
+    def sync(self, entities: Iterable):
+        """Updates the cells of `entities` and drops the hashed entities that are not among them."""
+        present = set()
+        for entity in entities:
+            present.add(entity)
+            self.insert(entity)
+
+        if len(present) != len(self.cells):
+            for entity in [entity for entity in self.cells if entity not in present]:
+                self.remove(entity)
+
+    def query(self, rect: pygame.Rect) -> List:
+        """The entities bucketed in the cells overlapped by a rect, each one once."""
+        col0, row0, col1, row1 = self.cells_of(rect)
+        buckets = self.buckets
+
+        if col0 == col1 and row0 == row1:
+            return list(buckets.get((col0, row0), ()))
+
+        found = {}
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                bucket = buckets.get((col, row))
+                if bucket:
+                    found.update(dict.fromkeys(bucket))
+        return list(found)
+
+    def query_radius(self, center: Tuple[float, float], radius: float) -> List:
+        """The entities whose bounds are within `radius` of a point."""
+        x, y = center
+        left, top = floor(x - radius), floor(y - radius)
+        found = []
+        for entity in self.query(pygame.Rect(left, top, floor(x + radius) - left + 1, floor(y + radius) - top + 1)):
+            rect = self.bounds(entity)
+            dx = max(rect.left - x, 0, x - rect.right)
+            dy = max(rect.top - y, 0, y - rect.bottom)
+            if dx * dx + dy * dy <= radius * radius:
+                found.append(entity)
+        return found
+
+    def _link(self, entity, cells: Cells):
+        col0, row0, col1, row1 = cells
+        buckets = self.buckets
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                bucket = buckets.get((col, row))
+                if bucket is None:
+                    buckets[(col, row)] = [entity]
+                else:
+                    bucket.append(entity)
+        self.cells[entity] = cells
+
+    def _unlink(self, entity, cells: Cells):
+        col0, row0, col1, row1 = cells
+        buckets = self.buckets
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                bucket = buckets[(col, row)]
+                bucket.remove(entity)
+                if not bucket:
+                    del buckets[(col, row)]
@@ -0,0 +1,176 @@
+import pygame
+import commons
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+RAMP_EDGES = (0b0011, 0b1001)  # Front edges of the ramp blocks: open down and right, open down and left
+IS_RAMP = np.isin(np.arange(16), RAMP_EDGES)  # Front edge -> is a ramp, indexed by the edges of the cells
+
+
+class TileRegion:
+    """
+    The collidable cells of a rectangular window of the world, for the moves of the entities.
+
+    `World.collision_grid` is the region of the chunks around the focus, stitched once and kept up to date by
+    `World.refresh_collision_grid`; the entities moving there are all resolved against it. The entities
+    elsewhere get a region of their own from `World.get_collision_region`. The moves are resolved against the
+    boolean slices directly: the cells swept by a rect are reduced to the first (or last) blocking column or
+    row on its way, without a Rect or a tuple per tile. Cells outside the region are empty.
+    """
+
+    def __init__(self, collidable: np.ndarray, edges: np.ndarray, col0: int, row0: int):
+        """
+        :param collidable: The collidable cells of the window, indexed [row, col].
+        :param edges: The front edges of the cells of the window, indexed [row, col].
+        :param col0: World column of the first cell of the window.
+        :param row0: World row of the first cell of the window.
+        """
+        self.col0, self.row0 = col0, row0
+        self.collidable = collidable
+        self.edges = edges
+        ramps = IS_RAMP[edges] & collidable
+        self.blocking = collidable & ~ramps
+        self.ramp_cells: Dict[Tuple[int, int], int] = {}  # (row, col) -> front edge of the ramps, rare enough for a dict
+        self.ramp_rows: List[int] = [0] * collidable.shape[0]  # Bit col set for the ramps of each row
+        self._add_ramps(ramps, 0, 0)
+        self.empty = not np.count_nonzero(collidable)  # No cell to collide with, the moves are free
+
+    def _add_ramps(self, ramps: np.ndarray, row0: int, col0: int):
+        """Records the ramp cells of an area starting at (row0, col0) of the region."""
+        rows, cols = ramps.nonzero()
+        rows, cols = rows + row0, cols + col0
+        for row, col, edge in zip(rows.tolist(), cols.tolist(), self.edges[rows, cols].tolist()):
+            self.ramp_cells[row, col] = edge
+            self.ramp_rows[row] |= 1 << col
+
+    def refresh(self, rows: slice, cols: slice):
+        """
+        Recomputes the ramp and blocking cells of an area, after its collidable cells and edges were rewritten.
+
+        :param rows: The rows of the area, in the region.
+        :param cols: The columns of the area, in the region.
+        """
+        collidable = self.collidable[rows, cols]
+        ramps = IS_RAMP[self.edges[rows, cols]] & collidable
+        self.blocking[rows, cols] = collidable & ~ramps
+
+        for row, col in [cell for cell in self.ramp_cells if rows.start <= cell[0] < rows.stop and cols.start <= cell[1] < cols.stop]:
+            del self.ramp_cells[row, col]
+            self.ramp_rows[row] &= ~(1 << col)
+        self._add_ramps(ramps, rows.start, cols.start)
+        self.empty = not np.count_nonzero(self.collidable)
+
+    def window(self, left: int, top: int, right: int, bottom: int) -> Tuple[int, int, int, int]:
+        """First and past-the-end (row, col) indices of the cells overlapping a pixel area, clipped to the region."""
+        size = commons.BLOCK_SIZE
+        rows, cols = self.collidable.shape
+        r0, r1 = top // size - self.row0, (bottom - 1) // size + 1 - self.row0
+        c0, c1 = left // size - self.col0, (right - 1) // size + 1 - self.col0
+        return r0 if r0 > 0 else 0, r1 if r1 < rows else rows, c0 if c0 > 0 else 0, c1 if c1 < cols else cols
+
+    def resolve_x(self, rect: pygame.Rect, previous: pygame.Rect, velocity_x: float) -> Optional[int]:
+        """
+        Stops a rect moved horizontally from `previous` at the first blocking cell on its way.
+
+        :return: The top of the highest cell stopping the rect, None if it was not stopped.
+        """
+        if self.empty:
+            return None
+
+        size = commons.BLOCK_SIZE
+        if velocity_x < 0:  # The columns left of the previous rect
+            r0, r1, c0, c1 = self.window(rect.left, rect.top, previous.left, rect.bottom)
+        elif velocity_x > 0:  # The columns right of the previous rect
+            r0, r1, c0, c1 = self.window(previous.right, rect.top, rect.right, rect.bottom)
+        else:
+            r0, r1, c0, c1 = self.window(rect.left, rect.top, rect.right, rect.bottom)
+        if c1 <= c0 or r1 <= r0:
+            return None  # Not moved by a whole pixel
+
+        # Column-major scan: the first blocking cell is in the leading column, at its top
+        cells = self.blocking[r0:r1, c0:c1]
+        if velocity_x < 0:
+            cells = cells[:, ::-1]
+        first = int(cells.T.argmax())
+        row, col = first % (r1 - r0), first // (r1 - r0)
+        if not cells[row, col]:
+            return None
+
+        stop = (self.col0 + (c1 - 1 - col if velocity_x < 0 else c0 + col)) * size
+        if velocity_x > 0:
+            rect.right = stop
+        elif velocity_x < 0:
+            rect.left = stop + size
+        return (self.row0 + r0 + row) * size
+
+    def resolve_y(self, rect: pygame.Rect, previous: pygame.Rect, velocity_y: float) -> bool:
+        """
+        Stops a rect moved vertically from `previous` at the first blocking cell on its way.
+
+        :return: True if the rect was stopped (or is in a blocking cell without moving vertically).
+        """
+        if self.empty:
+            return False
+
+        size = commons.BLOCK_SIZE
+        if velocity_y > 0:  # The rows under the previous rect
+            r0, r1, c0, c1 = self.window(rect.left, previous.bottom, rect.right, rect.bottom)
+        elif velocity_y < 0:  # The rows over the previous rect
+            r0, r1, c0, c1 = self.window(rect.left, rect.top, rect.right, previous.top)
+        else:
+            r0, r1, c0, c1 = self.window(rect.left, rect.top, rect.right, rect.bottom)
+        if r1 <= r0 or c1 <= c0:
+            return False  # Not moved by a whole pixel
+
+        # Row-major scan: the first blocking cell is in the leading row
+        cells = self.blocking[r0:r1, c0:c1]
+        if velocity_y < 0:
+            cells = cells[::-1]
+        row, col = divmod(int(cells.argmax()), c1 - c0)
+        if not cells[row, col]:
+            return False
+
+        if velocity_y > 0:
+            rect.bottom = (self.row0 + r0 + row) * size
+        elif velocity_y < 0:
+            rect.top = (self.row0 + r1 - row) * size
+        return True
+
+    def ramps_under(self, rect: pygame.Rect, downwards: bool) -> List[Tuple[int, int, int]]:
+        """(edge, x, y) of the ramp cells in a rect, top to bottom if `downwards`, bottom to top otherwise."""
+        if self.empty:
+            return []
+
+        r0, r1, c0, c1 = self.window(rect.left, rect.top, rect.right, rect.bottom)
+        size = commons.BLOCK_SIZE
+        span = (1 << (c1 - c0)) - 1 if c1 > c0 else 0
+        ramps = []
+        for row in range(r0, r1):
+            bits = (self.ramp_rows[row] >> c0) & span
+            while bits:  # The set bits, lowest column first
+                col = c0 + (bits & -bits).bit_length() - 1
+                bits &= bits - 1
+                ramps.append((self.ramp_cells[row, col], (self.col0 + col) * size, (self.row0 + row) * size))
+        return ramps if downwards else ramps[::-1]
+
+    def ceiling(self, rect: pygame.Rect, highest: bool) -> Optional[int]:
+        """
+        Bottom of the collidable cells (ramps included) overlapping a rect: of the highest row if `highest`,
+        of the lowest one otherwise. None if there are none.
+        """
+        if self.empty:
+            return None
+
+        r0, r1, c0, c1 = self.window(rect.left, rect.top, rect.right, rect.bottom)
+        if r1 <= r0 or c1 <= c0:
+            return None
+
+        # Row-major scan, from the top or from the bottom
+        cells = self.collidable[r0:r1, c0:c1] if highest else self.collidable[r0:r1, c0:c1][::-1]
+        row, col = divmod(int(cells.argmax()), c1 - c0)
+        if not cells[row, col]:
+            return None
+        return (self.row0 + (r0 + row if highest else r1 - 1 - row) + 1) * commons.BLOCK_SIZE
+
+
+TileRegion.EMPTY = TileRegion(np.zeros((0, 0), dtype=bool), np.zeros((0, 0), dtype=np.uint8), 0, 0)  # Shared region without cells
@@ -1,10 +1,13 @@
-from typing import List
+from typing import List, Optional, Tuple
+from images.image_loader import IMAGE_LOADER
+import pygame
 
 
 class Animation:
     def __init__(self, frame_names: List[str], update_interval: float, run_once: bool = False):
         """
         Initialize the animation with frame names and update interval.
+        The frames are resolved to Surfaces on first use, once the ImageLoader is initialized.
 
         :param frame_names: List of frame names (strings).
         :param update_interval: Time in seconds between frame updates.
@@ -17,6 +20,18 @@ class Animation:
         self.elapsed_time    : float = 0.0
         self.completed       : bool  = False  # Tracks if the animation has completed when run_once is True
 
+        self.frame_handles   : Optional[List[int]] = None
+        self.frame_surfaces  : Optional[List[pygame.Surface]] = None
+        self.frame_offsets   : Optional[List[Optional[Tuple[int, int]]]] = None
+
+    def resolve(self) -> None:
+        """
+        Look up the handle, Surface and offset of every frame.
+        """
+        self.frame_handles = [IMAGE_LOADER.get_handle(name) for name in self.frame_names]
+        self.frame_surfaces = [IMAGE_LOADER.surfaces[handle] for handle in self.frame_handles]
+        self.frame_offsets = [IMAGE_LOADER.offsets[handle] for handle in self.frame_handles]
+
     def update(self, delta_time: float) -> None:
         """
         Update the animation frame based on the elapsed time.
@@ -51,9 +66,35 @@ class Animation:
         return self.current_index
 
     def get_current_frame(self) -> str:
+        """
+        Get the name of the current frame of the animation.
+
+        :return: Current frame name.
+        """
+        return self.frame_names[self.current_index]
+
+    def get_current_handle(self) -> int:
+        """
+        Get the image handle of the current frame of the animation.
+        """
+        if self.frame_handles is None:
+            self.resolve()
+        return self.frame_handles[self.current_index]
+
+    def get_current_surface(self) -> pygame.Surface:
         """
         Get the current frame of the animation.
 
         :return: Current pygame.Surface object.
         """
-        return self.frame_names[self.current_index]
+        if self.frame_surfaces is None:
+            self.resolve()
+        return self.frame_surfaces[self.current_index]
+
+    def get_current_offset(self) -> Optional[Tuple[int, int]]:
+        """
+        Get the "offset" attribute of the current frame of the animation (None if it has none).
+        """
+        if self.frame_offsets is None:
+            self.resolve()
+        return self.frame_offsets[self.current_index]
@@ -1,8 +1,20 @@
 import pygame
 import commons
+from collections import OrderedDict
+from typing import Optional, Tuple
 from images.image_loader import IMAGE_LOADER
+from rendering.color_filter import ColorFilter
 
 class BackLayer:
+    """
+    A parallax background layer, tinted by the day/night cycle of a ColorFilter.
+
+    The cycle is quantized in commons.TINT_STEPS tints. The strip of the layer (its rows that are not fully transparent)
+    is tinted once per step and window size, and the last commons.TINT_CACHE_STEPS tinted strips are kept. The step
+    following the current one is tinted over several frames, commons.TINT_ROWS_PER_FRAME rows at a time, and the drawn
+    picture crossfades into it in commons.TINT_CROSSFADE_LEVELS levels. Each level is composed over several frames
+    too, while the previous picture is still drawn, so no frame pays for a whole strip.
+    """
     def __init__(self, image_name, factor=1, y_offset: int=0, color_key=(0, 0, 0)):
         self.image = pygame.Surface((commons.WIDTH, commons.HEIGHT))
         self.image.fill(color_key)
@@ -20,8 +32,18 @@ class BackLayer:
         self.pos_x = 0
 
         self.elapsed_time = 0      # Timer to track elapsed time
-        self.tinted_image = None  # Stores the last painted image
-    
+        self.tinted_image = None  # Picture drawn: a tinted strip, or a crossfade composed from two
+        self.tinted_key = None  # (step, crossfade level) of the picture drawn
+        self.composing: Optional[list] = None  # [key, surface, next row, current, following] of the crossfade being composed
+        self.spare: Optional[pygame.Surface] = None  # Composed picture no longer drawn, reused by the next crossfade
+        self.drawn_pos_x = None  # Position of the last draw
+
+        self.strip: Optional[pygame.Surface] = None  # Untinted rows of the layer holding some image
+        self.strip_y: int = 0
+        self.ramp: "OrderedDict[Tuple[Tuple[int, int], int], pygame.Surface]" = OrderedDict()  # (window size, step) -> tinted strip
+        self.pending: Optional[list] = None  # [key, strip, next row] of the step being tinted
+        self.build_strip()
+
     def resize(self):
         self.image = pygame.Surface((commons.WIDTH, commons.HEIGHT))
         self.image.fill(self.color_key)
@@ -33,7 +55,22 @@ class BackLayer:
         self.width = self.bimage.get_width()
 
         self.tinted_image = None
+        self.tinted_key = None
+        self.composing = None
+        self.spare = None
+        self.pending = None
+        self.build_strip()
 
+    def build_strip(self):
+        """Cuts the rows of the layer holding some image, the only ones tinted and drawn."""
+        bounds = self.image.get_bounding_rect()
+        bounds.x, bounds.width = 0, self.image.get_width()
+        self.strip = self.image.subsurface(bounds).copy()
+        self.strip_y = bounds.y
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.image.get_size()
 
     def update(self, x: int, delta_time: float):
         self.pos_x = int(x * self.factor)
@@ -41,21 +78,122 @@ class BackLayer:
         # Update the elapsed time
         self.elapsed_time += delta_time
 
-    def repaint(self, blended_color):
-        """Repaints the image with the given color and stores it as the last painted frame."""
-        self.tinted_image = self.image.copy()
-        # Apply the blended color
-        self.tinted_image.fill(blended_color, special_flags=pygame.BLEND_MULT)
+    def store(self, key, surface: pygame.Surface):
+        """Keeps a tinted strip, dropping the least recently used ones above commons.TINT_CACHE_STEPS."""
+        self.ramp[key] = surface
+        self.ramp.move_to_end(key)
+        while len(self.ramp) > commons.TINT_CACHE_STEPS:
+            self.ramp.popitem(last=False)
+
+    def get_step(self, step: int, color_filter: ColorFilter) -> pygame.Surface:
+        """Returns the strip tinted for a step, tinting it at once if it is not ready."""
+        key = (self.size, step)
+        if key in self.ramp:
+            self.ramp.move_to_end(key)
+            return self.ramp[key]
+
+        surface = self.strip.copy()
+        surface.fill(color_filter.step_color(step), special_flags=pygame.BLEND_MULT)
+        if self.pending and self.pending[0] == key:
+            self.pending = None
+        self.store(key, surface)
+        return surface
+
+    def prepare_step(self, step: int, color_filter: ColorFilter) -> Optional[pygame.Surface]:
+        """
+        Tints commons.TINT_ROWS_PER_FRAME more rows of the strip of a step.
+
+        :return: The tinted strip once all its rows are done, None before.
+        """
+        key = (self.size, step)
+        if key in self.ramp:
+            return self.ramp[key]
+
+        if self.pending is None or self.pending[0] != key:
+            self.pending = [key, self.strip.copy(), 0]
+
+        _, surface, row = self.pending
+        band = pygame.Rect(0, row, surface.get_width(), commons.TINT_ROWS_PER_FRAME)
+        surface.fill(color_filter.step_color(step), band, special_flags=pygame.BLEND_MULT)
+        self.pending[2] += commons.TINT_ROWS_PER_FRAME
+
+        if self.pending[2] < surface.get_height():
+            return None
+        self.pending = None
+        self.store(key, surface)
+        return surface
+
+    def compose(self) -> Optional[pygame.Surface]:
+        """
+        Composes commons.TINT_ROWS_PER_FRAME more rows of the crossfade being composed.
+        The strips are blitted without their colorkey (much faster with alpha): the transparent pixels
+        are the colorkey in every tinted strip, so they stay so.
+
+        :return: The composed picture once all its rows are done, None before.
+        """
+        (_, level), surface, row, current, following = self.composing
+        band = pygame.Rect(0, row, surface.get_width(), commons.TINT_ROWS_PER_FRAME)
+
+        current.set_colorkey(None)
+        surface.blit(current, band, band)
+        current.set_colorkey(self.color_key)
+
+        following.set_colorkey(None)
+        following.set_alpha(level * 255 // commons.TINT_CROSSFADE_LEVELS)
+        surface.blit(following, band, band)
+        following.set_alpha(None)
+        following.set_colorkey(self.color_key)
+
+        self.composing[2] += commons.TINT_ROWS_PER_FRAME
+        if self.composing[2] < surface.get_height():
+            return None
+        self.composing = None
+        return surface
+
+    def show(self, picture: pygame.Surface, key):
+        """Makes `picture` the drawn picture, keeping the previous one for reuse if it was composed."""
+        if self.tinted_key is not None and self.tinted_key[1] and self.tinted_image is not picture:
+            self.spare = self.tinted_image
+        self.tinted_image = picture
+        self.tinted_key = key
+
+    def draw(self, screen, color_filter: ColorFilter) -> bool:
+        """
+        Draws the layer, returning True if its picture changed since the last draw (new tint or position).
+        """
+        changed = self.pos_x != self.drawn_pos_x
+        self.drawn_pos_x = self.pos_x
+
+        step, fraction = color_filter.get_tint()
+        current = self.get_step(step, color_filter)
+        following = self.prepare_step((step + 1) % commons.TINT_STEPS, color_filter)
+        level = int(fraction * commons.TINT_CROSSFADE_LEVELS) if following is not None else 0
+
+        if self.composing and self.composing[0][0] != step:
+            self.composing = None  # A crossfade of a past step
+
+        if level == 0 or self.tinted_image is None:
+            # The tinted strip of the step, as it is
+            if self.tinted_image is not current:
+                self.show(current, (step, 0))
+                changed = True
+        elif (step, level) != self.tinted_key or self.composing:
+            if self.composing is None:
+                spare, self.spare = self.spare, None
+                if spare is None or spare.get_size() != current.get_size():
+                    spare = self.strip.copy()
+                self.composing = [(step, level), spare, 0, current, following]
+
+            key = self.composing[0]
+            composed = self.compose()
+            if composed is not None:
+                self.show(composed, key)
+                changed = True
 
-    def draw(self, screen, blended_color):
-        # Repaint every 2 seconds
-        if self.elapsed_time >= 0.5 or self.tinted_image is None:
-            self.repaint(blended_color)
-            self.elapsed_time = 0  # Reset the timer
+        # Blit the drawn picture
 
-        # Blit the last painted image
-        
         pos_x = self.pos_x % commons.WIDTH
 
-        screen.blit(self.tinted_image, (pos_x - self.width, 0))
-        screen.blit(self.tinted_image, (pos_x, 0))
+        screen.blit(self.tinted_image, (pos_x - self.width, self.strip_y))
+        screen.blit(self.tinted_image, (pos_x, self.strip_y))
+        return changed
@@ -0,0 +1,129 @@
+import pygame
+import numpy as np
+from typing import Dict, Tuple
+import commons
+from database.world_elements.block_metadata_loader import BLOCK_METADATA
+from images.image_loader import IMAGE_LOADER
+
+
+class ChunkRasterizer:
+    """
+    Draws the blocks of a chunk with array operations instead of one blit per cell.
+
+    The tiles of every block ID and edge combination of both layers are stacked into an atlas array per block
+    size (one per zoom level): atlas[layer * tiles + block_id * 16 + edge] holds the [x, y] pixels of
+    IMAGE_LOADER.block_tiles[block_id, edge, layer], mapped to the display format. A chunk region is drawn
+    by computing its tile-index grids from blocks_grid and edges_matrix and indexing the atlas with them.
+    """
+    EDGE_COMBINATIONS = 16
+
+    def __init__(self):
+        """Leave the atlas empty until `init`, once the images are loaded."""
+        self.rgb: np.ndarray = None          # (layers, tiles, BLOCK_SIZE, BLOCK_SIZE, 3) pixels of the tiles
+        self.atlases: Dict[int, np.ndarray] = {}  # Block size -> (layers * tiles, size, size) pixels, mapped to the display format
+        self.opaque: Dict[int, np.ndarray] = {}   # Block size -> (tiles, size, size) front pixels that are not the colorkey
+        self.solid: np.ndarray = None        # solid[tile], front tiles without any colorkey pixel
+        self.partial: np.ndarray = None      # partial[tile], front tiles mixing colorkey and image pixels
+        self.transparent: np.ndarray = None  # transparent[block_id], front blocks letting the back layer be seen
+        self.tiles: int = 0
+        self._initialized = False
+
+    def init(self):
+        """Build the tile atlas from the block images of the ImageLoader (the display mode must be set)."""
+        if self._initialized:
+            return
+
+        size = commons.BLOCK_SIZE
+        image_names = BLOCK_METADATA.get_property_array('image_name', None)
+        color_key = np.array(commons.BLOCK_MASK_COLOR, dtype=np.uint8)
+        self.tiles = len(image_names) * self.EDGE_COMBINATIONS
+
+        self.rgb = np.empty((2, self.tiles, size, size, 3), dtype=np.uint8)
+        self.rgb[:] = color_key  # Air (and blocks without images) is fully transparent
+
+        IMAGE_LOADER.build_block_tiles(image_names)
+        for (block_id, edge, layer), tile_surface in np.ndenumerate(IMAGE_LOADER.block_tiles):
+            if tile_surface is not None:  # Blocks without images are never drawn by the game either
+                self.rgb[layer, block_id * self.EDGE_COMBINATIONS + edge] = pygame.surfarray.array3d(tile_surface)
+
+        opaque = (self.rgb[0] != color_key).any(axis=-1)
+        self.solid = opaque.all(axis=(1, 2))
+        self.partial = opaque.any(axis=(1, 2)) & ~self.solid
+        self.transparent = BLOCK_METADATA.get_property_array('transparent', False).astype(bool)
+        self._initialized = True
+
+    def atlas(self, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the atlas and front opacity of a block size, building them on first use (zoom levels).
+        Tiles are scaled with nearest neighbour sampling, keeping the colorkey pixels exact.
+        """
+        if size not in self.atlases:
+            samples = np.arange(size) * commons.BLOCK_SIZE // size
+            rgb = self.rgb[:, :, samples][:, :, :, samples]
+
+            # Map the pixels once to the format of the chunk surfaces, so drawing copies plain integers.
+            # Tiles are laid out along x, layer 0 first: tile t of layer l is atlas[l * tiles + t].
+            strip = rgb.reshape(2 * self.tiles * size, size, 3)
+            mapped = pygame.surfarray.array2d(pygame.surfarray.make_surface(strip).convert())
+            self.atlases[size] = np.ascontiguousarray(mapped.reshape(2 * self.tiles, size, size))
+            self.opaque[size] = (rgb[0] != np.array(commons.BLOCK_MASK_COLOR, dtype=np.uint8)).any(axis=-1)
+
+        return self.atlases[size], self.opaque[size]
+
+    def tile_indices(self, blocks_grid: np.ndarray, edges_matrix: np.ndarray):
+        """
+        Compute the atlas tiles of a block region.
+
+        The back layer is only drawn where it can be seen: no front block, a transparent front block,
+        or a front block cut by edges the back block doesn't have.
+
+        :param blocks_grid: The (layers, rows, cols) blocks of the region.
+        :param edges_matrix: The (layers, rows, cols) edges of the region.
+        :return: The (front, back) [row, col] tile-index grids, tile 0 being fully transparent.
+        """
+        front_blocks, back_blocks = blocks_grid.astype(np.intp)
+        front_edges, back_edges = edges_matrix.astype(np.intp)
+
+        front = front_blocks * self.EDGE_COMBINATIONS + front_edges
+
+        back_visible = (back_blocks != 0) & (((front_edges != 0b1111) & (front_edges != back_edges))
+                                             | (front_blocks == 0)
+                                             | self.transparent[front_blocks])
+        back = np.where(back_visible, back_blocks * self.EDGE_COMBINATIONS + back_edges, 0)
+
+        return front, back
+
+    def rasterize(self, surface: pygame.Surface, chunk, rows: slice = slice(None), cols: slice = slice(None)):
+        """
+        Draw the blocks of a chunk region over its area of the chunk surface, replacing what was there.
+
+        :param surface: The chunk surface (CHUNK_SIZE blocks square at any block size, in the display format).
+        :param chunk: The chunk to draw.
+        :param rows: The rows of the region (all by default).
+        :param cols: The columns of the region (all by default).
+        """
+        front, back = self.tile_indices(chunk.blocks_grid[:, rows, cols], chunk.edges_matrix[:, rows, cols])
+        front, back = front.T, back.T  # [col, row], like the [x, y] surface arrays
+
+        size = surface.get_width() // commons.CHUNK_SIZE  # Block size at the zoom of the surface
+        atlas, opaque = self.atlas(size)
+
+        # One gather for every cell: the front tile where it covers the cell, the back tile elsewhere
+        tiles = atlas[np.where(self.solid[front], front, self.tiles + back)]
+
+        # Cut front tiles are composed with the back tile behind them, pixel by pixel
+        cut = self.partial[front]
+        if cut.any():
+            cut_front = front[cut]
+            tiles[cut] = np.where(opaque[cut_front], atlas[cut_front], atlas[self.tiles + back[cut]])
+
+        n_cols, n_rows = front.shape
+        x = (cols.start or 0) * size
+        y = (rows.start or 0) * size
+
+        target = pygame.surfarray.pixels2d(surface)[x:x + n_cols * size, y:y + n_rows * size]
+        target.reshape(n_cols, size, n_rows, size)[:] = tiles.transpose(0, 2, 1, 3)
+        del target  # Unlocks the surface
+
+
+CHUNK_RASTERIZER = ChunkRasterizer()
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+import pygame
+import commons
+
+
+class ChunkSurfaceCache:
+    """
+    Keeps the rendered surfaces of the chunks around the player, so a chunk re-entering the window
+    is not drawn again.
+
+    Entries are keyed by chunk position and remember the Chunk object they were drawn from. Its content
+    version relative to the surface is its `changes` log: every change to its blocks or edges since the
+    surface was drawn is recorded there (and cleared once rendered), so a hit only redraws those cells,
+    or nothing. A miss (new position, or the chunk was evicted and loaded again by the World) needs a full redraw. The least recently used entries are dropped when the surfaces exceed `max_bytes`,
+    except the ones used during the current frame.
+    """
+
+    def __init__(self, create_surface: Callable[[], pygame.Surface], max_bytes: int = commons.CHUNK_SURFACE_CACHE_BYTES):
+        """
+        :param create_surface: Function creating an empty chunk surface.
+        :param max_bytes: Memory budget of the cached surfaces.
+        """
+        self.create_surface = create_surface
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[Tuple[int, int], list]" = OrderedDict()  # key -> [surface, chunk, frame last used]
+        self.nbytes: int = 0
+        self.frame: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def begin_frame(self):
+        """Starts a new frame: the entries used during the previous ones can be evicted again."""
+        self.frame += 1
+
+    def get(self, chunk) -> Tuple[pygame.Surface, bool]:
+        """
+        Returns the surface of a chunk.
+
+        :return: (surface, hit). If hit is False, the surface holds another picture and must be fully redrawn.
+        """
+        key = (int(chunk.pos.x), int(chunk.pos.y))
+        entry = self.entries.get(key)
+
+        if entry is not None:
+            self.entries.move_to_end(key)  # Most recently used
+            entry[2] = self.frame
+            if entry[1] is chunk:
+                self.hits += 1
+                return entry[0], True
+
+            entry[1] = chunk  # Same position, new Chunk object: its surface is reused
+            self.misses += 1
+            return entry[0], False
+
+        self.misses += 1
+        surface = self._take_surface()
+        self.entries[key] = [surface, chunk, self.frame]
+        return surface, False
+
+    def _take_surface(self) -> pygame.Surface:
+        """
+        Returns a surface for a new entry: the one of the least recently used entry if the budget is reached,
+        a new one otherwise.
+        """
+        if self.entries:
+            oldest_key, (surface, _, frame) = next(iter(self.entries.items()))
+            if frame != self.frame and self.nbytes + self.surface_bytes(surface) > self.max_bytes:
+                del self.entries[oldest_key]
+                self.evictions += 1
+                return surface
+
+        surface = self.create_surface()
+        self.nbytes += self.surface_bytes(surface)
+        return surface
+
+    @staticmethod
+    def surface_bytes(surface: pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the counters of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.nbytes,
+        }
@@ -1,6 +1,8 @@
 import pygame
+import commons
 import sys
 import time
+from typing import Tuple
 
 class ColorFilter:
     def __init__(self, seconds_in_full_day):
@@ -32,7 +34,22 @@ class ColorFilter:
     def get_color(self, delta_time):
         self.time_elapsed += delta_time
         current_time = (self.time_elapsed % self.seconds_in_full_day) / self.seconds_in_full_day
+        return self.color_at(current_time)
 
+    def get_tint(self, steps: int = commons.TINT_STEPS) -> Tuple[int, float]:
+        """
+        Returns the current time of the day quantized in `steps`: (step, fraction of the way to the next step).
+        """
+        position = (self.time_elapsed % self.seconds_in_full_day) / self.seconds_in_full_day * steps
+        step = int(position)
+        return step % steps, position - step
+
+    def step_color(self, step: int, steps: int = commons.TINT_STEPS) -> pygame.Color:
+        """Returns the color at the beginning of a tint step."""
+        return self.color_at(step / steps)
+
+    def color_at(self, current_time: float) -> pygame.Color:
+        """Returns the color at a time of the day, from 0 (midnight) to 1."""
         if current_time <= self.dawn_time:
             return self.blend_color(self.colors["night"], self.colors["dawn"], current_time / self.dawn_time)
         elif current_time <= self.day_time:
@@ -0,0 +1,75 @@
+from typing import List, Tuple
+import pygame
+import commons
+
+
+class DirtyRegions:
+    """
+    Collects the screen regions changed by a frame, so only those are presented.
+
+    The frame is still drawn entirely on the screen surface; only `pygame.display.update` is limited to
+    the changed regions. Sprites are tracked over two frames (the region they leave must be presented too).
+    Anything moving the whole picture (camera scrolling, zoom, background repaint) asks for a full frame.
+    """
+
+    def __init__(self, enabled: bool = commons.DIRTY_RECTS, max_rects: int = commons.DIRTY_RECTS_MAX):
+        """
+        :param enabled: If False, every frame is presented entirely.
+        :param max_rects: Above this number of regions, the full frame is presented instead.
+        """
+        self.enabled = enabled
+        self.max_rects = max_rects
+        self.screen_rect = pygame.Rect(0, 0, commons.WIDTH, commons.HEIGHT)  # Follows the window size, see `present`
+        self.rects: List[pygame.Rect] = []
+        self.sprite_rects: List[pygame.Rect] = []
+        self.previous_sprite_rects: List[pygame.Rect] = []
+        self.full: bool = True  # The first frame is always presented entirely
+
+        self.presented_fraction: float = 1.0  # Fraction of the screen pixels presented by the last frame
+        self.full_frames: int = 0
+        self.partial_frames: int = 0
+
+    def mark_full(self):
+        """The whole screen changed."""
+        self.full = True
+
+    def add(self, rect):
+        """A region of the screen changed."""
+        if not self.full:
+            self.rects.append(pygame.Rect(rect))
+
+    def add_sprite(self, rect):
+        """A sprite was drawn over a region: it is presented on this frame and the next one."""
+        self.sprite_rects.append(rect)
+
+    def present(self):
+        """
+        Presents the frame: the changed regions, or everything.
+        """
+        if self.screen_rect.size != (commons.WIDTH, commons.HEIGHT):  # Resized
+            self.screen_rect = pygame.Rect(0, 0, commons.WIDTH, commons.HEIGHT)
+            self.full = True
+
+        rects = self.rects + self.sprite_rects + self.previous_sprite_rects
+        rects = [rect.clip(self.screen_rect) for rect in rects]
+
+        if not self.enabled or self.full or len(rects) > self.max_rects:
+            pygame.display.update()
+            self.presented_fraction = 1.0
+            self.full_frames += 1
+        else:
+            rects = [rect for rect in rects if rect.width and rect.height]
+            if rects:
+                pygame.display.update(rects)
+            # Overlapping regions are counted twice: an upper bound
+            area = sum(rect.width * rect.height for rect in rects)
+            self.presented_fraction = min(area / (self.screen_rect.width * self.screen_rect.height), 1.0)
+            self.partial_frames += 1
+
+        self.previous_sprite_rects, self.sprite_rects = self.sprite_rects, []
+        self.rects.clear()
+        self.full = False
+
+    def stats(self) -> Tuple[int, int, float]:
+        """(full frames, partial frames, presented fraction of the last frame)"""
+        return self.full_frames, self.partial_frames, self.presented_fraction
@@ -4,13 +4,19 @@ import pygame
 import commons
 from database.world_elements.block_metadata_loader import BLOCK_METADATA
 from images.image_loader import IMAGE_LOADER
+from rendering.chunk_rasterizer import CHUNK_RASTERIZER
+from rendering.chunk_surface_cache import ChunkSurfaceCache
+from rendering.dirty_regions import DirtyRegions
+from rendering.static_render_lists import StaticRenderLists
 from database.world_elements.item_metadata import ITEM_METADATA
-from database.world_elements.static_elements_manager import S_ELEMENT_METADATA_LOADER
 from database.world_elements.chunk import Chunk
 from physics.moving_element import MovingElement
+from physics.item_store import ItemStore
 from physics.player import Player
 import numpy as np
-from typing import List
+import math
+from typing import List, Tuple, Optional, Iterator, Iterable
+from collections import OrderedDict
 from pygame.math import Vector2 as v2
 from threading import Thread
 from utils.inventory import Inventory
@@ -20,8 +26,14 @@ from utils.debug import Debug
 
 class RenderManager:
     """
-    A manager class responsible for handling the rendering of a 3x3 chunk matrix and moving elements.
+    A manager class responsible for handling the rendering of the chunk window and moving elements.
+
+    The window is a ring buffer of columns x rows chunk slots, sized to cover the screen at the current zoom:
+    the chunk (x, y) lives in the slot [y % rows][x % columns], so moving the window only loads the chunks
+    entering it, whatever the distance.
     """
+    INVENTORY_SLOTS_X = (10, 46, 82, 118, 154, 190, 226, 266, 297)  # Item positions of the slots in the inventory image
+    INVENTORY_SLOTS_Y = 13
 
     def __init__(self, current_position):
         """
@@ -31,207 +43,277 @@ class RenderManager:
         :param color_key: Tuple[int, int, int], RGB value for transparency in surfaces.
         """
         self.current_position = current_position
+        self.zoom: float = commons.DEFAULT_ZOOM
+        self.tile_size: int = int(commons.BLOCK_SIZE * self.zoom)  # On screen size of a block
         self.current_chunk_position = self.get_chunk_position()
         self.current_static_elements = []
+        self.static_render_lists = StaticRenderLists()  # Static elements of the window chunks, ready to be drawn
         self.initializing = True
         self.color_key = commons.BLOCK_MASK_COLOR
-        self.chunk_matrix = np.matrix([[None for _ in range(3)] for _ in range(3)])
-        self.surface_matrix = np.matrix([[self.create_surface() for _ in range(3)] for _ in range(3)])
+        self.window_size: Tuple[int, int] = self.compute_window_size()  # (columns, rows) of chunk slots
+        self.window_origin: Optional[Tuple[int, int]] = None  # Chunk at the top-left of the window (None until loaded)
+        self.chunk_slots: List[List[Optional[Chunk]]] = self.create_slots()
+        self.chunk_surfaces = ChunkSurfaceCache(self.create_surface)
         self.moving_elements = []
-    
+        self.waiting_chunks = False  # If some chunk of the window is still being generated
+        self.dirty_regions = DirtyRegions()  # Screen regions changed by the frame (commons.DIRTY_RECTS)
+        self.last_camera = None  # (position, zoom) of the last frame
+        self.interpolation: float = 1.0  # Fraction of a simulation step between the previous and current positions drawn
+        self.last_hud = None  # What the HUD showed on the last frame
+        self.hud_surface: Optional[pygame.Surface] = None  # The HUD, composed again only when it changes
+        self.hud_rect: Optional[pygame.Rect] = None
+        self.text_images: OrderedDict[tuple, pygame.Surface] = OrderedDict()  # (text, size, colors) -> rendered text, least recently used first
+        IMAGE_LOADER.build_block_tiles(BLOCK_METADATA.get_property_array('image_name', None))
+        CHUNK_RASTERIZER.init()
+
+    @property
+    def view_size(self) -> Tuple[float, float]:
+        """Size of the screen in world coordinates."""
+        return commons.WIDTH / self.zoom, commons.HEIGHT / self.zoom
+
     def get_chunk_position(self):
-        return int((self.current_position[0] + commons.WIDTH /2) // commons.CHUNK_SIZE_PIXELS), int((self.current_position[1]+ commons.HEIGHT /2) // commons.CHUNK_SIZE_PIXELS)
+        view_width, view_height = self.view_size
+        return int((self.current_position[0] + view_width / 2) // commons.CHUNK_SIZE_PIXELS), int((self.current_position[1] + view_height / 2) // commons.CHUNK_SIZE_PIXELS)
+
+    def compute_window_size(self) -> Tuple[int, int]:
+        """
+        Columns and rows of chunks around the center one needed to cover the screen (3x3 at zoom 1 in 1920x1080).
+        """
+        view_width, view_height = self.view_size
+        half_columns = math.ceil(view_width / 2 / commons.CHUNK_SIZE_PIXELS)
+        half_rows = math.ceil(view_height / 2 / commons.CHUNK_SIZE_PIXELS)
+        return 2 * half_columns + 1, 2 * half_rows + 1
+
+    def create_slots(self) -> List[List[Optional[Chunk]]]:
+        columns, rows = self.window_size
+        return [[None] * columns for _ in range(rows)]
+
+    def set_zoom(self, zoom: float, world):
+        """
+        Changes the zoom, one of commons.ZOOM_LEVELS. The window is resized and reloaded at once: a frame
+        can be drawn before the next update.
+
+        :param world: The game world, loading the chunks of the resized window.
+        """
+        if zoom not in commons.ZOOM_LEVELS:
+            raise ValueError(f"Zoom {zoom} is not one of {commons.ZOOM_LEVELS}.")
+        if zoom == self.zoom:
+            return
+
+        self.zoom = zoom
+        self.tile_size = int(commons.BLOCK_SIZE * zoom)
+        self.window_size = self.compute_window_size()
+        self.chunk_slots = self.create_slots()
+        self.chunk_surfaces = ChunkSurfaceCache(self.create_surface)  # Surfaces of the new size
+        self.initializing = True
+        self.update_chunks(world)
+
+    def window_chunks(self) -> Iterator[Chunk]:
+        """Yields the chunks of the window, row by row."""
+        for row in self.chunk_slots:
+            yield from row
 
     def _update_static_elements(self):
 
         self.current_static_elements.clear()
 
-        for i in range(3):
-            for j in range(3):
-                stc_el  = self.chunk_matrix[i, j].world_elements
-                self.current_static_elements.extend(stc_el)
+        for chunk in self.window_chunks():
+            self.current_static_elements.extend(chunk.world_elements)
+        self.static_render_lists.retain(self.window_chunks())
+        
+        self.waiting_chunks = any(not chunk.completed_created for chunk in self.window_chunks())
+        self.dirty_regions.mark_full()
 
     def create_surface(self):
         """
-        Creates a new surface for rendering a single chunk with the specified color key.
+        Creates a new surface for rendering a single chunk at the current zoom with the specified color key.
 
         :return: pygame.Surface, a new surface instance.
         """
-        surface = pygame.Surface((commons.CHUNK_SIZE_PIXELS, commons.CHUNK_SIZE_PIXELS)).convert()
+        size = self.tile_size * commons.CHUNK_SIZE
+        surface = pygame.Surface((size, size)).convert()
         surface.set_colorkey(self.color_key)
         return surface
 
+    def entering_chunks(self, previous_origin: Optional[Tuple[int, int]], origin: Tuple[int, int]) -> Iterator[Tuple[int, int]]:
+        """
+        Yields the positions of the window at `origin` that are not in the window at `previous_origin`
+        (every position if None).
+        """
+        columns, rows = self.window_size
+        x0, y0 = origin
+        all_rows = range(y0, y0 + rows)
+
+        if previous_origin is None:
+            old_columns, new_rows = range(0), all_rows
+        else:
+            old_columns = range(previous_origin[0], previous_origin[0] + columns)
+            old_rows = range(previous_origin[1], previous_origin[1] + rows)
+            new_rows = [y for y in all_rows if y not in old_rows]
+
+        for x in range(x0, x0 + columns):
+            for y in (new_rows if x in old_columns else all_rows):
+                yield x, y
+
     def update_chunks(self, world):
         """
-        Updates the 3x3 chunk matrix based on the current position in the world.
-        This function loads new chunks if necessary.
+        Updates the chunk window based on the current position in the world.
+        Only the chunks entering the window are loaded, for moves and jumps of any size.
 
         :param world: The game world object that provides chunk-loading functionality.
         """
+        center = self.get_chunk_position()
+        columns, rows = self.window_size
+        origin = (center[0] - columns // 2, center[1] - rows // 2)
+
         if self.initializing:
             self.initializing = False
-
-            self.current_chunk_position = self.get_chunk_position()
-            
-            for i in range(3):
-                for j in range(3):
-                    chunk_x = self.current_chunk_position[0] + (j - 1)
-                    chunk_y = self.current_chunk_position[1] + (i - 1)
-                    self.chunk_matrix[i, j] = world.load_chunk(chunk_x, chunk_y)
-            
-            self._update_static_elements()
-            
+            previous_origin = None
+        elif origin != self.window_origin:
+            previous_origin = self.window_origin
+        else:
+            if self.waiting_chunks:
+                # Placeholders get their static elements once generated
+                self._update_static_elements()
             return
-        
-        if self.current_chunk_position != (new_pos := self.get_chunk_position()):
-            
-            dif = pygame.Vector2(new_pos) - pygame.Vector2(self.current_chunk_position)
-
-            self.current_chunk_position = new_pos
-
-            if dif.x:
-                if dif.x > 0:
-                    buff = self.surface_matrix[:, 0].copy()
-                    self.surface_matrix[:, 0] = self.surface_matrix[:, 1]
-                    self.surface_matrix[:, 1] = self.surface_matrix[:, 2]
-                    self.surface_matrix[:, 2] = buff
-                    self.chunk_matrix[:, 0] = self.chunk_matrix[:, 1]
-                    self.chunk_matrix[:, 1] = self.chunk_matrix[:, 2]
-
-                    
-                    chunk_x = self.chunk_matrix[0, 2].pos.x + 1
-                    for i in range(3):
-                        chunk_y = self.chunk_matrix[0, 0].pos.y + i 
-                        self.chunk_matrix[i, 2] = world.load_chunk(chunk_x, chunk_y)
-                else:
-                    buff = self.surface_matrix[:, 2].copy()
-                    self.surface_matrix[:, 2] = self.surface_matrix[:, 1]
-                    self.surface_matrix[:, 1] = self.surface_matrix[:, 0]
-                    self.surface_matrix[:, 0] = buff
-                    
-                    self.chunk_matrix[:, 2] = self.chunk_matrix[:, 1]
-                    self.chunk_matrix[:, 1] = self.chunk_matrix[:, 0]
-
-                    chunk_x = self.chunk_matrix[0, 0].pos.x - 1
-                    for i in range(3):
-                        chunk_y = self.chunk_matrix[0, 0].pos.y + i 
-                        self.chunk_matrix[i, 0] = world.load_chunk(chunk_x, chunk_y)
-            if dif.y:
-                if dif.y > 0:
-                    buff = self.surface_matrix[0, :].copy()
-                    self.surface_matrix[0, :] = self.surface_matrix[1, :]
-                    self.surface_matrix[1, :] = self.surface_matrix[2, :]
-                    self.surface_matrix[2, :] = buff
-                    self.chunk_matrix[0, :] = self.chunk_matrix[1, :]
-                    self.chunk_matrix[1, :] = self.chunk_matrix[2, :]
-
-
-                    chunk_y = self.chunk_matrix[2, 0].pos.y + 1
-
-                    for j in range(3):
-                        chunk_x = self.chunk_matrix[2, 0].pos.x + j 
-                        self.chunk_matrix[2, j] = world.load_chunk(chunk_x, chunk_y)
-                else:
-                    buff = self.surface_matrix[2, :].copy()
-                    self.surface_matrix[2, :] = self.surface_matrix[1, :]
-                    self.surface_matrix[1, :] = self.surface_matrix[0, :]
-                    self.surface_matrix[0, :] = buff
-                    self.chunk_matrix[2, :] = self.chunk_matrix[1, :]
-                    self.chunk_matrix[1, :] = self.chunk_matrix[0, :]
 
+        self.current_chunk_position = center
+        self.window_origin = origin
+        world.window_radius = max(columns, rows) // 2
 
-                    chunk_y = self.chunk_matrix[0, 0].pos.y - 1
+        for chunk_x, chunk_y in self.entering_chunks(previous_origin, origin):
+            # Only the center chunk is waited for, the others show a placeholder until generated
+            self.chunk_slots[chunk_y % rows][chunk_x % columns] = world.load_chunk(chunk_x, chunk_y, wait=(chunk_x, chunk_y) == center)
 
-                    for j in range(3):
-                        chunk_x = self.chunk_matrix[0, 0].pos.x + j 
-                        self.chunk_matrix[0, j] = world.load_chunk(chunk_x, chunk_y)
-            
-            self._update_static_elements()
+        self._update_static_elements()
+
+    def world_to_screen(self, position) -> Tuple[float, float]:
+        """Converts a position in world coordinates to screen coordinates."""
+        return (position[0] - self.current_position[0]) * self.zoom, (position[1] - self.current_position[1]) * self.zoom
 
     def render_chunks(self, screen):
         """
-        Renders the 3x3 chunk matrix onto the screen.
+        Renders the chunk window onto the screen.
 
         :param screen: pygame.Surface, the main game display.
         """
-        for element in self.current_static_elements:
-            image_name = S_ELEMENT_METADATA_LOADER.get_property_by_id(element.id, 'image_name')
-            im = IMAGE_LOADER.get_image(image_name)
-            screen_position = v2(element.rect.topleft) + IMAGE_LOADER.get_image_atribute(image_name, "offset") - v2(self.current_position)
-            screen.blit(im, screen_position)
+        camera = (tuple(self.current_position), self.zoom)
+        if camera != self.last_camera:
+            self.dirty_regions.mark_full()  # Scrolling moves the whole picture
+            self.last_camera = camera
 
-        
-        for i in range(3):
-            for j in range(3):
-                chunk_surface = self.surface_matrix[i, j]
-                chunk_data = self.chunk_matrix[i, j]
+        Debug.start_timer("static elements")
+        screen.blits(self.static_render_lists.batch(self.window_chunks(), self.current_position, self.view_size, self.zoom), doreturn=False)
+        for left, top, width, height in self.static_render_lists.changed:
+            x, y = self.world_to_screen((left, top))
+            self.dirty_regions.add((x, y, math.ceil(width * self.zoom) + 1, math.ceil(height * self.zoom) + 1))
+        self.static_render_lists.changed.clear()
+        Debug.stop_timer("static elements")
 
-                # Calculate chunk position relative to the current position
-                #chunk_x = (j - 1) * commons.CHUNK_SIZE_PIXELS - (self.current_position[0])
-                #chunk_y = (i - 1) * commons.CHUNK_SIZE_PIXELS - (self.current_position[1])
+        self.chunk_surfaces.begin_frame()
 
-                chunk_x = chunk_data.pos.x * commons.CHUNK_SIZE_PIXELS - (self.current_position[0]) #+ commons.WIDTH /2
-                chunk_y = chunk_data.pos.y * commons.CHUNK_SIZE_PIXELS - (self.current_position[1]) #+ commons.HEIGHT /2
+        x0, y0 = self.window_origin
+        columns, rows = self.window_size
+        chunk_pixels = commons.CHUNK_SIZE_PIXELS
+
+        for chunk_y in range(y0, y0 + rows):
+            for chunk_x in range(x0, x0 + columns):
+                chunk_data = self.chunk_slots[chunk_y % rows][chunk_x % columns]
+
+                chunk_surface, cached = self.chunk_surfaces.get(chunk_data)
+                if not cached:
+                    chunk_data.changes['all'] = True  # The surface holds another chunk (or nothing yet)
+
+                screen_position = self.world_to_screen((chunk_x * chunk_pixels, chunk_y * chunk_pixels))
+                if chunk_data.completed_created:
+                    self.add_change_regions(chunk_data, screen_position)
 
-                
                 self.render_single_chunk(chunk_surface, chunk_data)
                 Debug.start_timer("bliting chunk")
-                screen.blit(chunk_surface, (chunk_x, chunk_y))
+                screen.blit(chunk_surface, screen_position)
                 Debug.stop_timer("bliting chunk")
             
+    def add_change_regions(self, chunk: Chunk, screen_position):
+        """
+        Adds the screen regions of the pending changes of a chunk to the dirty regions.
+        """
+        changes = chunk.changes
+        size = self.tile_size
+        chunk_size = size * commons.CHUNK_SIZE
+        x, y = screen_position
+
+        if changes['all']:
+            self.dirty_regions.add((x, y, chunk_size, chunk_size))
+            return
+
+        for row in changes['line']:
+            self.dirty_regions.add((x, y + row * size, chunk_size, size))
+        for column in changes['column']:
+            self.dirty_regions.add((x + column * size, y, size, chunk_size))
+        for col, row in changes['block']:
+            self.dirty_regions.add((x + col * size, y + row * size, size, size))
+        for col, row in changes['breaking']:
+            self.dirty_regions.add((x + col * size, y + row * size, size, size))
+
+    def present(self):
+        """
+        Shows the frame on the display: only its changed regions in the dirty rects mode.
+        """
+        self.dirty_regions.present()
+
     def render_inventory(self, screen: pygame.Surface, inventory: Inventory, player: Player):
-        inv_image = IMAGE_LOADER.get_image("INVENTORY")
+        """
+        Draws the HUD (inventory bar and life bar) from its cached surface, composed again only when
+        the inventory, the life bar width or the window size changed.
+        """
+        life_width = int(IMAGE_LOADER.get_image("FULL_LIFE").get_width() * player.life / commons.PLAYER_LIFE)
+        hud = (inventory.version, life_width, pygame.display.get_window_size())
+
+        if hud != self.last_hud:
+            if self.hud_rect is not None:
+                self.dirty_regions.add(self.hud_rect)  # The region left by the previous HUD
+            self.hud_surface, self.hud_rect = self.compose_hud(inventory, life_width)
+            self.dirty_regions.add(self.hud_rect)
+            self.last_hud = hud
+
+        screen.blit(self.hud_surface, self.hud_rect)
 
+    def compose_hud(self, inventory: Inventory, life_width: int) -> Tuple[pygame.Surface, pygame.Rect]:
+        """
+        Composes the inventory bar, its items and quantities, the selected slot light and the life bar
+        into a single surface.
+
+        :return: (surface, screen rect of the surface)
+        """
+        inv_image = IMAGE_LOADER.get_image("INVENTORY")
         inv_rect = pygame.rect.Rect((0, 0), inv_image.get_size())
-                               
         inv_rect.center = commons.INVENTORY_POS()
-        inv_poses = [
-            10,
-            46,
-            82,
-            118,
-            154,
-            190,
-            226,
-            266,
-            297
-        ]
-        inv_h = 13
-
-        screen.blit(inv_image, inv_rect)
-
-
-        for pos, element in enumerate(inventory.items):
+        blits = [(inv_image, v2(inv_rect.topleft), None)]
+
+        for slot, element in enumerate(inventory.items):
             if not element:
                 continue
-        
-            iten = element['item']
-            num = element['quantity']
-            num_im = self.render_text_image(num)
-            iten_image = IMAGE_LOADER.get_image(ITEM_METADATA.get_property_by_id(iten, 'image_name'))
-            pos = v2(inv_poses[pos], inv_h)
-            new_pos = v2(inv_rect.topleft) + pos
-            screen.blit(iten_image, new_pos)
-            screen.blit(num_im, new_pos - v2(0, 5))
-        
-        selected = inventory.selected
-        selected_light = self.create_circle_image(50)
-        pos = v2(inv_poses[selected], inv_h) + v2 (20, 20)
-        new_pos = v2(inv_rect.topleft) + pos
-        screen.blit(selected_light, new_pos - v2 (35, 35))
 
-        life_pos = inv_rect.topright + v2(20, 0)
+            item_image = IMAGE_LOADER.get_image(ITEM_METADATA.get_property_by_id(element['item'], 'image_name'))
+            item_pos = v2(inv_rect.topleft) + v2(self.INVENTORY_SLOTS_X[slot], self.INVENTORY_SLOTS_Y)
+            blits.append((item_image, item_pos, None))
+            blits.append((self.render_text_image(element['quantity']), item_pos - v2(0, 5), None))
 
-        life_percentage = player.life / commons.PLAYER_LIFE
+        selected_pos = v2(inv_rect.topleft) + v2(self.INVENTORY_SLOTS_X[inventory.selected], self.INVENTORY_SLOTS_Y) - v2(15, 15)
+        blits.append((self.create_circle_image(50), selected_pos, None))
 
         life_im = IMAGE_LOADER.get_image("FULL_LIFE")
         un_life_im = IMAGE_LOADER.get_image("EMPTY_LIFE")
+        life_pos = v2(inv_rect.topright) + v2(20, 0)
+        blits.append((un_life_im, life_pos, None))
+        blits.append((life_im, life_pos, pygame.Rect(0, 0, life_width, life_im.get_height())))
 
-        life_rect = pygame.Rect((0, 0), life_im.get_size())
-        life_rect.w *= life_percentage
+        rects = [pygame.Rect(pos, area.size if area else image.get_size()) for image, pos, area in blits]
+        bounds = rects[0].unionall(rects[1:])
 
-        screen.blit(un_life_im, life_pos)
-        screen.blit(life_im.subsurface(life_rect), life_pos)
+        surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        surface.blits([(image, pos - v2(bounds.topleft), area) for image, pos, area in blits], doreturn=False)
+        return surface, bounds
     
     @lru_cache(maxsize=1)
     def create_circle_image(self, size: int, circle_color=(255, 255, 255), bg_color=(0, 0, 0)):
@@ -263,9 +345,18 @@ class RenderManager:
         
         return surface
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_font(font_size: int) -> pygame.font.Font:
+        """Returns the default Pygame font at a size, created once."""
+        if not pygame.get_init():
+            pygame.init()
+        return pygame.font.Font(None, font_size)
+
     def render_text_image(self, text, font_size=20, font_color=(0, 0, 0), bg_color=(255, 255, 255)):
         """
-        Renders an image of a text using Pygame.
+        Renders an image of a text using Pygame. Images are cached: the same text (quantities, ...) is rendered once,
+        for the last commons.TEXT_CACHE_SIZE texts.
         
         Args:
             text (str): The text to render.
@@ -276,15 +367,19 @@ class RenderManager:
         Returns:
             pygame.Surface: A Pygame surface containing the rendered number.
         """
-        # Initialize Pygame if not already initialized
-        if not pygame.get_init():
-            pygame.init()
-        
-        # Create a font object
-        font = pygame.font.Font(None, font_size)  # Default Pygame font
+        key = (text, font_size, font_color, bg_color)
+        text_surface = self.text_images.get(key)
+        if text_surface is not None:
+            self.text_images.move_to_end(key)
+            return text_surface
+
+        font = self.get_font(font_size)  # Default Pygame font
         
         # Render the number as a surface
         text_surface = font.render(str(text), True, font_color, bg_color)
+        self.text_images[key] = text_surface
+        if len(self.text_images) > commons.TEXT_CACHE_SIZE:
+            self.text_images.popitem(last=False)  # Least recently used
         
         return text_surface
 
@@ -296,100 +391,28 @@ class RenderManager:
         :param surface: pygame.Surface, the surface to draw on.
         :param chunk: Chunk, the chunk object containing blocks and elements to render.
         """
-        if chunk is None or not any(chunk.changes.values()) or not chunk.completed_created:
+        if chunk is not None and not chunk.completed_created:
+            surface.fill(self.color_key)  # Placeholder while the chunk is generated in background.
+            return
+
+        if chunk is None or not any(chunk.changes.values()):
             return  # Skip rendering if chunk is not loaded or if it does not have changes.
 
         if chunk.changes.get("all"):
             Debug.start_timer("rendering entire chunk")
-            surface.fill(self.color_key)  # Clear surface with transparent background.
-
-            # Render the blocks in the chunk
-            for x in range(commons.CHUNK_SIZE):
-                for y in range(commons.CHUNK_SIZE):
-                    for layer in range(1, -1, -1):
-                        block = chunk.blocks_grid[layer, y, x]
-                        edge = chunk.edges_matrix[layer, y, x]
-
-                        if block:
-                            block_rect = pygame.Rect(
-                                        x * commons.BLOCK_SIZE,
-                                        y * commons.BLOCK_SIZE,
-                                        commons.BLOCK_SIZE,
-                                        commons.BLOCK_SIZE)
-                            
-                            if layer==0:
-                                image_name = f"{BLOCK_METADATA.get_property_by_id(block, 'image_name')}.{edge:04b}"
-                                surface.blit(IMAGE_LOADER.get_image(image_name), block_rect)
-                                
-                            # Checks if the upper block has transparency or if there is no block
-                            elif ((chunk.edges_matrix[0, y, x] != 0b1111 and chunk.edges_matrix[0, y, x] != edge) or chunk.blocks_grid[0, y, x] == 0) or BLOCK_METADATA.get_property_by_id(chunk.blocks_grid[0, y, x], "transparent"): 
-                                image_name = f"BACK_{BLOCK_METADATA.get_property_by_id(block, 'image_name')}.{edge:04b}"
-                                surface.blit(IMAGE_LOADER.get_image(image_name), block_rect)
-            
+            CHUNK_RASTERIZER.rasterize(surface, chunk)
             chunk.clear_changes()
             Debug.stop_timer("rendering entire chunk")
         
-        if chunk.changes.get("line"):
-            for line_index in chunk.changes['line']: #Iterates over the lines that were changed
-                xi = 0
-                yi = line_index * commons.BLOCK_SIZE
-                line_rect = pygame.Rect(xi, yi, commons.CHUNK_SIZE_PIXELS, commons.BLOCK_SIZE) 
-                # Line rectangle
-
-                surface.fill(self.color_key, line_rect)  # Clear line surface with transparent background.
-
-                y = line_index
-
-                for x in range(commons.CHUNK_SIZE):
-                    for layer in range(1, -1, -1):
-                        block = chunk.blocks_grid[layer, y, x]
-                        edge = chunk.edges_matrix[layer, y, x]
-
-                        if block:
-                            block_rect = pygame.Rect(
-                                        x * commons.BLOCK_SIZE,
-                                        y * commons.BLOCK_SIZE,
-                                        commons.BLOCK_SIZE,
-                                        commons.BLOCK_SIZE)
-
-                            if layer==0:
-                                image_name = f"{BLOCK_METADATA.get_property_by_id(block, 'image_name')}.{edge:04b}"
-                                surface.blit(IMAGE_LOADER.get_image(image_name), block_rect)
-                            
-                            elif ((chunk.edges_matrix[0, y, x] != 0b1111 and chunk.edges_matrix[0, y, x] != edge) or chunk.blocks_grid[0, y, x] == 0) or BLOCK_METADATA.get_property_by_id(chunk.blocks_grid[0, y, x], "transparent"): 
-                                image_name = f"BACK_{BLOCK_METADATA.get_property_by_id(block, 'image_name')}.{edge:04b}"
-                                surface.blit(IMAGE_LOADER.get_image(image_name), block_rect)
-
-        if chunk.changes.get('column'):
-            for column_index in chunk.changes['column']: #Iterates over the lines that were changed
-                yi = 0
-                xi = column_index * commons.BLOCK_SIZE
-                col_rect = pygame.Rect(xi, yi, commons.BLOCK_SIZE, commons.CHUNK_SIZE_PIXELS) 
-                # Column rectangle
-
-                surface.fill(self.color_key, col_rect)  # Clear line surface with transparent background.
-
-                x = column_index
-
-                for y in range(commons.CHUNK_SIZE):
-                    for layer in range(1, -1, -1):
-                        block = chunk.blocks_grid[layer, y, x]
-                        edge = chunk.edges_matrix[layer, y, x]
-
-                        if block:
-                            block_rect = pygame.Rect(
-                                        x * commons.BLOCK_SIZE,
-                                        y * commons.BLOCK_SIZE,
-                                        commons.BLOCK_SIZE,
-                                        commons.BLOCK_SIZE)
-
-                            if layer==0:
-                                image_name = f"{BLOCK_METADATA.get_property_by_id(block, 'image_name')}.{edge:04b}"
-                                surface.blit(IMAGE_LOADER.get_image(image_name), block_rect)
-                            
-                            elif ((chunk.edges_matrix[0, y, x] != 0b1111 and chunk.edges_matrix[0, y, x] != edge) or chunk.blocks_grid[0, y, x] == 0) or BLOCK_METADATA.get_property_by_id(chunk.blocks_grid[0, y, x], "transparent"): 
-                                image_name = f"BACK_{BLOCK_METADATA.get_property_by_id(block, 'image_name')}.{edge:04b}"
-                                surface.blit(IMAGE_LOADER.get_image(image_name), block_rect)
+        size = surface.get_width() // commons.CHUNK_SIZE  # Block size at the zoom of the surface
+        block_tiles = IMAGE_LOADER.get_block_tiles(size)
+        breaking_tiles = IMAGE_LOADER.get_breaking_tiles(size)
+
+        for line_index in chunk.changes['line']: # Iterates over the lines that were changed
+            CHUNK_RASTERIZER.rasterize(surface, chunk, rows=slice(line_index, line_index + 1))
+
+        for column_index in chunk.changes['column']: # Iterates over the columns that were changed
+            CHUNK_RASTERIZER.rasterize(surface, chunk, cols=slice(column_index, column_index + 1))
 
         if chunk.changes.get('block'):
             for block_info in chunk.changes['block']:  # Iterate over the blocks that were changed
@@ -398,12 +421,7 @@ class RenderManager:
                 
 
                 # Define the rectangle for the block
-                block_rect = pygame.Rect(
-                    x * commons.BLOCK_SIZE,
-                    y * commons.BLOCK_SIZE,
-                    commons.BLOCK_SIZE,
-                    commons.BLOCK_SIZE
-                )
+                block_rect = pygame.Rect(x * size, y * size, size, size)
 
                 # Clear the block area on the surface
                 surface.fill(self.color_key, block_rect)
@@ -417,25 +435,18 @@ class RenderManager:
 
                 if block_1:
                     # Render the background block
-                    image_name = f"BACK_{BLOCK_METADATA.get_property_by_id(chunk.blocks_grid[1, y, x], 'image_name')}.{chunk.edges_matrix[1, y, x]:04b}"
-                    surface.blit(IMAGE_LOADER.get_image(image_name), block_rect)
+                    surface.blit(block_tiles[block_1, edge_1, 1], block_rect)
 
                 if block:
                     # Render the foreground block
-                    image_name = f"{BLOCK_METADATA.get_property_by_id(block, 'image_name')}.{edge:04b}"
-                    surface.blit(IMAGE_LOADER.get_image(image_name), block_rect)
+                    surface.blit(block_tiles[block, edge, 0], block_rect)
         
         if chunk.changes.get('breaking'):
             for block_info, breaking_level in chunk.changes['breaking'].items():  # Iterate over the blocks that were changed
                 x, y = block_info  # Each block_info contains the layer, y-coordinate, and x-coordinate
                 
                 # Define the rectangle for the block
-                block_rect = pygame.Rect(
-                    x * commons.BLOCK_SIZE,
-                    y * commons.BLOCK_SIZE,
-                    commons.BLOCK_SIZE,
-                    commons.BLOCK_SIZE
-                )
+                block_rect = pygame.Rect(x * size, y * size, size, size)
 
                 # Clear the block area on the surface
                 surface.fill(self.color_key, block_rect)
@@ -449,17 +460,15 @@ class RenderManager:
 
                 if block_1:
                     # Render the background block
-                    image_name = f"BACK_{BLOCK_METADATA.get_property_by_id(chunk.blocks_grid[1, y, x], 'image_name')}.{chunk.edges_matrix[1, y, x]:04b}"
-                    surface.blit(IMAGE_LOADER.get_image(image_name), block_rect)
+                    surface.blit(block_tiles[block_1, edge_1, 1], block_rect)
 
-                    surface.blit(IMAGE_LOADER.get_image(f"BREAKING_{breaking_level}.{edge:04b}"), block_rect)
+                    surface.blit(breaking_tiles[breaking_level, edge], block_rect)
 
                 if block:
                     # Render the foreground block
-                    image_name = f"{BLOCK_METADATA.get_property_by_id(block, 'image_name')}.{edge:04b}"
-                    surface.blit(IMAGE_LOADER.get_image(image_name), block_rect)
+                    surface.blit(block_tiles[block, edge, 0], block_rect)
                 
-                    surface.blit(IMAGE_LOADER.get_image(f"BREAKING_{breaking_level}.{edge:04b}"), block_rect)
+                    surface.blit(breaking_tiles[breaking_level, edge], block_rect)
                 
                 
 
@@ -468,18 +477,48 @@ class RenderManager:
         chunk.clear_changes()
 
 
-    def render_moving_elements(self, elements: List[MovingElement], screen):
+    def _render_chunk_reference(self, surface: pygame.Surface, chunk: Chunk):
+        """
+        Former full chunk rendering, one blit per cell. Kept to check and benchmark `CHUNK_RASTERIZER`.
+        """
+        surface.fill(self.color_key)  # Clear surface with transparent background.
+
+        # Render the blocks in the chunk
+        for x in range(commons.CHUNK_SIZE):
+            for y in range(commons.CHUNK_SIZE):
+                for layer in range(1, -1, -1):
+                    block = chunk.blocks_grid[layer, y, x]
+                    edge = chunk.edges_matrix[layer, y, x]
+
+                    if block:
+                        block_rect = pygame.Rect(
+                                    x * commons.BLOCK_SIZE,
+                                    y * commons.BLOCK_SIZE,
+                                    commons.BLOCK_SIZE,
+                                    commons.BLOCK_SIZE)
+                        
+                        if layer==0:
+                            image_name = f"{BLOCK_METADATA.get_property_by_id(block, 'image_name')}.{edge:04b}"
+                            surface.blit(IMAGE_LOADER.get_image(image_name), block_rect)
+                            
+                        # Checks if the upper block has transparency or if there is no block
+                        elif ((chunk.edges_matrix[0, y, x] != 0b1111 and chunk.edges_matrix[0, y, x] != edge) or chunk.blocks_grid[0, y, x] == 0) or BLOCK_METADATA.get_property_by_id(chunk.blocks_grid[0, y, x], "transparent"): 
+                            image_name = f"BACK_{BLOCK_METADATA.get_property_by_id(block, 'image_name')}.{edge:04b}"
+                            surface.blit(IMAGE_LOADER.get_image(image_name), block_rect)
+
+    def render_moving_elements(self, elements: Iterable[MovingElement], screen):
         """
-        Renders a list of elements on the screen considering an offset (current_position).
+        Renders elements on the screen considering an offset (current_position).
         If an element does not have an image, a rectangle is rendered instead.
 
-        :param elements: List of MovingElement objects to render.
+        :param elements: The MovingElement objects to render, iterated once.
         :param screen: Pygame screen surface to draw on.
         """
+        zoom = self.zoom
+
         for element in elements:
             # Compute the actual position considering the offset
-            actual_x = element.rect.x - self.current_position[0]
-            actual_y = element.rect.y - self.current_position[1]
+            actual_x, actual_y = self.world_to_screen(self.interpolated_topleft(element))
 
             #print(f"Rendering {actual_x} {actual_y}")
 
@@ -488,38 +527,99 @@ class RenderManager:
                 0 <= actual_y < commons.HEIGHT):
                 # Render the element's image if available, otherwise render a rectangle
                 
-                if hasattr(element, 'image') and element.image:
-                    if isinstance(element.image, str):
-                        image = IMAGE_LOADER.get_image(element.image)
-
-                        if offset := IMAGE_LOADER.get_image_atribute(element.image, "offset"):
-                            screen.blit(image, (actual_x + offset[0], actual_y + offset[1]))
-                            continue
-
-                        screen.blit(image, (actual_x, actual_y))
-                    
-                    elif isinstance(element.image, pygame.Surface):
-                        image = element.image
-                        screen.blit(image, (actual_x, actual_y))
+                image = getattr(element, 'image', None)
+                if image is not None:
+                    if isinstance(image, int):  # Image handle
+                        offset = IMAGE_LOADER.offsets[image]
+                        image = IMAGE_LOADER.surfaces[image] if zoom == 1 else image
+                    elif isinstance(image, str):
+                        offset = IMAGE_LOADER.get_image_atribute(image, "offset")
+                        image = IMAGE_LOADER.get_image(image)
+                    elif isinstance(image, pygame.Surface):
+                        offset = getattr(element, 'image_offset', None)
                     else:
                         print(f"Not renderable image trying to be rendered by {element}")
                         continue
 
+                    if zoom != 1:
+                        image = IMAGE_LOADER.get_scaled(image, zoom)
+
+                    if offset:
+                        drawn = screen.blit(image, (actual_x + offset[0] * zoom, actual_y + offset[1] * zoom))
+                    else:
+                        drawn = screen.blit(image, (actual_x, actual_y))
+                    self.dirty_regions.add_sprite(drawn)
+
                 else:
                     # Draw a rectangle if no image is present
-                    pygame.draw.rect(
+                    drawn = pygame.draw.rect(
                         screen,
                         (255, 0, 0),  # Default color (red)
-                        pygame.Rect(actual_x, actual_y, element.rect.width, element.rect.height)
+                        pygame.Rect(actual_x, actual_y, element.rect.width * zoom, element.rect.height * zoom)
                     )
+                    self.dirty_regions.add_sprite(drawn)
+
+    def render_items(self, items: ItemStore, screen):
+        """
+        Renders the dropped items from the arrays of the item store, in one blits call, with the number of items
+        of the stacks.
 
-    def render_all(self, screen, elements, player: Player):
+        :param items: The ItemStore of the dropped items.
+        :param screen: Pygame screen surface to draw on.
+        """
+        count = items.count
+        if not count:
+            return
+
+        zoom = self.zoom
+        positions = items.positions[:count]
+        if self.interpolation < 1:
+            previous = items.previous[:count]
+            positions = previous + (positions - previous) * self.interpolation
+        positions = (positions - (self.current_position[0], self.current_position[1])) * zoom
+
+        # Same bounds as the moving elements: the top-left corner on the screen
+        x, y = positions[:, 0], positions[:, 1]
+        visible = np.flatnonzero((x >= 0) & (x < commons.WIDTH) & (y >= 0) & (y < commons.HEIGHT))
+        if not len(visible):
+            return
+
+        images = []
+        for handle in items.handles:
+            offset = IMAGE_LOADER.offsets[handle] or (0, 0)
+            images.append((IMAGE_LOADER.get_scaled(handle, zoom), offset[0] * zoom, offset[1] * zoom))
+
+        sequence = []
+        for kind, count, (screen_x, screen_y) in zip(items.kinds[visible].tolist(), items.counts[visible].tolist(), positions[visible].tolist()):
+            image, offset_x, offset_y = images[kind]
+            sequence.append((image, (screen_x + offset_x, screen_y + offset_y)))
+            if count > 1:  # Stacks show their number of items
+                sequence.append((self.render_text_image(count, 14), (screen_x + items.size * zoom, screen_y)))
+
+        for drawn in screen.blits(sequence):
+            self.dirty_regions.add_sprite(drawn)
+
+    def interpolated_topleft(self, element: MovingElement) -> Tuple[float, float]:
+        """
+        Position of an element between its previous and current simulation steps, by `interpolation`.
+        """
+        x, y = element.rect.topleft
+        previous = getattr(element, 'previous_topleft', None)
+        if previous is None or self.interpolation >= 1:
+            return x, y
+        alpha = self.interpolation
+        return previous[0] + (x - previous[0]) * alpha, previous[1] + (y - previous[1]) * alpha
+
+    def render_all(self, screen, elements, player: Player, items: Optional[ItemStore] = None):
         """
         Renders the entire scene, including chunks and moving elements.
 
         :param screen: pygame.Surface, the main game display.
+        :param items: The dropped items, drawn under the moving elements.
         """
         self.render_chunks(screen)
+        if items is not None:
+            self.render_items(items, screen)
         self.render_moving_elements(elements, screen)
         self.render_inventory(screen, player.inventory, player)
 
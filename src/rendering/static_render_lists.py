@@ -0,0 +1,102 @@
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+import pygame
+from database.world_elements.static_elements_manager import S_ELEMENT_METADATA_LOADER
+from images.image_loader import IMAGE_LOADER
+
+
+class StaticRenderLists:
+    """
+    Keeps, for every chunk of the window, its static elements (trees, ...) ready to be drawn.
+
+    The image handle and drawn rect (world coordinates, image offset applied) of each element are resolved
+    once per chunk, and again only when its elements change (`Chunk.elements_version`, or a new
+    `world_elements` list once generated or loaded). Every frame, the elements outside the view are culled
+    with array comparisons, and the visible ones are returned as a sequence for a single `Surface.blits` call.
+    The drawn rects of the elements added or removed are kept in `changed`, for the dirty regions.
+    """
+
+    def __init__(self):
+        # Chunk position -> [chunk, world_elements list, elements version, rects (n, 4) array, handles, bounds]
+        self.entries: Dict[Tuple[int, int], list] = {}
+        self.drawn: int = 0   # Elements drawn by the last frame
+        self.culled: int = 0  # Elements of the window outside the view on the last frame
+        self.changed: List[Tuple[int, int, int, int]] = []  # Drawn rects (world coordinates) of the elements added or removed
+
+    def get(self, chunk) -> list:
+        """
+        Returns the render list entry of a chunk, building it if its elements changed.
+        """
+        key = (int(chunk.pos.x), int(chunk.pos.y))
+        entry = self.entries.get(key)
+
+        if entry is None or entry[0] is not chunk or entry[1] is not chunk.world_elements or entry[2] != chunk.elements_version:
+            previous, entry = entry, self.build(chunk)
+            self.entries[key] = entry
+            if previous is not None:  # The elements changed under a still camera too
+                self.changed.extend(set(map(tuple, previous[3].tolist())) ^ set(map(tuple, entry[3].tolist())))
+
+        return entry
+
+    @staticmethod
+    def build(chunk) -> list:
+        """
+        Resolves the handles and drawn rects of the static elements of a chunk.
+        """
+        handles: List[int] = []
+        rects = np.empty((len(chunk.world_elements), 4), dtype=np.int64)
+
+        for index, element in enumerate(chunk.world_elements):
+            handle = IMAGE_LOADER.get_handle(S_ELEMENT_METADATA_LOADER.get_property_by_id(element.id, 'image_name'))
+            offset_x, offset_y = IMAGE_LOADER.offsets[handle] or (0, 0)
+            width, height = IMAGE_LOADER.surfaces[handle].get_size()
+            handles.append(handle)
+            rects[index] = (element.rect.left + offset_x, element.rect.top + offset_y, width, height)
+
+        if len(handles):
+            bounds = (rects[:, 0].min(), rects[:, 1].min(), (rects[:, 0] + rects[:, 2]).max(), (rects[:, 1] + rects[:, 3]).max())
+        else:
+            bounds = None
+
+        return [chunk, chunk.world_elements, chunk.elements_version, rects, handles, bounds]
+
+    def retain(self, chunks: Iterable):
+        """
+        Drops the entries of the chunks that left the window.
+        """
+        keys = {(int(chunk.pos.x), int(chunk.pos.y)) for chunk in chunks}
+        for key in [key for key in self.entries if key not in keys]:
+            del self.entries[key]
+
+    def batch(self, chunks: Iterable, camera: Tuple[float, float], view_size: Tuple[float, float], zoom: float) -> List[Tuple[pygame.Surface, Tuple[float, float]]]:
+        """
+        Returns the (surface, screen position) pairs of the static elements of `chunks` inside the view,
+        in the order of the chunks and of their elements.
+
+        :param camera: World position of the top-left corner of the screen.
+        :param view_size: Size of the screen in world coordinates.
+        :param zoom: Scale of the world on the screen.
+        """
+        left, top = camera
+        right, bottom = left + view_size[0], top + view_size[1]
+        sequence = []
+        total = 0
+
+        for chunk in chunks:
+            _, _, _, rects, handles, bounds = self.get(chunk)
+            if bounds is None:
+                continue
+            total += len(handles)
+            if bounds[0] >= right or bounds[2] <= left or bounds[1] >= bottom or bounds[3] <= top:
+                continue  # The whole chunk list is outside the view
+
+            x, y = rects[:, 0], rects[:, 1]
+            visible = np.flatnonzero((x < right) & (x + rects[:, 2] > left) & (y < bottom) & (y + rects[:, 3] > top))
+            positions = ((rects[visible, :2] - (left, top)) * zoom).tolist()
+
+            for index, position in zip(visible.tolist(), positions):
+                sequence.append((IMAGE_LOADER.get_scaled(handles[index], zoom), position))
+
+        self.drawn = len(sequence)
+        self.culled = total - self.drawn
+        return sequence
@@ -144,10 +144,10 @@ def game(screen, world_name):
         back.update(-commons.CURRENT_POSITION.x, delta_time)
         back1.update(-commons.CURRENT_POSITION.x, delta_time)
 
-        back.draw(screen, color)
-        back1.draw(screen, color)
+        back.draw(screen, color_filter)
+        back1.draw(screen, color_filter)
 
-        render_manager.render_all(screen, physics_manager.get_renderable_elements(), player)
+        render_manager.render_all(screen, physics_manager.get_renderable_elements(), player, physics_manager.items)
 
         pygame.display.update()
 
@@ -12,6 +12,7 @@ class Inventory:
         self.max_items_per_slot = max_items_per_slot
         self.items = [{} for i in range(self.max_slots)]  # List to store items and their quantities in insertion order
         self._selected: int = 0
+        self.version: int = 0  # Incremented on every change of the items or of the selected slot
 
     def add_item(self, item: int, quantity=1):
         """
@@ -25,11 +26,13 @@ class Inventory:
             if not entry:
                 entry['item'] = item
                 entry['quantity'] = 1
+                self.version += 1
                 return True
             
             elif entry['item'] == item:
                 if entry['quantity'] + quantity <= self.max_items_per_slot:
                     entry['quantity'] += quantity
+                    self.version += 1
                     return True
 
         return False
@@ -49,6 +52,7 @@ class Inventory:
             return
         
         self.items[slot_index] = {"item": item, "quantity": quantity}
+        self.version += 1
 
     def get_slot(self, slot_index: int):
         """
@@ -82,6 +86,7 @@ class Inventory:
             current_slot["quantity"] -= val
             if current_slot["quantity"] == 0:
                 self.items[self._selected] = {}  # Clear the slot if the quantity reaches 0
+            self.version += 1
 
 
     @property
@@ -102,11 +107,13 @@ class Inventory:
         Adjusts to the closest valid value if out of range.
         """
         if value < 0:
-            self._selected = 0
+            value = 0
         elif value >= self.max_slots:
-            self._selected = self.max_slots - 1
-        else:
+            value = self.max_slots - 1
+
+        if value != self._selected:
             self._selected = value
+            self.version += 1
 
     def scroll(self, direction: int):
         """
@@ -116,6 +123,7 @@ class Inventory:
         Wraps around if the end or beginning is reached.
         """
         self._selected = (self._selected + direction) % self.max_slots
+        self.version += 1
 
     def __repr__(self):
         """Returns a string representation of the inventory."""
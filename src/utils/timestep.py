@@ -0,0 +1,61 @@
+import commons
+
+
+class FixedTimestep:
+    """
+    Splits the frame times into simulation steps of a fixed duration, whatever the frame rate.
+
+    The time of the frames is accumulated and consumed by whole steps; the remainder is carried to the next frame,
+    and its fraction of a step (`alpha`) tells the rendering how far to interpolate between the last two states.
+    At most `max_steps` run per frame: after a long frame the simulation slows down instead of spiraling into
+    ever longer frames, the time over the cap is dropped.
+    """
+
+    def __init__(self, rate: float = commons.SIMULATION_RATE, max_steps: int = commons.MAX_SIMULATION_STEPS):
+        """
+        :param rate: Simulation steps per second.
+        :param max_steps: Maximum number of steps run by a frame.
+        """
+        self.step: float = 1 / rate  # Duration of a step in seconds
+        self.max_steps = max_steps
+        self.accumulator: float = 0.0  # Time not simulated yet
+        self.alpha: float = 0.0  # Fraction of a step in the accumulator
+        self.dropped_time: float = 0.0  # Time skipped by the step cap
+
+        # Measured rates, updated every second
+        self.simulation_rate: float = 0.0
+        self.render_rate: float = 0.0
+        self._counted_steps: int = 0
+        self._counted_frames: int = 0
+        self._counted_time: float = 0.0
+
+    def advance(self, frame_time: float) -> int:
+        """
+        Adds the time of a frame.
+
+        :param frame_time: Seconds elapsed since the previous frame.
+        :return: The number of steps to simulate before drawing the frame.
+        """
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.step)
+
+        self.accumulator -= steps * self.step  # The remainder, less than a step
+        if steps > self.max_steps:
+            self.dropped_time += (steps - self.max_steps) * self.step
+            steps = self.max_steps
+        self.alpha = min(self.accumulator / self.step, 1.0)
+
+        self._counted_steps += steps
+        self._counted_frames += 1
+        self._counted_time += frame_time
+        if self._counted_time >= 1:
+            self.simulation_rate = self._counted_steps / self._counted_time
+            self.render_rate = self._counted_frames / self._counted_time
+            self._counted_steps = self._counted_frames = 0
+            self._counted_time = 0.0
+
+        return steps
+
+    def stats(self) -> str:
+        """The measured simulation and render rates."""
+        return f"{self.simulation_rate:.0f} steps/s, {self.render_rate:.0f} FPS"